@@ -0,0 +1,59 @@
+import argparse, os, tempfile, time
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel, create_engine
+from src.app import deps
+from src.app.core.db import get_session
+from src.app.core.security import create_token
+from src.app.models import Client, User
+from src.app.routers import clients
+
+# Benchmark das leituras autenticadas com e sem o cache de token/usuário do deps.py:
+# python -m scripts.bench_auth --requests 2000
+
+def build_app(db_path: str) -> tuple[FastAPI, str]:
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add(User(email="bench@local.test", full_name="Bench", hashed_password="x", role="admin"))
+        db.add_all([Client(name=f"Cliente {i}") for i in range(20)])
+        db.commit()
+
+    def session():
+        with Session(engine) as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(clients.router)
+    app.dependency_overrides[get_session] = session
+    return app, create_token("bench@local.test", 60)
+
+def run(client: TestClient, token: str, n: int) -> float:
+    headers = {"Authorization": f"Bearer {token}"}
+    client.get("/clients/", headers=headers)  # aquece
+    t = time.perf_counter()
+    for _ in range(n):
+        assert client.get("/clients/", headers=headers).status_code == 200
+    return n / (time.perf_counter() - t)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--requests", type=int, default=2000)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app, token = build_app(os.path.join(tmp, "bench.db"))
+        client = TestClient(app)
+        ttl = deps.user_cache.ttl
+        for cache in (deps.token_cache, deps.user_cache):
+            cache.ttl = 0
+            cache.clear()
+        before = run(client, token, args.requests)
+        for cache in (deps.token_cache, deps.user_cache):
+            cache.ttl = ttl
+        after = run(client, token, args.requests)
+    print(f"[ok] GET /clients/ autenticado: sem cache {before:.0f} req/s, com cache {after:.0f} req/s "
+          f"({after / before - 1:+.0%})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import argparse, random, time
+from src.app.core.dispatch import DispatchIndex, plan
+from src.app.models import Order, Technician
+
+# Benchmark do despacho automático (sem banco): python -m scripts.bench_dispatch --orders 2000 --techs 500
+SKILLS = ["rede", "fibra", "fibra optica", "cftv", "alarme", "wifi", "servidor", "nobreak", "telefonia",
+          "cabeamento estruturado", "camera ip", "controle de acesso", "switch", "roteador", "radio"]
+PLACES = [("MG", "Belo Horizonte"), ("MG", "Contagem"), ("MG", "Uberlândia"), ("SP", "São Paulo"),
+          ("SP", "Campinas"), ("RJ", "Rio de Janeiro"), ("RJ", "Niterói"), ("PR", "Curitiba"),
+          ("BA", "Salvador"), ("DF", "Brasília")]
+
+def synthetic(n_orders: int, n_techs: int, seed: int = 0):
+    rng = random.Random(seed)
+    techs = []
+    for i in range(n_techs):
+        state, city = rng.choice(PLACES)
+        techs.append(Technician(id=i + 1, name=f"Técnico {i}", state=state, city=city,
+                                skills=", ".join(rng.sample(SKILLS, rng.randint(2, 5)))))
+    orders = []
+    for i in range(n_orders):
+        state, city = rng.choice(PLACES)
+        need = rng.sample(SKILLS, rng.randint(0, 3))
+        orders.append(Order(id=i + 1, client_id=1, state=state, city=city,
+                            description=f"Atendimento: {' e '.join(need) or 'visita técnica'}"))
+    workload = {t.id: rng.randint(0, 4) for t in techs}
+    return orders, techs, workload
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--orders", type=int, default=2000)
+    ap.add_argument("--techs", type=int, default=500)
+    ap.add_argument("--max-per-tech", type=int, default=3)
+    ap.add_argument("--max-open", type=int, default=None)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    orders, techs, workload = synthetic(args.orders, args.techs, args.seed)
+    t0 = time.perf_counter()
+    index = DispatchIndex(techs, workload)
+    t1 = time.perf_counter()
+    assigned = plan(orders, index, args.max_per_tech, args.max_open)
+    t2 = time.perf_counter()
+
+    same_city = sum(1 for a in assigned if (orders[a.order_id - 1].city == techs[a.technician_id - 1].city))
+    full_skill = sum(1 for a in assigned if a.skill_match == 1.0)
+    n = max(len(assigned), 1)
+    print(f"[ok] {args.orders} ordens x {args.techs} técnicos: índice {(t1 - t0) * 1000:.1f} ms, "
+          f"atribuição {(t2 - t1) * 1000:.1f} ms, {len(assigned)} atribuídas "
+          f"({same_city / n:.0%} mesma cidade, {full_skill / n:.0%} com todas as skills)")
+
+if __name__ == "__main__":
+    main()
@@ -19,11 +19,27 @@ class Settings(BaseSettings):
     MAX_LOGIN_ATTEMPTS: int = 5
     LOCK_MINUTES: int = 15
 
+    # cache de tokens decodificados e usuários autenticados (0 = desligado); alterações no User
+    # feitas por este processo invalidam na hora, as de outros processos valem após o TTL
+    AUTH_CACHE_TTL_SECONDS: int = 30
+    AUTH_CACHE_SIZE: int = 4096
+
+    # bcrypt roda num pool de processos separado; além de HASH_QUEUE_LIMIT verificações
+    # pendentes o login responde 429 em vez de enfileirar
+    HASH_WORKERS: int = 2
+    HASH_QUEUE_LIMIT: int = 32
+
     UPLOAD_BACKEND: str = "local"  # local | supabase
     UPLOAD_DIR: str = "./uploads"
+    UPLOAD_STAGING_DIR: str | None = None  # uploads em andamento; padrão: irmão do UPLOAD_DIR (fora do /static)
     SUPABASE_URL: str | None = None
     SUPABASE_ANON_KEY: str | None = None
     SUPABASE_BUCKET: str | None = None
+    MAX_UPLOAD_MB: int = 25     # por arquivo
+    MAX_REQUEST_MB: int = 100   # por envio (vários arquivos)
+    MAX_FILES_PER_UPLOAD: int = 20
+    MAX_IMPORT_MB: int = 200    # corpo do /bulk/*/import
+    UPLOAD_WORKERS: int = 4  # arquivos processados em paralelo (por processo)
 
 def get_settings() -> Settings:
     # Permite separar por vírgula no .env
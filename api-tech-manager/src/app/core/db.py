@@ -1,5 +1,6 @@
 from sqlmodel import SQLModel, create_engine, Session
 from ..core.config import settings
+from ..core.search import init_search
 
 engine = create_engine(
     settings.DATABASE_URL,
@@ -9,6 +10,11 @@ engine = create_engine(
 
 def init_db() -> None:
     SQLModel.metadata.create_all(engine)
+    # create_all não mexe em tabelas já existentes: garante os índices novos em bancos antigos
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+    init_search(engine)
 
 def get_session():
     with Session(engine) as session:
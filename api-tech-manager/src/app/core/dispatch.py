@@ -0,0 +1,108 @@
+import re, unicodedata
+from dataclasses import dataclass
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+# Despacho automático: custo (ordem x técnico) = skills faltando + distância + carga atual,
+# resolvido como atribuição de custo mínimo (linear_sum_assignment) para o lote inteiro de uma vez.
+# Cada técnico vira `slots` colunas (1ª, 2ª, ... ordem nova no lote), com custo de carga crescente,
+# então o mesmo técnico pode receber mais de uma ordem sem passar do limite.
+
+OPEN_STATUSES = ("Pendente", "Agendado", "Em campo")
+W_SKILL = 1.0   # fração das skills pedidas na descrição que o técnico não tem
+W_CITY = 0.5    # cidade diferente (mesma UF)
+W_STATE = 1.0   # UF diferente
+W_LOAD = 0.1    # por ordem aberta do técnico
+INFEASIBLE = 1e6
+MAX_CELLS = 20_000_000  # ordens x colunas da matriz de custo (float64: ~160 MB)
+
+class BatchTooLarge(Exception):
+    pass
+
+@dataclass
+class Assignment:
+    order_id: int
+    technician_id: int
+    cost: float
+    skill_match: float  # fração das skills pedidas que o técnico cobre (1.0 se a ordem não pede nenhuma)
+
+def norm(s: str | None) -> str:
+    s = unicodedata.normalize("NFKD", (s or "").lower())
+    return " ".join("".join(c for c in s if not unicodedata.combining(c)).split())
+
+def parse_skills(skills: str | None) -> list[str]:
+    return [s for s in (norm(p) for p in (skills or "").split(",")) if s]
+
+def _codes(values: list[str]) -> np.ndarray:
+    """Códigos inteiros por valor (-1 = vazio), para comparar locais por broadcasting."""
+    table: dict[str, int] = {}
+    return np.array([table.setdefault(v, len(table)) if v else -1 for v in values], dtype=np.int64)
+
+class DispatchIndex:
+    """Técnicos pré-processados: matriz de skills, códigos de cidade/UF e carga aberta."""
+
+    def __init__(self, techs, workload: dict[int, int]):
+        self.ids = np.array([t.id for t in techs], dtype=np.int64)
+        skills = [parse_skills(t.skills) for t in techs]
+        self.vocab = {s: i for i, s in enumerate(sorted({s for ss in skills for s in ss}))}
+        self.skills = np.zeros((len(techs), len(self.vocab)), dtype=np.float32)
+        for row, ss in enumerate(skills):
+            self.skills[row, [self.vocab[s] for s in ss]] = 1.0
+        self.states = [norm(t.state) for t in techs]
+        self.cities = [norm(t.city) for t in techs]
+        self.load = np.array([workload.get(t.id, 0) for t in techs], dtype=np.int64)
+        # skills mais longas primeiro ("fibra optica" antes de "fibra")
+        names = sorted(self.vocab, key=len, reverse=True)
+        self._skill_re = re.compile(r"(?<!\w)(" + "|".join(map(re.escape, names)) + r")(?!\w)") if names else None
+
+    def requested(self, orders) -> np.ndarray:
+        """Skills do vocabulário citadas na descrição de cada ordem (ordens x skills)."""
+        req = np.zeros((len(orders), len(self.vocab)), dtype=np.float32)
+        if self._skill_re is not None:
+            for row, o in enumerate(orders):
+                found = {self.vocab[m] for m in self._skill_re.findall(norm(o.description))}
+                req[row, list(found)] = 1.0
+        return req
+
+    def base_cost(self, orders, same_state: bool = False) -> tuple[np.ndarray, np.ndarray]:
+        """Custo sem carga (ordens x técnicos) e fração de skills cobertas."""
+        req = self.requested(orders)
+        need = req.sum(axis=1, keepdims=True)
+        covered = np.divide(req @ self.skills.T, need, out=np.ones((len(orders), len(self.ids)), dtype=np.float32),
+                            where=need > 0)
+        state_codes = _codes(self.states + [norm(o.state) for o in orders])
+        city_codes = _codes([f"{s}|{c}" if c else "" for s, c in zip(self.states, self.cities)]
+                            + [f"{norm(o.state)}|{norm(o.city)}" if o.city else "" for o in orders])
+        n = len(self.ids)
+        t_state, o_state = state_codes[:n], state_codes[n:]
+        t_city, o_city = city_codes[:n], city_codes[n:]
+        same_st = (o_state[:, None] == t_state[None, :]) & (o_state[:, None] >= 0)
+        same_ct = (o_city[:, None] == t_city[None, :]) & (o_city[:, None] >= 0)
+        cost = W_SKILL * (1.0 - covered) + np.where(same_ct, 0.0, np.where(same_st, W_CITY, W_STATE))
+        if same_state:
+            cost = np.where(same_st | (o_state[:, None] < 0), cost, INFEASIBLE)
+        return cost, covered
+
+def plan(orders, index: DispatchIndex, max_per_tech: int = 3, max_open: int | None = None,
+         same_state: bool = False) -> list[Assignment]:
+    """Atribuição de custo mínimo do lote; ordens sem técnico viável ficam de fora."""
+    if not orders or not len(index.ids):
+        return []
+    base, covered = index.base_cost(orders, same_state)
+    free = np.full(len(index.ids), max_per_tech) if max_open is None else np.clip(max_open - index.load, 0, max_per_tech)
+    cols = np.repeat(np.arange(len(index.ids)), free)  # técnico de cada coluna
+    if not len(cols):
+        return []
+    if len(orders) * len(cols) > MAX_CELLS:
+        raise BatchTooLarge()
+    slot = np.arange(len(cols)) - np.repeat(np.cumsum(free) - free, free)  # 0, 1, ... dentro do técnico
+    cost = base[:, cols] + W_LOAD * (index.load[cols] + slot)[None, :]
+    rows, picked = linear_sum_assignment(cost)
+    out = []
+    for r, c in zip(rows, picked):
+        if cost[r, c] >= INFEASIBLE:
+            continue
+        t = cols[c]
+        out.append(Assignment(orders[r].id, int(index.ids[t]), round(float(cost[r, c]), 4),
+                              round(float(covered[r, t]), 4)))
+    return out
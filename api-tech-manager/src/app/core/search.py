@@ -0,0 +1,87 @@
+import re
+from sqlalchemy import Float, Integer, func, literal_column, or_, text
+from sqlalchemy.engine import Engine
+from ..models import Technician
+
+# Busca de técnicos por nome/cidade/UF/skills com índice no banco:
+# - SQLite: FTS5 (tabela technician_fts com conteúdo externo, mantida por triggers), ordenada por bm25
+# - Postgres: índice GIN de trigramas (pg_trgm) sobre o texto concatenado, ordenado por similaridade
+# - outros bancos: ILIKE por coluna, sem índice
+
+# pesos do bm25 por coluna (name, city, state, skills)
+FTS_WEIGHTS = "10.0, 4.0, 4.0, 6.0"
+
+# mesma expressão no índice e na consulta (precisa ser IMMUTABLE no Postgres: nada de concat_ws)
+PG_DOC = ("lower(coalesce(technician.name, '') || ' ' || coalesce(technician.city, '') || ' ' || "
+          "coalesce(technician.state, '') || ' ' || coalesce(technician.skills, ''))")
+
+SQLITE_DDL = [
+    """create virtual table if not exists technician_fts using fts5(
+        name, city, state, skills, content='technician', content_rowid='id',
+        tokenize="unicode61 remove_diacritics 2 tokenchars '+#'")""",
+    """create trigger if not exists technician_fts_ai after insert on technician begin
+        insert into technician_fts(rowid, name, city, state, skills)
+        values (new.id, new.name, new.city, new.state, new.skills);
+    end""",
+    """create trigger if not exists technician_fts_ad after delete on technician begin
+        insert into technician_fts(technician_fts, rowid, name, city, state, skills)
+        values ('delete', old.id, old.name, old.city, old.state, old.skills);
+    end""",
+    """create trigger if not exists technician_fts_au after update on technician begin
+        insert into technician_fts(technician_fts, rowid, name, city, state, skills)
+        values ('delete', old.id, old.name, old.city, old.state, old.skills);
+        insert into technician_fts(rowid, name, city, state, skills)
+        values (new.id, new.name, new.city, new.state, new.skills);
+    end""",
+]
+
+PG_DDL = [
+    "create extension if not exists pg_trgm",
+    f"create index if not exists ix_technician_search on technician using gin (({PG_DOC}) gin_trgm_ops)",
+]
+
+# "+" e "#" fazem parte do termo (c++, c#): no tokenizer do FTS5 (tokenchars) e na consulta
+TERM_RE = re.compile(r"\w[\w+#]*")
+
+def terms(q: str | None) -> list[str]:
+    return TERM_RE.findall((q or "").lower())
+
+def init_search(engine: Engine) -> None:
+    with engine.begin() as conn:
+        if engine.dialect.name == "sqlite":
+            sql = conn.execute(text("select sql from sqlite_master where name = 'technician_fts'")).scalar()
+            if sql is not None and "tokenchars" not in sql:  # índice antigo (sem tokenchars): recria
+                conn.execute(text("drop table technician_fts"))
+                sql = None
+            for ddl in SQLITE_DDL:
+                conn.execute(text(ddl))
+            if sql is None:  # banco anterior à busca: indexa os técnicos que já existem
+                conn.execute(text("insert into technician_fts(technician_fts) values ('rebuild')"))
+        elif engine.dialect.name == "postgresql":
+            for ddl in PG_DDL:
+                conn.execute(text(ddl))
+
+def search_technicians(stmt, q: str | None, dialect: str):
+    """Aplica a busca textual (todos os termos, por prefixo no SQLite) e ordena por relevância (sem busca: por nome)."""
+    words = terms(q)
+    if not words:
+        return stmt.order_by(Technician.name, Technician.id)
+    if dialect == "sqlite":
+        match = " AND ".join(f'"{w}"*' for w in words)
+        fts = (
+            text(f"select rowid, bm25(technician_fts, {FTS_WEIGHTS}) as rank from technician_fts where technician_fts match :match")
+            .bindparams(match=match)
+            .columns(rowid=Integer, rank=Float)
+            .subquery()
+        )
+        return stmt.join(fts, fts.c.rowid == Technician.id).order_by(fts.c.rank, Technician.id)
+    if dialect == "postgresql":
+        doc = literal_column(PG_DOC)
+        for w in words:
+            # like '%termo%' usa o índice de trigramas (\w inclui "_", curinga do like)
+            stmt = stmt.where(doc.like(f"%{w.replace('_', '/_')}%", escape="/"))
+        return stmt.order_by(func.similarity(doc, " ".join(words)).desc(), Technician.id)
+    cols = (Technician.name, Technician.city, Technician.state, Technician.skills)
+    for w in words:
+        stmt = stmt.where(or_(*(c.ilike(f"%{w}%") for c in cols)))
+    return stmt.order_by(Technician.id)
@@ -1,3 +1,6 @@
+import asyncio, multiprocessing, threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta, timezone
 from jose import jwt, JWTError
 from passlib.context import CryptContext
@@ -23,3 +26,45 @@ def hash_password(password: str) -> str:
 
 def verify_password(plain: str, hashed: str) -> bool:
     return pwd_ctx.verify(plain, hashed)
+
+# bcrypt leva ~100-300 ms de CPU por chamada: fora do processo da API, num pool limitado
+class HashPoolBusy(Exception):
+    """Fila do pool de hash cheia: o chamador deve responder 429."""
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+_pending = 0  # só alterado no event loop
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: não herda threads/conexões do servidor
+            _pool = ProcessPoolExecutor(settings.HASH_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+def shutdown_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
+async def _in_pool(fn, *args):
+    global _pending
+    if _pending >= settings.HASH_QUEUE_LIMIT:
+        raise HashPoolBusy()
+    _pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_get_pool(), fn, *args)
+    except BrokenProcessPool:
+        shutdown_pool()  # um worker morreu: o próximo pedido recria o pool
+        raise
+    finally:
+        _pending -= 1
+
+async def hash_password_async(password: str) -> str:
+    return await _in_pool(hash_password, password)
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    return await _in_pool(verify_password, plain, hashed)
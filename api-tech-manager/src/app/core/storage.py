@@ -0,0 +1,88 @@
+import os, tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import BinaryIO, Protocol
+from ..core.config import settings
+from ..core.uploads import content_key, spool
+
+# Onde os anexos ficam. Os dois backends recebem o arquivo já copiado (spool) para um temporário
+# em staging_dir e guardam pela chave do conteúdo (sha256): anexo repetido não é gravado de novo.
+# O backend é criado uma vez por processo (get_storage); o cliente do Supabase é reaproveitado.
+
+@dataclass
+class StoredFile:
+    key: str
+    url: str
+    sha256: str
+    size: int
+    filename: str | None
+    content_type: str | None
+
+class StorageBackend(Protocol):
+    staging_dir: str
+
+    def store(self, tmp_path: str, key: str, content_type: str) -> str:
+        """Move o temporário para `key` (ou descarta, se já existe) e devolve a URL pública."""
+        ...
+
+class LocalStorage:
+    """Diretório local servido em /static (também serve de backend em testes, com um tmpdir)."""
+
+    def __init__(self, root: str, url_prefix: str = "/static", staging_dir: str | None = None):
+        self.root, self.url_prefix = root, url_prefix
+        # fora de root (que é servido em /static), mas ao lado dele: mesmo disco, os.replace atômico
+        root = os.path.abspath(root)
+        self.staging_dir = staging_dir or os.path.join(os.path.dirname(root), f".{os.path.basename(root)}-staging")
+
+    def store(self, tmp_path: str, key: str, content_type: str) -> str:
+        dst = os.path.join(self.root, key)
+        if os.path.exists(dst):
+            os.unlink(tmp_path)
+        else:
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            os.replace(tmp_path, dst)
+        return f"{self.url_prefix}/{key}"
+
+class SupabaseStorage:
+    def __init__(self, url: str, anon_key: str, bucket: str):
+        from supabase import create_client
+        self.client = create_client(url, anon_key)  # um cliente (e pool HTTP) por processo
+        self.bucket = self.client.storage.from_(bucket)
+        self.staging_dir = tempfile.gettempdir()
+
+    def store(self, tmp_path: str, key: str, content_type: str) -> str:
+        try:
+            folder, name = key.split("/")
+            if not any(o.get("name") == name for o in self.bucket.list(folder, {"search": name})):
+                # caminho (não bytes): o cliente envia o arquivo em streaming
+                self.bucket.upload(key, tmp_path, {"contentType": content_type, "upsert": "true"})
+        finally:
+            os.unlink(tmp_path)
+        return self.bucket.get_public_url(key)
+
+class StorageNotConfigured(Exception):
+    pass
+
+@lru_cache
+def get_storage() -> StorageBackend:
+    """Backend do processo, conforme UPLOAD_BACKEND (em testes: sobrescreva files._storage com um LocalStorage(tmpdir))."""
+    if settings.UPLOAD_BACKEND == "supabase":
+        if not (settings.SUPABASE_URL and settings.SUPABASE_ANON_KEY and settings.SUPABASE_BUCKET):
+            raise StorageNotConfigured()
+        return SupabaseStorage(settings.SUPABASE_URL, settings.SUPABASE_ANON_KEY, settings.SUPABASE_BUCKET)
+    return LocalStorage(settings.UPLOAD_DIR, staging_dir=settings.UPLOAD_STAGING_DIR)
+
+def save(storage: StorageBackend, src: BinaryIO, filename: str | None, content_type: str | None) -> StoredFile:
+    tmp, digest, size = spool(src, storage.staging_dir)
+    key = content_key(digest, filename)
+    url = storage.store(tmp, key, content_type or "application/octet-stream")
+    return StoredFile(key, url, digest, size, filename, content_type)
+
+# hash + cópia + envio de vários arquivos em paralelo (o sha256 e o I/O liberam o GIL)
+_workers = ThreadPoolExecutor(max_workers=settings.UPLOAD_WORKERS, thread_name_prefix="upload")
+
+def save_many(storage: StorageBackend, files: list[tuple[BinaryIO, str | None, str | None]]) -> list[StoredFile]:
+    """Salva (arquivo, nome, content-type) em paralelo; a ordem do resultado é a da entrada."""
+    futures = [_workers.submit(save, storage, *f) for f in files]
+    return [f.result() for f in futures]
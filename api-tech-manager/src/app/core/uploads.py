@@ -0,0 +1,58 @@
+import hashlib, json, os, tempfile
+from typing import BinaryIO
+from ..core.config import settings
+
+# Upload em streaming: copia em blocos de CHUNK_SIZE calculando o SHA-256 no caminho, sem nunca ter
+# o arquivo inteiro em memória, e para assim que passa do limite. O nome final vem do hash
+# (endereçamento por conteúdo): o mesmo anexo enviado duas vezes é gravado uma vez só.
+
+CHUNK_SIZE = 1024 * 1024
+MULTIPART_SLACK = 64 * 1024  # cabeçalhos do multipart além do arquivo
+
+class UploadTooLarge(Exception):
+    pass
+
+def max_bytes() -> int:
+    return settings.MAX_UPLOAD_MB * 1024 * 1024
+
+def content_key(digest: str, filename: str | None) -> str:
+    """'ab/abcdef...123.jpg': prefixo de 2 letras para não ter milhares de arquivos num diretório."""
+    ext = os.path.splitext(filename or "")[1].lower()
+    return f"{digest[:2]}/{digest}{ext}"
+
+def spool(src: BinaryIO, directory: str, limit: int | None = None) -> tuple[str, str, int]:
+    """Copia `src` para um arquivo temporário em `directory`; retorna (caminho, sha256, bytes)."""
+    limit = max_bytes() if limit is None else limit
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".upload-")
+    digest, size = hashlib.sha256(), 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while chunk := src.read(CHUNK_SIZE):
+                size += len(chunk)
+                if size > limit:
+                    raise UploadTooLarge()
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return tmp, digest.hexdigest(), size
+
+class UploadSizeLimit:
+    """Middleware ASGI: recusa com 413 pelo Content-Length (MAX_REQUEST_MB), antes de o corpo ser
+    lido/parseado. O limite por arquivo (e uploads chunked, sem Content-Length) fica com o spool()."""
+
+    def __init__(self, app, prefix: str = "/files/"):
+        self.app, self.prefix = app, prefix
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith(self.prefix):
+            length = dict(scope["headers"]).get(b"content-length")
+            if length and length.isdigit() and int(length) > settings.MAX_REQUEST_MB * 1024 * 1024 + MULTIPART_SLACK:
+                body = json.dumps({"detail": f"Envio maior que {settings.MAX_REQUEST_MB} MB"}).encode()
+                await send({"type": "http.response.start", "status": 413,
+                            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]})
+                await send({"type": "http.response.body", "body": body})
+                return
+        await self.app(scope, receive, send)
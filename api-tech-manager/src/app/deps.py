@@ -1,7 +1,10 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import event, inspect
 from sqlmodel import Session, select
 from datetime import datetime, timedelta, timezone
+import time
+from .core.cache import TTLCache
 from .core.db import get_session
 from .core.security import decode_token
 from .models import User
@@ -9,17 +12,74 @@ from .core.config import settings
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+# token -> payload (até expirar o próprio token) e email -> cópia desanexada do User
+token_cache = TTLCache(settings.AUTH_CACHE_SIZE, settings.AUTH_CACHE_TTL_SECONDS)
+user_cache = TTLCache(settings.AUTH_CACHE_SIZE, settings.AUTH_CACHE_TTL_SECONDS)
+
+# Invalidação: remove no flush e de novo no commit. Entre os dois, outro request ainda lê a linha
+# antiga (já commitada) e pode recolocá-la no cache; o segundo pop, depois do commit, resolve.
+EVICT_KEY = "auth_cache_evict"  # em Session.info: emails (ou ALL) a remover no commit
+ALL = object()
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _evict_user(mapper, connection, target: User) -> None:
+    # desativação, troca de papel, bloqueio, troca de email
+    state = inspect(target)
+    emails = {target.email, *(state.attrs.email.history.deleted or ())}
+    for email in emails:
+        user_cache.pop(email)
+    if state.session is not None:
+        pending = state.session.info.setdefault(EVICT_KEY, set())
+        if pending is not ALL:
+            pending.update(emails)
+
+@event.listens_for(Session, "do_orm_execute")
+def _evict_bulk(orm_execute_state) -> None:
+    # update(User)/delete(User) em massa não passam pelos eventos do mapper
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) and any(
+        m.class_ is User for m in orm_execute_state.all_mappers
+    ):
+        user_cache.clear()
+        orm_execute_state.session.info[EVICT_KEY] = ALL
+
+@event.listens_for(Session, "after_commit")
+def _evict_committed(session) -> None:
+    pending = session.info.pop(EVICT_KEY, None)
+    if pending is ALL:
+        user_cache.clear()
+    elif pending:
+        for email in pending:
+            user_cache.pop(email)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session) -> None:
+    session.info.pop(EVICT_KEY, None)
+
 def get_db(session: Session = Depends(get_session)):
     return session
 
+def _decode_cached(token: str) -> dict | None:
+    payload = token_cache.get(token)
+    if payload is None:
+        payload = decode_token(token)
+        if payload:
+            token_cache.set(token, payload, ttl=payload.get("exp", 0) - time.time())
+    return payload
+
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
-    payload = decode_token(token)
+    payload = _decode_cached(token)
     if not payload:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token inválido")
     user_email = payload.get("sub")
     if not user_email:
         raise HTTPException(status_code=401, detail="Credenciais inválidas")
-    user = db.exec(select(User).where(User.email == user_email)).first()
+    user = user_cache.get(user_email)
+    if user is None:
+        user = db.exec(select(User).where(User.email == user_email)).first()
+        if user and user.is_active:
+            user = User.model_validate(user)  # cópia fora da sessão: pode ser compartilhada entre requests
+            user_cache.set(user_email, user)
     if not user or not user.is_active:
         raise HTTPException(status_code=401, detail="Usuário inativo ou inexistente")
     return user
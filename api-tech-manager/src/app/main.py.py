@@ -3,10 +3,16 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from .core.config import settings
 from .core.db import init_db
-from .routers import auth, technicians, clients, orders, files
+from .core.security import shutdown_pool
+from .core.uploads import UploadSizeLimit
+from .routers import auth, technicians, clients, orders, files, bulk
 
 app = FastAPI(title=settings.APP_NAME)
 
+# limite de tamanho dos uploads checado antes de ler o corpo; registrado antes do CORS
+# (o último adicionado fica por fora) para o 413 também sair com os cabeçalhos de CORS
+app.add_middleware(UploadSizeLimit)
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -26,11 +32,16 @@ app.include_router(technicians.router)
 app.include_router(clients.router)
 app.include_router(orders.router)
 app.include_router(files.router)
+app.include_router(bulk.router)
 
 @app.on_event("startup")
 def on_startup():
     init_db()
 
+@app.on_event("shutdown")
+def on_shutdown():
+    shutdown_pool()
+
 @app.get("/")
 def root():
     return {"name": settings.APP_NAME, "env": settings.APP_ENV, "status": "ok"}
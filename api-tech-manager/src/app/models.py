@@ -1,5 +1,6 @@
 from datetime import datetime
 from typing import Optional, List
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 
 # Usuário para login (RBAC simples)
@@ -31,6 +32,15 @@ class Client(SQLModel, table=True):
     is_active: bool = Field(default=True)
 
 class Order(SQLModel, table=True):
+    # listagem filtra por um campo e pagina por (created_at, id) decrescente: o id fecha o índice
+    # para o cursor (desempate de created_at iguais) sem precisar ordenar em memória
+    __table_args__ = (
+        Index("ix_order_created", "created_at", "id"),
+        Index("ix_order_status_created", "status", "created_at", "id"),
+        Index("ix_order_client_created", "client_id", "created_at", "id"),
+        Index("ix_order_technician_created", "technician_id", "created_at", "id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     client_id: int = Field(foreign_key="client.id")
     technician_id: Optional[int] = Field(default=None, foreign_key="technician.id")
@@ -41,3 +51,17 @@ class Order(SQLModel, table=True):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     total_value: Optional[float] = 0.0
     attachment_url: Optional[str] = None
+
+# Anexos de uma ordem (vários por ordem); o arquivo em si é endereçado por conteúdo (sha256),
+# então anexos iguais compartilham o mesmo objeto no storage
+class OrderAttachment(SQLModel, table=True):
+    __tablename__ = "order_attachment"
+    id: Optional[int] = Field(default=None, primary_key=True)
+    order_id: int = Field(foreign_key="order.id", index=True)
+    url: str
+    storage_key: str
+    sha256: str
+    size: int
+    filename: Optional[str] = None
+    content_type: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -1,39 +1,62 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from concurrent.futures.process import BrokenProcessPool
 from sqlmodel import Session, select
 from datetime import datetime, timedelta, timezone
 from ..schemas import LoginRequest, TokenPair, RefreshRequest, UserOut
-from ..core.security import verify_password, hash_password, create_token, decode_token
+from ..core.security import HashPoolBusy, verify_password_async, hash_password, create_token, decode_token
 from ..core.config import settings
 from ..deps import get_db, is_locked
 from ..models import User
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+def _find_user(db: Session, email: str) -> User | None:
+    user = db.exec(select(User).where(User.email == email)).first()
+    db.close()  # devolve a conexão ao pool antes de esperar o bcrypt (o User fica desanexado, já carregado)
+    return user
+
+def _save(db: Session, user: User) -> None:
+    # o commit expira os atributos: depois dele, não ler o user no event loop (seria um SELECT síncrono)
+    db.add(user); db.commit()
+
+# async: enquanto o bcrypt roda no pool nenhuma thread do servidor fica presa; o acesso ao
+# banco (síncrono) vai para o threadpool
 @router.post("/login", response_model=TokenPair)
-def login(payload: LoginRequest, db: Session = Depends(get_db)):
-    user = db.exec(select(User).where(User.email == payload.email)).first()
+async def login(payload: LoginRequest, db: Session = Depends(get_db)):
+    user = await run_in_threadpool(_find_user, db, payload.email)
     if not user or not user.is_active:
         raise HTTPException(status_code=401, detail="Credenciais inválidas")
+    email = user.email
 
     # bloqueio por tentativas
     if is_locked(user):
         raise HTTPException(status_code=423, detail="Usuário bloqueado temporariamente. Tente mais tarde.")
 
-    if not verify_password(payload.password, user.hashed_password):
+    try:
+        ok = await verify_password_async(payload.password, user.hashed_password)
+    except HashPoolBusy:
+        raise HTTPException(status_code=429, detail="Muitos logins simultâneos. Tente novamente em instantes.",
+                            headers={"Retry-After": "1"})
+    except BrokenProcessPool:  # worker morreu; o pool é recriado no próximo pedido
+        raise HTTPException(status_code=503, detail="Serviço de autenticação indisponível. Tente novamente.",
+                            headers={"Retry-After": "1"})
+
+    if not ok:
         user.failed_attempts += 1
         if user.failed_attempts >= settings.MAX_LOGIN_ATTEMPTS:
             user.lock_until = datetime.now(timezone.utc) + timedelta(minutes=settings.LOCK_MINUTES)
             user.failed_attempts = 0  # zera para próximo ciclo
-        db.add(user); db.commit()
+        await run_in_threadpool(_save, db, user)
         raise HTTPException(status_code=401, detail="Credenciais inválidas")
 
     # sucesso: zera contadores
     user.failed_attempts = 0
     user.lock_until = None
-    db.add(user); db.commit()
+    await run_in_threadpool(_save, db, user)
 
-    access = create_token(user.email, settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    refresh = create_token(user.email, settings.REFRESH_TOKEN_EXPIRE_MINUTES)
+    access = create_token(email, settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    refresh = create_token(email, settings.REFRESH_TOKEN_EXPIRE_MINUTES)
     return TokenPair(access_token=access, refresh_token=refresh)
 
 @router.post("/refresh", response_model=TokenPair)
@@ -0,0 +1,164 @@
+import codecs, csv, io, json, tempfile
+from datetime import datetime
+from typing import Iterator, Literal
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import insert, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session
+from ..core.config import settings
+from ..core.db import engine
+from ..deps import get_db, get_current_user
+from ..models import Client, Order, Technician
+from ..schemas import ClientImport, OrderImport, TechnicianImport
+
+# Importação/exportação em massa (sincronização noturna da planilha de operações).
+# Importação: corpo CSV ou NDJSON (não multipart) copiado para um temporário, validado em lotes e
+# gravado com executemany numa transação só — ou entra tudo ou nada. Linhas com `id` substituem o
+# registro existente (upsert no SQLite/Postgres). Exportação: streaming, lendo o banco em lotes.
+
+router = APIRouter(prefix="/bulk", tags=["bulk"])
+
+Entity = Literal["clients", "technicians", "orders"]
+Format = Literal["csv", "ndjson"]
+ENTITIES = {"clients": (Client, ClientImport), "technicians": (Technician, TechnicianImport), "orders": (Order, OrderImport)}
+# chaves estrangeiras conferidas por lote (o SQLite não as aplica por padrão): 409 se faltar alguma
+REFERENCES = {"orders": {"client_id": Client, "technician_id": Technician}}
+BATCH_SIZE = 1000
+MAX_ERRORS = 50
+SPOOL_BYTES = 1024 * 1024  # acima disso o corpo vai para disco
+
+def _records(fmt: Format, body) -> Iterator[tuple[int, dict | None]]:
+    """(linha, registro) do arquivo; registro None = linha NDJSON inválida."""
+    text = codecs.getreader("utf-8-sig")(body)
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for row in reader:
+            # célula vazia = campo ausente (None), como numa planilha
+            yield reader.line_num, {k: v for k, v in row.items() if k and v not in ("", None)}
+    else:
+        for n, line in enumerate(text, start=1):
+            if line.strip():
+                try:
+                    yield n, json.loads(line)
+                except json.JSONDecodeError:
+                    yield n, None
+
+def _write(db: Session, table, rows: list[dict]) -> None:
+    new = [r for r in rows if r.get("id") is None]
+    known = [r for r in rows if r.get("id") is not None]
+    if new:
+        db.execute(insert(table), [{k: v for k, v in r.items() if k != "id"} for r in new])  # executemany
+    if known:
+        dialect = db.get_bind().dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            stmt = (sqlite if dialect == "sqlite" else postgresql).insert(table)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["id"], set_={k: stmt.excluded[k] for k in known[0] if k != "id"}
+            )
+        else:
+            stmt = insert(table)
+        db.execute(stmt, known)
+
+def _check_refs(db: Session, entity: Entity, rows: list[dict]) -> None:
+    missing = {}
+    for field, ref in REFERENCES.get(entity, {}).items():
+        wanted = {r[field] for r in rows if r.get(field) is not None}
+        if wanted:
+            found = set(db.execute(select(ref.__table__.c.id).where(ref.__table__.c.id.in_(wanted))).scalars())
+            if wanted - found:
+                missing[field] = sorted(wanted - found)
+    if missing:
+        db.rollback()
+        raise HTTPException(409, {"message": "Nada foi importado: referências inexistentes", "missing": missing})
+
+def _import(db: Session, entity: Entity, fmt: Format, body) -> dict:
+    model, schema = ENTITIES[entity]
+    table = model.__table__
+    errors, batch, total = [], [], 0
+    for line, rec in _records(fmt, body):
+        try:
+            if rec is None:
+                raise ValueError("JSON inválido")
+            batch.append(schema.model_validate(rec).model_dump())
+        except (ValidationError, ValueError) as e:
+            detail = e.errors(include_url=False) if isinstance(e, ValidationError) else str(e)
+            errors.append({"line": line, "errors": detail})
+            if len(errors) >= MAX_ERRORS:
+                break
+        if len(batch) >= BATCH_SIZE:
+            if not errors:
+                _check_refs(db, entity, batch)
+                _write(db, table, batch)
+            total += len(batch); batch = []
+    if errors:
+        db.rollback()
+        raise HTTPException(422, {"message": "Nada foi importado", "errors": errors})
+    if batch:
+        _check_refs(db, entity, batch)
+        _write(db, table, batch)
+        total += len(batch)
+    if db.get_bind().dialect.name == "postgresql":
+        # ids vindos do arquivo não avançam a sequence: realinha para os próximos inserts
+        db.execute(text(f"select setval(pg_get_serial_sequence('\"{table.name}\"', 'id'), "
+                        f"coalesce((select max(id) from \"{table.name}\"), 1))"))
+    db.commit()
+    return {"ok": True, "rows": total}
+
+@router.post("/{entity}/import")
+async def import_rows(entity: Entity, request: Request, format: Format = "ndjson",
+                      db: Session = Depends(get_db), _user = Depends(get_current_user)):
+    limit = settings.MAX_IMPORT_MB * 1024 * 1024
+    too_large = HTTPException(413, f"Arquivo maior que {settings.MAX_IMPORT_MB} MB")
+    length = request.headers.get("content-length")
+    if length and length.isdigit() and int(length) > limit:
+        raise too_large
+    body = tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES)
+    try:
+        size = 0
+        async for chunk in request.stream():  # sem Content-Length (chunked): para ao passar do limite
+            size += len(chunk)
+            if size > limit:
+                raise too_large
+            body.write(chunk)
+        body.seek(0)
+        try:
+            return await run_in_threadpool(_import, db, entity, format, body)
+        except IntegrityError as e:  # FK/unique violada num lote ou no commit
+            await run_in_threadpool(db.rollback)
+            raise HTTPException(409, f"Conflito ao importar: {e.orig}")
+    finally:
+        body.close()
+
+def _plain(v):
+    return v.isoformat() if isinstance(v, datetime) else v
+
+def _export(entity: Entity, fmt: Format) -> Iterator[str]:
+    table = ENTITIES[entity][0].__table__
+    names = [c.name for c in table.columns]
+    # conexão própria: a sessão do get_db já terá sido fechada quando o streaming começar
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=BATCH_SIZE).execute(
+            select(table).order_by(table.c.id)
+        )
+        if fmt == "csv":
+            out = io.StringIO()
+            writer = csv.writer(out)
+            writer.writerow(names)
+            for part in result.partitions():
+                writer.writerows([["" if v is None else _plain(v) for v in row] for row in part])
+                yield out.getvalue()
+                out.seek(0); out.truncate()
+            yield out.getvalue()
+        else:
+            for part in result.partitions():
+                yield "".join(json.dumps(dict(zip(names, map(_plain, row))), ensure_ascii=False) + "\n" for row in part)
+
+@router.get("/{entity}/export")
+def export_rows(entity: Entity, format: Format = "ndjson", _user = Depends(get_current_user)):
+    media = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(_export(entity, format), media_type=media,
+                             headers={"Content-Disposition": f'attachment; filename="{entity}.{format}"'})
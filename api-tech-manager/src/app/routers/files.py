@@ -1,43 +1,68 @@
-import os, uuid
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
-from sqlmodel import Session
+from typing import List
+from sqlmodel import Session, select
 from ..deps import get_db, get_current_user
-from ..models import Order
+from ..models import Order, OrderAttachment
+from ..schemas import AttachmentOut
 from ..core.config import settings
+from ..core.storage import StorageBackend, StorageNotConfigured, StoredFile, get_storage, save_many
+from ..core.uploads import UploadTooLarge
 
 router = APIRouter(prefix="/files", tags=["files"])
 
-def _save_local(file: UploadFile) -> str:
-    os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
-    ext = os.path.splitext(file.filename or "")[1]
-    name = f"{uuid.uuid4().hex}{ext or ''}"
-    dst = os.path.join(settings.UPLOAD_DIR, name)
-    with open(dst, "wb") as f:
-        f.write(file.file.read())
-    return f"/static/{name}"
-
-def _save_supabase(file: UploadFile) -> str:
-    from supabase import create_client
-    if not (settings.SUPABASE_URL and settings.SUPABASE_ANON_KEY and settings.SUPABASE_BUCKET):
+def _storage() -> StorageBackend:
+    try:
+        return get_storage()
+    except StorageNotConfigured:
         raise HTTPException(500, "Supabase não configurado")
-    client = create_client(settings.SUPABASE_URL, settings.SUPABASE_ANON_KEY)
-    ext = os.path.splitext(file.filename or "")[1]
-    path = f"{uuid.uuid4().hex}{ext or ''}"
-    data = file.file.read()
-    client.storage.from_(settings.SUPABASE_BUCKET).upload(path, data, {"contentType": file.content_type or "application/octet-stream"})
-    public_url = client.storage.from_(settings.SUPABASE_BUCKET).get_public_url(path)
-    return public_url
 
-@router.post("/orders/{order_id}/attach")
-def attach_file(order_id: int, file: UploadFile = File(...), db: Session = Depends(get_db), _user = Depends(get_current_user)):
+def _attach(db: Session, order_id: int, files: List[UploadFile], storage: StorageBackend) -> List[OrderAttachment]:
     order = db.get(Order, order_id)
     if not order: raise HTTPException(404, "Ordem não encontrada")
+    if len(files) > settings.MAX_FILES_PER_UPLOAD:
+        raise HTTPException(413, f"Máximo de {settings.MAX_FILES_PER_UPLOAD} arquivos por envio")
+    try:
+        stored: List[StoredFile] = save_many(storage, [(f.file, f.filename, f.content_type) for f in files])
+    except UploadTooLarge:
+        raise HTTPException(413, f"Arquivo maior que {settings.MAX_UPLOAD_MB} MB")
+    rows = [
+        OrderAttachment(order_id=order_id, url=s.url, storage_key=s.key, sha256=s.sha256, size=s.size,
+                        filename=s.filename, content_type=s.content_type)
+        for s in stored
+    ]
+    order.attachment_url = rows[-1].url  # compatibilidade: último anexo enviado
+    db.add_all(rows); db.add(order); db.commit()
+    for r in rows: db.refresh(r)
+    return rows
 
-    if settings.UPLOAD_BACKEND == "supabase":
-        url = _save_supabase(file)
-    else:
-        url = _save_local(file)
-
-    order.attachment_url = url
-    db.add(order); db.commit(); db.refresh(order)
+@router.post("/orders/{order_id}/attach")
+def attach_file(order_id: int, file: UploadFile = File(...), db: Session = Depends(get_db),
+                storage: StorageBackend = Depends(_storage), _user = Depends(get_current_user)):
+    url = _attach(db, order_id, [file], storage)[0].url
     return {"ok": True, "attachment_url": url}
+
+@router.post("/orders/{order_id}/attachments", response_model=List[AttachmentOut])
+def attach_files(order_id: int, files: List[UploadFile] = File(...), db: Session = Depends(get_db),
+                 storage: StorageBackend = Depends(_storage), _user = Depends(get_current_user)):
+    return _attach(db, order_id, files, storage)
+
+@router.get("/orders/{order_id}/attachments", response_model=List[AttachmentOut])
+def list_attachments(order_id: int, db: Session = Depends(get_db), _user = Depends(get_current_user)):
+    if not db.get(Order, order_id): raise HTTPException(404, "Ordem não encontrada")
+    return db.exec(select(OrderAttachment).where(OrderAttachment.order_id == order_id).order_by(OrderAttachment.id)).all()
+
+@router.delete("/attachments/{attachment_id}")
+def delete_attachment(attachment_id: int, db: Session = Depends(get_db), _user = Depends(get_current_user)):
+    att = db.get(OrderAttachment, attachment_id)
+    if not att: raise HTTPException(404, "Anexo não encontrado")
+    # só o vínculo: o arquivo é endereçado por conteúdo e pode ser de outros anexos
+    db.delete(att); db.flush()
+    order = db.get(Order, att.order_id)
+    if order and order.attachment_url == att.url:
+        # compatibilidade: volta para o anexo mais recente que sobrou (ou nenhum)
+        newest = db.exec(select(OrderAttachment).where(OrderAttachment.order_id == att.order_id)
+                         .order_by(OrderAttachment.id.desc())).first()
+        order.attachment_url = newest.url if newest else None
+        db.add(order)
+    db.commit()
+    return {"ok": True}
@@ -1,29 +1,58 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+import base64
+from dataclasses import asdict
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from typing import List, Optional
+from sqlalchemy import delete, func, tuple_
 from sqlmodel import Session, select
-from ..models import Order
-from ..schemas import OrderIn, OrderOut
+from ..models import Order, OrderAttachment, Technician
+from ..schemas import OrderIn, OrderOut, DispatchRequest, DispatchResult
 from ..deps import get_db, get_current_user
+from ..core.dispatch import OPEN_STATUSES, BatchTooLarge, DispatchIndex, plan
 
 router = APIRouter(prefix="/orders", tags=["orders"])
 
+# Cursor opaco = posição (created_at, id) da última ordem da página anterior
+def _encode_cursor(order: Order) -> str:
+    raw = f"{order.created_at.isoformat()}|{order.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, order_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(order_id)
+    except ValueError:
+        raise HTTPException(400, "Cursor inválido")
+
 @router.get("/", response_model=List[OrderOut])
 def list_orders(
+    response: Response,
     status: Optional[str] = None,
     client_id: Optional[int] = None,
     technician_id: Optional[int] = None,
-    limit: int = 100,
+    created_from: Optional[datetime] = Query(None, description="created_at >= (ISO 8601)"),
+    created_to: Optional[datetime] = Query(None, description="created_at < (ISO 8601)"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor da página anterior"),
+    limit: int = Query(100, ge=1, le=500),
     db: Session = Depends(get_db),
     _user = Depends(get_current_user),
 ):
+    # Mais recentes primeiro; filtros e paginação no SQL (índices compostos em models.Order)
     stmt = select(Order)
+    if status: stmt = stmt.where(Order.status == status)
+    if client_id: stmt = stmt.where(Order.client_id == client_id)
+    if technician_id: stmt = stmt.where(Order.technician_id == technician_id)
+    if created_from: stmt = stmt.where(Order.created_at >= created_from)
+    if created_to: stmt = stmt.where(Order.created_at < created_to)
+    if cursor:
+        stmt = stmt.where(tuple_(Order.created_at, Order.id) < tuple_(*_decode_cursor(cursor)))
+    stmt = stmt.order_by(Order.created_at.desc(), Order.id.desc()).limit(limit + 1)
     rows = db.exec(stmt).all()
-    def ok(o: Order) -> bool:
-        if status and o.status != status: return False
-        if client_id and o.client_id != client_id: return False
-        if technician_id and o.technician_id != technician_id: return False
-        return True
-    return [o for o in rows if ok(o)][:limit]
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = _encode_cursor(rows[-1])
+    return rows
 
 @router.post("/", response_model=OrderOut)
 def create_order(payload: OrderIn, db: Session = Depends(get_db), _user = Depends(get_current_user)):
@@ -31,6 +60,30 @@ def create_order(payload: OrderIn, db: Session = Depends(get_db), _user = Depend
     db.add(order); db.commit(); db.refresh(order)
     return order
 
+@router.post("/dispatch", response_model=DispatchResult)
+def dispatch_orders(payload: DispatchRequest, db: Session = Depends(get_db), _user = Depends(get_current_user)):
+    stmt = select(Order).where(Order.technician_id.is_(None), Order.status == "Pendente")
+    if payload.order_ids:
+        stmt = stmt.where(Order.id.in_(payload.order_ids))
+    orders = db.exec(stmt.order_by(Order.created_at, Order.id).limit(payload.limit)).all()
+    techs = db.exec(select(Technician).where(Technician.is_active == True)).all()
+    workload = dict(db.exec(
+        select(Order.technician_id, func.count()).where(Order.technician_id.is_not(None), Order.status.in_(OPEN_STATUSES))
+        .group_by(Order.technician_id)
+    ).all())
+    try:
+        assigned = plan(orders, DispatchIndex(techs, workload), payload.max_per_tech, payload.max_open, payload.same_state)
+    except BatchTooLarge:
+        raise HTTPException(422, "Lote grande demais: reduza limit ou max_per_tech")
+    if payload.apply and assigned:
+        by_id = {o.id: o for o in orders}
+        for a in assigned:
+            by_id[a.order_id].technician_id = a.technician_id
+            by_id[a.order_id].status = "Agendado"
+        db.commit()
+    done = {a.order_id for a in assigned}
+    return DispatchResult(assigned=[asdict(a) for a in assigned], unassigned=[o.id for o in orders if o.id not in done])
+
 @router.get("/{order_id}", response_model=OrderOut)
 def get_order(order_id: int, db: Session = Depends(get_db), _user = Depends(get_current_user)):
     order = db.get(Order, order_id)
@@ -49,5 +102,6 @@ def update_order(order_id: int, payload: OrderIn, db: Session = Depends(get_db),
 def delete_order(order_id: int, db: Session = Depends(get_db), _user = Depends(get_current_user)):
     order = db.get(Order, order_id)
     if not order: raise HTTPException(404, "Ordem não encontrada")
+    db.exec(delete(OrderAttachment).where(OrderAttachment.order_id == order_id))
     db.delete(order); db.commit()
     return {"ok": True}
@@ -1,32 +1,30 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import List, Optional
+from sqlalchemy import func
 from sqlmodel import Session, select
 from ..models import Technician
 from ..schemas import TechnicianIn, TechnicianOut
 from ..deps import get_db, get_current_user
+from ..core.search import search_technicians
 
 router = APIRouter(prefix="/technicians", tags=["technicians"])
 
 @router.get("/", response_model=List[TechnicianOut])
 def list_techs(
-    q: Optional[str] = Query(None, description="Busca por nome/cidade/skills"),
+    q: Optional[str] = Query(None, description="Busca por nome/cidade/UF/skills (todos os termos, por relevância)"),
     city: Optional[str] = None,
     state: Optional[str] = None,
     active: Optional[bool] = None,
-    limit: int = 50,
+    limit: int = Query(50, ge=1, le=500),
     db: Session = Depends(get_db),
     _user = Depends(get_current_user),
 ):
     statement = select(Technician)
-    rows = db.exec(statement).all()
-    def matches(t: Technician) -> bool:
-        if q and (q.lower() not in (t.name or "").lower() and q.lower() not in (t.city or "").lower() and q.lower() not in (t.skills or "").lower()):
-            return False
-        if city and (t.city or "").lower() != city.lower(): return False
-        if state and (t.state or "").upper() != state.upper(): return False
-        if active is not None and t.is_active != active: return False
-        return True
-    return [t for t in rows if matches(t)][:limit]
+    if city: statement = statement.where(func.lower(Technician.city) == city.lower())
+    if state: statement = statement.where(func.upper(Technician.state) == state.upper())
+    if active is not None: statement = statement.where(Technician.is_active == active)
+    statement = search_technicians(statement, q, db.get_bind().dialect.name)
+    return db.exec(statement.limit(limit)).all()
 
 @router.post("/", response_model=TechnicianOut)
 def create_tech(payload: TechnicianIn, db: Session = Depends(get_db), _user = Depends(get_current_user)):
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional
+from pydantic import BaseModel, EmailStr, Field
+from typing import List, Optional
+from datetime import datetime
 
 # Auth
 class TokenPair(BaseModel):
@@ -60,6 +61,48 @@ class OrderIn(BaseModel):
 
 class OrderOut(OrderIn):
     id: int
+    created_at: Optional[datetime] = None
     attachment_url: Optional[str] = None
     class Config:
         from_attributes = True
+
+# Importação em massa: mesmos campos de entrada + id opcional (linha com id substitui o registro)
+class TechnicianImport(TechnicianIn):
+    id: Optional[int] = None
+
+class ClientImport(ClientIn):
+    id: Optional[int] = None
+
+class OrderImport(OrderIn):
+    id: Optional[int] = None
+
+class AttachmentOut(BaseModel):
+    id: int
+    order_id: int
+    url: str
+    sha256: str
+    size: int
+    filename: Optional[str] = None
+    content_type: Optional[str] = None
+    created_at: datetime
+    class Config:
+        from_attributes = True
+
+# Despacho automático
+class DispatchRequest(BaseModel):
+    order_ids: Optional[List[int]] = None  # vazio = ordens pendentes sem técnico, mais antigas primeiro
+    limit: int = Field(500, ge=1, le=2000)
+    max_per_tech: int = Field(3, ge=1, le=10)         # ordens novas por técnico neste lote
+    max_open: Optional[int] = Field(None, ge=1, le=100)  # teto de ordens abertas por técnico (contando as novas)
+    same_state: bool = False               # só técnicos da mesma UF
+    apply: bool = True                     # False = só simula
+
+class DispatchAssignment(BaseModel):
+    order_id: int
+    technician_id: int
+    cost: float
+    skill_match: float
+
+class DispatchResult(BaseModel):
+    assigned: List[DispatchAssignment]
+    unassigned: List[int]
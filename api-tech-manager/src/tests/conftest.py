@@ -0,0 +1,46 @@
+import os, tempfile
+
+# config.Settings e o engine são criados no import: ambiente de teste antes de importar src.app
+_TMP = tempfile.mkdtemp(prefix="api-tech-manager-tests-")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_TMP, 'test.db')}"
+os.environ["UPLOAD_DIR"] = os.path.join(_TMP, "uploads")
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlmodel import SQLModel
+from src.app.core.db import engine, init_db
+from src.app.core.uploads import UploadSizeLimit
+from src.app.deps import get_current_user, token_cache, user_cache
+from src.app.models import User
+from src.app.routers import auth, bulk, clients, files, orders, technicians
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(UploadSizeLimit)
+    for r in (auth, technicians, clients, orders, files, bulk):
+        app.include_router(r.router)
+    return app
+
+@pytest.fixture
+def db():
+    """Banco limpo a cada teste (mesmo arquivo; o engine do app é global)."""
+    with engine.begin() as conn:
+        conn.execute(text("drop table if exists technician_fts"))
+    SQLModel.metadata.drop_all(engine)
+    init_db()
+    token_cache.clear(); user_cache.clear()
+    return engine
+
+@pytest.fixture
+def app(db):
+    app = make_app()
+    app.dependency_overrides[get_current_user] = lambda: User(id=0, email="t@example.com", full_name="T",
+                                                              hashed_password="", role="admin")
+    return app
+
+@pytest.fixture
+def client(app):
+    return TestClient(app)
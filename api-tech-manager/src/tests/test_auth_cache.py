@@ -0,0 +1,42 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, update
+from src.app.core.security import create_token
+from src.app.deps import user_cache
+from src.app.models import User
+from src.tests.conftest import make_app
+
+@pytest.fixture
+def auth_client(db):
+    with Session(db) as s:
+        s.add(User(email="op@example.com", full_name="Op", hashed_password="x")); s.commit()
+    client = TestClient(make_app())  # sem override: get_current_user de verdade
+    client.headers["Authorization"] = f"Bearer {create_token('op@example.com', 5)}"
+    return client
+
+def _deactivate(s: Session) -> None:
+    u = s.get(User, 1); u.is_active = False; s.add(u)
+
+def test_cached_user_is_dropped_on_deactivation(auth_client, db):
+    assert auth_client.get("/clients/").status_code == 200
+    assert "op@example.com" in user_cache._data
+    with Session(db) as s:
+        _deactivate(s); s.commit()
+    assert auth_client.get("/clients/").status_code == 401
+
+def test_read_between_flush_and_commit_is_not_kept(auth_client, db):
+    with Session(db) as s:
+        _deactivate(s); s.flush()
+        # outro request lê a linha ainda ativa (commitada) e a recoloca no cache
+        assert auth_client.get("/clients/").status_code == 200
+        s.commit()
+    assert auth_client.get("/clients/").status_code == 401
+
+def test_rollback_and_bulk_update(auth_client, db):
+    assert auth_client.get("/clients/").status_code == 200
+    with Session(db) as s:
+        _deactivate(s); s.flush(); s.rollback()
+    assert auth_client.get("/clients/").status_code == 200
+    with Session(db) as s:
+        s.exec(update(User).values(is_active=False)); s.commit()
+    assert auth_client.get("/clients/").status_code == 401
@@ -0,0 +1,66 @@
+import csv, io, json
+from sqlmodel import Session, func, select
+from src.app.models import Client, Order
+
+def _count(db, model):
+    with Session(db) as s:
+        return s.exec(select(func.count()).select_from(model)).one()
+
+def _ndjson(rows):
+    return "".join(json.dumps(r) + "\n" for r in rows).encode()
+
+def test_one_bad_row_stores_nothing(client, db):
+    rows = [{"name": f"Cliente {i}", "document": str(i)} for i in range(1500)]
+    rows[1200] = {"document": "sem nome"}  # segundo lote: o primeiro já passou pela validação
+    body = _ndjson(rows[:700]) + b"nao e json\n" + _ndjson(rows[700:])
+    r = client.post("/bulk/clients/import", content=body)
+    assert r.status_code == 422
+    detail = r.json()["detail"]
+    assert [e["line"] for e in detail["errors"]] == [701, 1202]
+    assert detail["errors"][1]["errors"][0]["loc"] == ["name"]
+    assert _count(db, Client) == 0
+
+def test_csv_bad_row_reports_line(client, db):
+    body = "name,is_active\nA,true\nB,talvez\n"
+    r = client.post("/bulk/clients/import?format=csv", content=body.encode())
+    assert r.status_code == 422 and [e["line"] for e in r.json()["detail"]["errors"]] == [3]
+    assert _count(db, Client) == 0
+
+def test_missing_foreign_key_is_409(client, db):
+    client.post("/bulk/clients/import", content=_ndjson([{"name": "c"}]))
+    r = client.post("/bulk/orders/import", content=_ndjson([{"client_id": 1}, {"client_id": 99}, {"client_id": 1, "technician_id": 7}]))
+    assert r.status_code == 409
+    assert r.json()["detail"]["missing"] == {"client_id": [99], "technician_id": [7]}
+    assert _count(db, Order) == 0
+
+def test_csv_export_reimport_updates_in_place(client, db):
+    client.post("/bulk/clients/import", content=_ndjson([{"name": "c1"}, {"name": "c2"}]))
+    orders = [{"client_id": 1 + i % 2, "city": "BH", "description": f"os {i}"} for i in range(2500)]
+    assert client.post("/bulk/orders/import", content=_ndjson(orders)).json() == {"ok": True, "rows": 2500}
+    before = {o["id"]: o for o in map(json.loads, client.get("/bulk/orders/export").text.splitlines())}
+
+    exported = list(csv.DictReader(io.StringIO(client.get("/bulk/orders/export?format=csv").text)))
+    assert len(exported) == 2500
+    for row in exported[:10]:
+        row["status"] = "Finalizado"
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=list(exported[0]))
+    writer.writeheader(); writer.writerows(exported)
+    r = client.post("/bulk/orders/import?format=csv", content=out.getvalue().encode())
+    assert r.json() == {"ok": True, "rows": 2500}
+
+    after = {o["id"]: o for o in map(json.loads, client.get("/bulk/orders/export").text.splitlines())}
+    assert _count(db, Order) == 2500 and after.keys() == before.keys()
+    assert all(after[i]["created_at"] == before[i]["created_at"] for i in before)
+    changed = {i for i in before if after[i] != before[i]}
+    assert changed == {int(row["id"]) for row in exported[:10]}
+    assert {after[i]["status"] for i in changed} == {"Finalizado"}
+
+def test_import_body_over_limit_is_413(client, db, monkeypatch):
+    from src.app.core.config import settings
+    monkeypatch.setattr(settings, "MAX_IMPORT_MB", 1)
+    rows = _ndjson([{"name": "x" * 1000}] * 1100)  # ~1,1 MB
+    assert client.post("/bulk/clients/import", content=rows).status_code == 413
+    chunked = client.post("/bulk/clients/import", content=iter([rows[:600_000], rows[600_000:]]))
+    assert "content-length" not in chunked.request.headers and chunked.status_code == 413
+    assert _count(db, Client) == 0
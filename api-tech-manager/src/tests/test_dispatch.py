@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from sqlmodel import Session
+from src.app.core import dispatch
+from src.app.core.dispatch import DispatchIndex, plan
+from src.app.models import Client, Order, Technician
+
+TECHS = [
+    Technician(id=1, name="A", city="Belo Horizonte", state="MG", skills="Fibra, rede"),
+    Technician(id=2, name="B", city="São Paulo", state="SP", skills="cftv"),
+]
+WORKLOAD = {2: 2}
+
+def _orders():
+    return [
+        Order(id=10, client_id=1, city="Belo Horizonte", state="MG", description="instalar fibra"),
+        Order(id=11, client_id=1, city="Sao Paulo", state="SP", description="câmeras CFTV"),
+        Order(id=12, client_id=1, city="Contagem", state="MG", description="fibra e cftv"),
+        Order(id=13, client_id=1, city="Recife", state="PE", description="visita"),
+    ]
+
+def test_base_cost_by_hand():
+    cost, covered = DispatchIndex(TECHS, WORKLOAD).base_cost(_orders())
+    # skill faltando (fração) + local (0 cidade, 0.5 mesma UF, 1 outra UF); sem carga
+    assert np.allclose(cost, [[0.0, 2.0], [2.0, 0.0], [1.0, 1.5], [1.0, 1.0]])
+    assert np.allclose(covered, [[1, 0], [0, 1], [0.5, 0.5], [1, 1]])
+
+def test_plan_min_cost_with_slots_and_load():
+    out = {a.order_id: (a.technician_id, a.cost) for a in plan(_orders(), DispatchIndex(TECHS, WORKLOAD), max_per_tech=2)}
+    # A: 10 (0 + carga 0) e 12 (1.0 + 2ª vaga 0.1); B (carga 2): 11 (0 + 0.2) e 13 (1.0 + 0.3)
+    assert out == {10: (1, 0.0), 11: (2, 0.2), 12: (1, 1.1), 13: (2, 1.3)}
+
+def test_plan_capacity_and_same_state():
+    index = DispatchIndex(TECHS, WORKLOAD)
+    out = plan(_orders(), index, max_per_tech=1)
+    assert {(a.order_id, a.technician_id) for a in out} == {(10, 1), (11, 2)}
+    # max_open 2: B já tem 2 abertas, não recebe nada
+    assert {a.technician_id for a in plan(_orders(), index, max_per_tech=3, max_open=2)} == {1}
+    # só mesma UF: PE não tem técnico; MG vai para A
+    out = {a.order_id: a.technician_id for a in plan(_orders(), index, max_per_tech=3, same_state=True)}
+    assert out == {10: 1, 11: 2, 12: 1}
+
+def test_plan_rejects_huge_batch(monkeypatch):
+    monkeypatch.setattr(dispatch, "MAX_CELLS", 5)
+    with pytest.raises(dispatch.BatchTooLarge):
+        plan(_orders(), DispatchIndex(TECHS, WORKLOAD), max_per_tech=1)
+
+def test_dispatch_endpoint_bounds_and_apply(client, db):
+    with Session(db) as s:
+        s.add(Client(name="c")); s.commit()
+        s.add_all([Technician(name=t.name, city=t.city, state=t.state, skills=t.skills) for t in TECHS])
+        s.add_all([Order(client_id=1, city=o.city, state=o.state, description=o.description) for o in _orders()[:2]])
+        s.commit()
+    for bad in ({"max_per_tech": -1}, {"max_per_tech": 0}, {"limit": 0}, {"limit": 10**6}, {"max_open": 0}):
+        assert client.post("/orders/dispatch", json=bad).status_code == 422
+    r = client.post("/orders/dispatch", json={"apply": False})
+    assert r.status_code == 200 and len(r.json()["assigned"]) == 2
+    assert client.get("/orders/1").json()["technician_id"] is None
+    client.post("/orders/dispatch", json={})
+    assert [(o["technician_id"], o["status"]) for o in (client.get(f"/orders/{i}").json() for i in (1, 2))] == \
+        [(1, "Agendado"), (2, "Agendado")]
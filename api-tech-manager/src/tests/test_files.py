@@ -0,0 +1,95 @@
+import hashlib, importlib.util, os
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+from src.app.core.config import settings
+from src.app.core.storage import LocalStorage
+from src.app.models import Client, Order, OrderAttachment
+from src.app.routers import files
+
+@pytest.fixture
+def storage(app, db, tmp_path):
+    with Session(db) as s:
+        s.add(Client(name="c")); s.commit()
+        s.add(Order(client_id=1)); s.commit()
+    backend = LocalStorage(str(tmp_path / "uploads"))
+    app.dependency_overrides[files._storage] = lambda: backend
+    return backend
+
+def _all_files(path):
+    return sorted(os.path.relpath(os.path.join(d, f), path) for d, _, fs in os.walk(path) for f in fs)
+
+def test_staging_is_outside_served_root(client, storage, tmp_path):
+    root = str(tmp_path / "uploads")
+    assert not os.path.abspath(storage.staging_dir).startswith(os.path.abspath(root) + os.sep)
+    assert os.path.dirname(os.path.abspath(storage.staging_dir)) == os.path.dirname(os.path.abspath(root))
+    r = client.post("/files/orders/1/attach", files={"file": ("a.txt", b"abc", "text/plain")})
+    assert r.status_code == 200
+    digest = hashlib.sha256(b"abc").hexdigest()
+    assert _all_files(root) == [f"{digest[:2]}/{digest}.txt"]
+    assert os.listdir(storage.staging_dir) == []
+
+def _attachments(db):
+    with Session(db) as s:
+        return s.exec(select(OrderAttachment).order_by(OrderAttachment.id)).all()
+
+def test_multi_upload_one_row_per_file_and_dedup(client, storage, db, tmp_path):
+    same, other = b"mesma foto" * 1000, os.urandom(300_000)
+    fs = [("files", ("a.JPG", same, "image/jpeg")), ("files", ("b.jpg", same, "image/jpeg")),
+          ("files", ("c.pdf", other, "application/pdf"))]
+    r = client.post("/files/orders/1/attachments", files=fs)
+    assert r.status_code == 200
+    assert [a["filename"] for a in r.json()] == ["a.JPG", "b.jpg", "c.pdf"]
+    rows = _attachments(db)
+    assert [(a.order_id, a.filename, a.size) for a in rows] == [(1, "a.JPG", len(same)), (1, "b.jpg", len(same)),
+                                                                (1, "c.pdf", len(other))]
+    h1, h2 = hashlib.sha256(same).hexdigest(), hashlib.sha256(other).hexdigest()
+    # conteúdo igual: uma cópia só, em ab/<sha256>.<ext> (extensão minúscula)
+    assert _all_files(tmp_path / "uploads") == sorted([f"{h1[:2]}/{h1}.jpg", f"{h2[:2]}/{h2}.pdf"])
+    assert rows[0].storage_key == rows[1].storage_key == f"{h1[:2]}/{h1}.jpg" and rows[0].sha256 == h1
+    assert client.get("/orders/1").json()["attachment_url"] == rows[-1].url
+    assert len(client.get("/files/orders/1/attachments").json()) == 3
+
+def test_oversized_file_is_413_and_leaves_no_temp(client, storage, db, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_UPLOAD_MB", 1)
+    fs = [("files", ("ok.jpg", b"x" * 1000, "image/jpeg")), ("files", ("big.jpg", b"y" * (1024 * 1024 + 1), "image/jpeg"))]
+    r = client.post("/files/orders/1/attachments", files=fs)
+    assert r.status_code == 413
+    assert _attachments(db) == []
+    assert not [f for f in os.listdir(storage.staging_dir) if f.startswith(".upload-")]
+    assert not [f for f in _all_files(storage.root) if ".upload-" in f]
+
+def test_delete_attachment_keeps_blob(client, storage, db, tmp_path):
+    fs = [("files", ("a.png", b"png", "image/png")), ("files", ("b.png", b"png", "image/png"))]
+    first, second = client.post("/files/orders/1/attachments", files=fs).json()
+    blobs = _all_files(tmp_path / "uploads")
+    assert client.delete(f"/files/attachments/{first['id']}").json() == {"ok": True}
+    assert [a.id for a in _attachments(db)] == [second["id"]]
+    assert _all_files(tmp_path / "uploads") == blobs  # ainda usado pelo outro anexo (e por endereço de conteúdo)
+    assert client.delete(f"/files/attachments/{first['id']}").status_code == 404
+
+def test_delete_attachment_repoints_order_attachment_url(client, storage, db):
+    fs = [("files", ("a.txt", b"a", "text/plain")), ("files", ("b.txt", b"b", "text/plain"))]
+    first, second = client.post("/files/orders/1/attachments", files=fs).json()
+    url = lambda: Session(db).get(Order, 1).attachment_url
+    assert url() == second["url"]
+    client.delete(f"/files/attachments/{first['id']}")
+    assert url() == second["url"]  # não era o apontado: fica como está
+    third = client.post("/files/orders/1/attachments", files=[("files", ("c.txt", b"c", "text/plain"))]).json()[0]
+    client.delete(f"/files/attachments/{third['id']}")
+    assert url() == second["url"]
+    client.delete(f"/files/attachments/{second['id']}")
+    assert url() is None
+
+def test_413_from_size_limit_carries_cors_headers(db, monkeypatch):
+    # o app real (main.py.py não é importável pelo nome): a ordem dos middlewares é a dele
+    os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+    path = os.path.join(os.path.dirname(files.__file__), os.pardir, "main.py.py")
+    spec = importlib.util.spec_from_file_location("src.app.main", path)
+    main = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(main)
+    monkeypatch.setattr(settings, "MAX_REQUEST_MB", 0)
+    r = TestClient(main.app).post("/files/orders/1/attachments", headers={"Origin": "https://app.example.com"},
+                                  files=[("files", ("a.bin", b"x" * (128 * 1024), "application/octet-stream"))])
+    assert r.status_code == 413 and "Envio maior" in r.json()["detail"]
+    assert r.headers.get("access-control-allow-origin")
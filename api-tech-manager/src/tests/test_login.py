@@ -0,0 +1,40 @@
+import pytest
+from concurrent.futures.process import BrokenProcessPool
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session
+from src.app.core import security
+from src.app.core.security import HashPoolBusy, hash_password
+from src.app.models import User
+from src.app.routers import auth
+from src.tests.conftest import make_app
+
+CREDS = {"email": "op@example.com", "password": "s3nha"}
+
+@pytest.fixture
+def login_client(db):
+    with Session(db) as s:
+        s.add(User(email=CREDS["email"], full_name="Op", hashed_password=hash_password(CREDS["password"]), failed_attempts=2)); s.commit()
+    yield TestClient(make_app())
+    security.shutdown_pool()
+
+def test_login_verifies_in_pool_without_reload_after_commit(login_client, db):
+    statements = []
+    listener = lambda conn, cursor, stmt, *a: statements.append(stmt.split()[0].upper())
+    event.listen(db, "before_cursor_execute", listener)
+    try:
+        r = login_client.post("/auth/login", json=CREDS)
+    finally:
+        event.remove(db, "before_cursor_execute", listener)
+    assert r.status_code == 200 and r.json()["access_token"]
+    # lookup + update dos contadores; nenhum SELECT de recarga depois do commit
+    assert statements == ["SELECT", "UPDATE"]
+    assert login_client.post("/auth/login", json={**CREDS, "password": "errada"}).status_code == 401
+
+@pytest.mark.parametrize("exc, status", [(HashPoolBusy(), 429), (BrokenProcessPool(), 503)])
+def test_login_pool_errors(login_client, monkeypatch, exc, status):
+    async def fail(*args):
+        raise exc
+    monkeypatch.setattr(auth, "verify_password_async", fail)
+    r = login_client.post("/auth/login", json=CREDS)
+    assert r.status_code == status and r.headers["Retry-After"] == "1"
@@ -0,0 +1,43 @@
+import datetime as dt
+from sqlmodel import Session
+from src.app.models import Client, Order
+
+T0 = dt.datetime(2025, 1, 1, 8, 0)
+
+def _seed(engine, created):
+    with Session(engine) as s:
+        s.add(Client(name="c")); s.commit()
+        s.add_all([Order(client_id=1, status=st, created_at=t) for t, st in created]); s.commit()
+
+def _pages(client, **params):
+    pages, cursor = [], None
+    while True:
+        r = client.get("/orders/", params={**params, **({"cursor": cursor} if cursor else {})})
+        assert r.status_code == 200
+        pages.append([o["id"] for o in r.json()])
+        cursor = r.headers.get("X-Next-Cursor")
+        if not cursor:
+            return pages
+
+def test_cursor_tiebreak_on_equal_created_at(client, db):
+    # 5 ordens no mesmo instante: a quebra de página cai no meio delas
+    _seed(db, [(T0, "Pendente")] * 5 + [(T0 - dt.timedelta(hours=1), "Pendente")] * 2)
+    pages = _pages(client, limit=3)
+    assert pages == [[5, 4, 3], [2, 1, 7], [6]]
+
+def test_cursor_with_date_range_and_filter(client, db):
+    _seed(db, [(T0 + dt.timedelta(hours=i), "Pendente" if i % 2 else "Agendado") for i in range(10)])
+    params = {"created_from": (T0 + dt.timedelta(hours=2)).isoformat(),
+              "created_to": (T0 + dt.timedelta(hours=8)).isoformat(), "status": "Pendente", "limit": 2}
+    pages = _pages(client, **params)
+    # horas 3, 5, 7 (created_to é exclusivo), mais recentes primeiro
+    assert pages == [[8, 6], [4]]
+
+def test_last_page_has_no_cursor(client, db):
+    _seed(db, [(T0, "Pendente")] * 3)
+    r = client.get("/orders/", params={"limit": 3})
+    assert len(r.json()) == 3 and "X-Next-Cursor" not in r.headers
+
+def test_malformed_cursor(client, db):
+    for bad in ("zzz", "bm90LWEtY3Vyc29y", "!!"):
+        assert client.get("/orders/", params={"cursor": bad}).status_code == 400
@@ -0,0 +1,42 @@
+from sqlalchemy import text
+from sqlmodel import Session
+from src.app.core.db import init_db
+from src.app.models import Technician
+
+def _seed(engine):
+    with Session(engine) as s:
+        s.add_all([
+            Technician(name="João Silva", city="Belo Horizonte", state="MG", skills="rede, fibra"),
+            Technician(name="Ana", city="São Paulo", state="SP", skills="cftv, c++"),
+            Technician(name="Carlos", city="Uberlândia", state="MG", skills="cftv, c#", is_active=False),
+        ])
+        s.commit()
+
+def _names(client, **params):
+    r = client.get("/technicians/", params=params)
+    assert r.status_code == 200
+    return [t["name"] for t in r.json()]
+
+def test_search_all_terms_and_filters(client, db):
+    _seed(db)
+    assert _names(client, q="fibra MG") == ["João Silva"]
+    assert _names(client, q="joao") == ["João Silva"]
+    assert _names(client, q="cftv", active=True) == ["Ana"]
+    assert sorted(_names(client, state="mg")) == ["Carlos", "João Silva"]
+
+def test_search_keeps_plus_and_hash(client, db):
+    _seed(db)
+    assert _names(client, q="c++") == ["Ana"]
+    assert _names(client, q="c#") == ["Carlos"]
+
+def test_search_follows_updates_and_old_index_is_rebuilt(client, db):
+    _seed(db)
+    with db.begin() as conn:  # índice criado por uma versão anterior, sem tokenchars
+        conn.execute(text("drop table technician_fts"))
+        conn.execute(text("create virtual table technician_fts using fts5(name, city, state, skills, "
+                          "content='technician', content_rowid='id')"))
+    init_db()
+    assert _names(client, q="c++") == ["Ana"]
+    with Session(db) as s:
+        t = s.get(Technician, 2); t.skills = "rede"; s.add(t); s.commit()
+    assert _names(client, q="c++") == []
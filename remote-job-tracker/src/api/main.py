@@ -1,59 +1,356 @@
+"""
+API de leitura das vagas (FastAPI).
+Leituras usam um pool assíncrono (aiosqlite) de conexões somente leitura; escritas (/save)
+passam por um engine separado com uma única conexão. O banco fica em WAL, então os leitores
+não bloqueiam (nem são bloqueados por) o load.py gravando em paralelo.
+/jobs/ranked ranqueia com os índices do ETL mantidos em memória (src/match/live.py), trocados
+sem reiniciar quando o load.py publica uma nova versão.
+Benchmark de concorrência: python -m src.bench.api_concurrency
+"""
 from __future__ import annotations
-from fastapi import FastAPI, Query, HTTPException
+import asyncio, os
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Query, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from sqlalchemy import create_engine, text
-import pandas as pd
+from typing import Literal
+from pydantic import BaseModel, Field
+from sqlalchemy import bindparam, event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from pathlib import Path
+from src.etl import history
+from src.etl.enrich import parse_skills
+from src.match.live import LiveIndex, Snapshot
+from src.match.rank import widening_top_k
+from src.match.search import fts_query, snippet_sql
 
-DB_PATH = Path(__file__).resolve().parents[2] / "jobs.db"
-engine = create_engine(f"sqlite:///{DB_PATH}", future=True)
+DB_PATH = Path(os.getenv("JOBS_DB", Path(__file__).resolve().parents[2] / "jobs.db"))
+READ_POOL_SIZE = int(os.getenv("READ_POOL_SIZE", "8"))
+STATEMENT_CACHE = 256  # statements preparados mantidos por conexão (cache do sqlite3)
 
-app = FastAPI(title="Remote Job Tracker API")
+def _pragmas(*stmts: str):
+    def on_connect(dbapi_conn, _record):
+        cur = dbapi_conn.cursor()
+        for s in stmts:
+            cur.execute(s)
+        cur.close()
+    return on_connect
+
+def make_engines(db_path: Path = DB_PATH) -> tuple[AsyncEngine, AsyncEngine]:
+    """(leitura, escrita). O de leitura abre o arquivo em modo ro (URI) com um pool de conexões;
+    o de escrita tem uma conexão só, que serializa as escritas da API."""
+    reader = create_async_engine(
+        f"sqlite+aiosqlite:///file:{db_path}?mode=ro&uri=true",
+        pool_size=READ_POOL_SIZE, max_overflow=0,
+        connect_args={"cached_statements": STATEMENT_CACHE, "check_same_thread": False},
+    )
+    writer = create_async_engine(
+        f"sqlite+aiosqlite:///{db_path}", pool_size=1, max_overflow=0,
+        connect_args={"cached_statements": STATEMENT_CACHE, "check_same_thread": False},
+    )
+    event.listen(reader.sync_engine, "connect", _pragmas("pragma busy_timeout = 5000", "pragma query_only = 1"))
+    event.listen(writer.sync_engine, "connect", _pragmas("pragma busy_timeout = 5000", "pragma synchronous = normal"))
+    return reader, writer
+
+reader, writer = make_engines()
+live = LiveIndex()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # WAL é persistente no arquivo; garante o modo mesmo se o banco veio de uma versão antiga
+    async with writer.connect() as conn:
+        await conn.exec_driver_sql("pragma journal_mode = wal")
+    await asyncio.to_thread(live.refresh)
+    yield
+    await reader.dispose()
+    await writer.dispose()
+
+app = FastAPI(title="Remote Job Tracker API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"], allow_credentials=True,
     allow_methods=["*"], allow_headers=["*"],
+    expose_headers=["X-Total-Count", "X-Next-After-Id", "X-Next-Offset", "X-Index-Version"],
 )
 
 class SaveJobReq(BaseModel):
     job_id: int
     note: str | None = None
 
+class ProfileReq(BaseModel):
+    name: str = Field(min_length=1)
+    skills: str = Field(min_length=1)
+    min_match: float = Field(30, ge=0, le=100)
+
 @app.get("/")
-def root():
+async def root():
     return {"name": "Remote Job Tracker API", "status": "ok"}
 
+JOB_COLUMNS = [
+    "id","source","title","company","location","remote","seniority",
+    "stack","salary","salary_min","salary_max","salary_currency","url","description","published_at",
+    "created_at","dup_cluster"
+]
+
+def _projection(fields: str | None) -> list[str]:
+    if not fields:
+        return JOB_COLUMNS
+    cols = [c.strip() for c in fields.split(",") if c.strip()]
+    unknown = [c for c in cols if c not in JOB_COLUMNS]
+    if unknown:
+        raise HTTPException(400, f"Campos inválidos: {', '.join(unknown)}")
+    return ["id"] + [c for c in cols if c != "id"]  # id sempre vem (cursor)
+
 @app.get("/jobs")
-def list_jobs(q: str | None = None, company: str | None = None, min_match: float | None = Query(None, ge=0, le=100)):
-    # leitura básica
-    with engine.begin() as conn:
-        df = pd.read_sql("select * from jobs order by id desc", conn)
-    if q:
-        ql = q.lower()
-        df = df[df["title"].str.lower().str.contains(ql) | df["description"].str.lower().str.contains(ql)]
+async def list_jobs(
+    response: Response,
+    q: str | None = Query(None, description="Busca textual (FTS5) em título/descrição"),
+    company: str | None = None,
+    skills: str | None = Query(None, description="Skills exigidas, todas (AND), separadas por vírgula (ex.: python,fastapi)"),
+    seniority: Literal["intern", "junior", "mid", "senior", "lead"] | None = None,
+    min_salary: int | None = Query(None, ge=0, description="Salário anual: vagas cuja faixa chega a pelo menos este valor"),
+    currency: str | None = Query(None, min_length=3, max_length=3, description="Moeda da faixa salarial (ex.: USD)"),
+    collapse: bool = Query(False, description="Oculta quase duplicadas (mantém só a vaga canônica)"),
+    order: Literal["rank", "recent"] = Query("rank", description="Com q: relevância BM25 (rank) ou mais recentes"),
+    after_id: int | None = Query(None, description="Cursor (ordem recent): retorna vagas com id menor que este"),
+    offset: int = Query(0, ge=0, description="Paginação da ordem por relevância"),
+    limit: int = Query(50, ge=1, le=500),
+    fields: str | None = Query(None, description="Colunas separadas por vírgula (ex.: title,company,url)"),
+):
+    # filtros e paginação executados no SQLite; q usa o índice FTS5 (BM25 + snippet)
+    cols = _projection(fields)
+    select, source, where, params = [f"j.{c}" for c in cols], "jobs j", [], {}
+    expr = fts_query(q) if q else None
+    if q and not expr:
+        response.headers["X-Total-Count"] = "0"
+        return []
+    if expr:
+        source = "jobs j join jobs_fts on jobs_fts.rowid = j.id"
+        select.append(f"{snippet_sql()} as snippet")
+        where.append("jobs_fts match :q")
+        params["q"] = expr
     if company:
-        df = df[df["company"].str.contains(company, case=False, na=False)]
-    if min_match is not None and "match" in df.columns:
-        df = df[df["match"] >= min_match]
-    return df.fillna("").to_dict(orient="records")
+        where.append("j.company like :company")
+        params["company"] = f"%{company}%"
+    wanted = parse_skills(skills)
+    if wanted:
+        # job_skills tem PK (skill, job_id): cada skill é uma busca no índice; AND = vaga com todas
+        names = [f"skill{i}" for i in range(len(wanted))]
+        where.append(
+            f"j.id in (select job_id from job_skills where skill in ({', '.join(':' + n for n in names)})"
+            f" group by job_id having count(*) = {len(wanted)})"
+        )
+        params.update(zip(names, wanted))
+    if seniority:
+        where.append("j.seniority = :seniority")
+        params["seniority"] = seniority
+    if min_salary is not None:
+        where.append("j.salary_max >= :min_salary")
+        params["min_salary"] = min_salary
+    if currency:
+        where.append("j.salary_currency = :currency")
+        params["currency"] = currency.upper()
+    if collapse:
+        where.append("(j.dup_cluster is null or j.dup_cluster = j.id)")
+    filt = " and ".join(where) or "1=1"
+    by_rank = bool(expr) and order == "rank"
+    if by_rank:
+        page, tail = filt, "order by bm25(jobs_fts), j.id desc limit :limit offset :offset"
+    else:
+        page = filt + (" and j.id < :after_id" if after_id is not None else "")
+        tail = "order by j.id desc limit :limit"
+    # o SQL gerado só depende da combinação de filtros/campos: mesma string -> statement já preparado
+    async with reader.connect() as conn:
+        total = (await conn.execute(text(f"select count(*) from {source} where {filt}"), params)).scalar_one()
+        rows = (await conn.execute(
+            text(f"select {', '.join(select)} from {source} where {page} {tail}"),
+            {**params, "after_id": after_id, "offset": offset, "limit": limit},
+        )).mappings().all()
+    response.headers["X-Total-Count"] = str(total)
+    if len(rows) == limit:
+        if by_rank:
+            response.headers["X-Next-Offset"] = str(offset + limit)
+        else:
+            response.headers["X-Next-After-Id"] = str(rows[-1]["id"])
+    return [{k: ("" if v is None else v) for k, v in r.items()} for r in rows]
+
+async def _snapshot() -> Snapshot:
+    # a checagem do CURRENT é barata; recarregar (mmap das matrizes) vai para uma thread
+    return await asyncio.to_thread(live.refresh) if live.stale() else live.snapshot
+
+@app.get("/jobs/ranked")
+async def ranked_jobs(
+    response: Response,
+    skills: str = Query(..., min_length=1, description="Skills do candidato (ex.: python, fastapi, sql)"),
+    top_k: int = Query(50, ge=1, le=500),
+    min_match: float | None = Query(None, ge=0, le=100, description="Match mínimo (0..100)"),
+    mode: Literal["tfidf", "vector", "hybrid"] = Query("tfidf", description="Índice: TF-IDF, semântico ou híbrido"),
+    collapse: bool = Query(False, description="Só a vaga mais bem ranqueada de cada grupo de duplicadas"),
+    fields: str | None = Query(None, description="Colunas separadas por vírgula (ex.: title,company,url)"),
+):
+    """Vagas por match com as skills, direto do índice em memória (sem refit), em ordem decrescente."""
+    snap = await _snapshot()
+    index = snap.index(mode)
+    if index is None:
+        raise HTTPException(503, "Índice de ranking ainda não gerado (rode o load.py)")
+    scores = await asyncio.to_thread(index.score, skills)
+    floor = (min_match or 0) / 100
+    response.headers["X-Index-Version"] = str(snap.version)
+    cols = _projection(fields)
+    select = cols + (["dup_cluster"] if collapse and "dup_cluster" not in cols else [])
+    stmt = text(f"select {', '.join(select)} from jobs where id in :ids").bindparams(bindparam("ids", expanding=True))
+    by_id: dict = {}
+    # duplicadas (collapse) e vagas que saíram do banco são descartadas: amplia a seleção até completar top_k
+    for top in widening_top_k(scores, top_k):
+        cand = top[(scores[top] > 0) & (scores[top] >= floor)]
+        new = [i for i in index.ids[cand].tolist() if i not in by_id]
+        if new:
+            async with reader.connect() as conn:
+                rows = (await conn.execute(stmt, {"ids": new})).mappings().all()
+            by_id.update({i: None for i in new})
+            by_id.update({r["id"]: r for r in rows})
+        out, seen = [], set()
+        for pos in cand:
+            r = by_id[int(index.ids[pos])]
+            if r is None:  # vaga indexada que não está mais no banco
+                continue
+            if collapse:
+                group = r["dup_cluster"] or r["id"]
+                if group in seen:
+                    continue
+                seen.add(group)
+            item = {k: ("" if r[k] is None else r[k]) for k in cols}
+            item["match"] = round(float(scores[pos]) * 100, 2)
+            out.append(item)
+            if len(out) == top_k:
+                return out
+        if len(cand) < len(top):  # o resto está abaixo do min_match
+            break
+    return out
+
+SKILLS_SQL = text("""
+    select skill, count(*) as jobs from job_skills
+    group by skill order by jobs desc, skill limit :limit
+""")
+JOB_EXISTS_SQL = text("select id from jobs where id = :i")
+SAVE_SQL = text("insert into saved_jobs(job_id, note) values (:i, :n)")
+SAVED_SQL = text("""
+    select s.id as saved_id, j.*
+    from saved_jobs s join jobs j on j.id = s.job_id
+    order by s.id desc
+""")
+
+@app.get("/skills")
+async def list_skills(limit: int = Query(100, ge=1, le=1000)):
+    """Skills mais frequentes (para autocompletar o filtro skills de /jobs)."""
+    async with reader.connect() as conn:
+        rows = (await conn.execute(SKILLS_SQL, {"limit": limit})).mappings().all()
+    return [dict(r) for r in rows]
 
 @app.post("/save")
-def save_job(req: SaveJobReq):
-    with engine.begin() as conn:
-        job = conn.execute(text("select id from jobs where id=:i"), {"i": req.job_id}).first()
+async def save_job(req: SaveJobReq):
+    async with writer.begin() as conn:
+        job = (await conn.execute(JOB_EXISTS_SQL, {"i": req.job_id})).first()
         if not job:
             raise HTTPException(404, "Job não encontrado")
-        conn.execute(text("insert into saved_jobs(job_id, note) values (:i,:n)"), {"i": req.job_id, "n": req.note or ""})
+        await conn.execute(SAVE_SQL, {"i": req.job_id, "n": req.note or ""})
     return {"ok": True}
 
 @app.get("/saved")
-def saved_jobs():
-    with engine.begin() as conn:
-        rows = conn.execute(text("""
-            select s.id as saved_id, j.*
-            from saved_jobs s join jobs j on j.id = s.job_id
-            order by s.id desc
-        """)).mappings().all()
+async def saved_jobs():
+    async with reader.connect() as conn:
+        rows = (await conn.execute(SAVED_SQL)).mappings().all()
     return [dict(r) for r in rows]
+
+# ---------- histórico (versões gravadas pelo load.py, ver src/etl/history.py) ----------
+@app.get("/runs")
+async def list_runs(limit: int = Query(20, ge=1, le=500)):
+    async with reader.connect() as conn:
+        rows = (await conn.execute(text("select * from etl_runs order by id desc limit :limit"), {"limit": limit})).mappings().all()
+    return [dict(r) for r in rows]
+
+@app.get("/jobs/open")
+async def jobs_open_on(
+    response: Response,
+    on: str = Query(..., description="Data (AAAA-MM-DD, fim do dia) ou instante (AAAA-MM-DD HH:MM:SS, UTC)"),
+    after_version: int | None = Query(None, description="Cursor: versões com id menor que este"),
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """Vagas publicadas no instante pedido, como estavam naquele momento."""
+    try:
+        history.as_instant(on)
+    except ValueError:
+        raise HTTPException(400, "Data inválida")
+    async with reader.connect() as conn:
+        rows = await conn.run_sync(lambda c: history.open_on(c, on, limit, after_version))
+    if len(rows) == limit:
+        response.headers["X-Next-After-Id"] = str(rows[-1]["version_id"])
+    return rows
+
+@app.get("/jobs/new")
+async def jobs_new(run_id: int | None = Query(None, description="Run do ETL (padrão: a última concluída)"),
+                   limit: int = Query(100, ge=1, le=1000)):
+    """Vagas vistas pela primeira vez na run (por padrão, "novas desde a execução anterior")."""
+    async with reader.connect() as conn:
+        run = run_id or await conn.run_sync(history.latest_run)
+        if run is None:
+            return []
+        return await conn.run_sync(lambda c: history.new_in_run(c, run, limit))
+
+@app.get("/jobs/{job_id}/history")
+async def job_history(job_id: int):
+    async with reader.connect() as conn:
+        rows = await conn.run_sync(lambda c: history.job_history(c, job_id))
+    if not rows:
+        raise HTTPException(404, "Job não encontrado")
+    return rows
+
+# ---------- perfis e alertas (preenchidos pelo load.py a cada carga) ----------
+PROFILE_SQL = text("select id, name, skills, min_match, created_at from profiles where id = :i")
+PROFILES_SQL = text("select id, name, skills, min_match, created_at from profiles order by id")
+INSERT_PROFILE_SQL = text("insert into profiles(name, skills, min_match) values (:name, :skills, :min_match)")
+ALERTS_SQL = text("""
+    select a.id as alert_id, a.match, a.created_at as alerted_at, j.id, j.title, j.company, j.location,
+           j.salary, j.url, j.published_at
+    from alerts a join jobs j on j.id = a.job_id
+    where a.profile_id = :p and (:after_id is null or a.id < :after_id)
+    order by a.id desc limit :limit
+""")
+
+@app.post("/profiles", status_code=201)
+async def create_profile(req: ProfileReq):
+    async with writer.begin() as conn:
+        res = await conn.execute(INSERT_PROFILE_SQL, req.model_dump())
+        row = (await conn.execute(PROFILE_SQL, {"i": res.lastrowid})).mappings().one()
+    return dict(row)
+
+@app.get("/profiles")
+async def list_profiles():
+    async with reader.connect() as conn:
+        rows = (await conn.execute(PROFILES_SQL)).mappings().all()
+    return [dict(r) for r in rows]
+
+@app.delete("/profiles/{profile_id}")
+async def delete_profile(profile_id: int):
+    async with writer.begin() as conn:
+        await conn.execute(text("delete from alerts where profile_id = :i"), {"i": profile_id})
+        res = await conn.execute(text("delete from profiles where id = :i"), {"i": profile_id})
+        if not res.rowcount:
+            raise HTTPException(404, "Perfil não encontrado")
+    return {"ok": True}
+
+@app.get("/profiles/{profile_id}/alerts")
+async def profile_alerts(
+    response: Response,
+    profile_id: int,
+    after_id: int | None = Query(None, description="Cursor: alertas com id menor que este"),
+    limit: int = Query(50, ge=1, le=500),
+):
+    """Vagas novas que casaram com o perfil, das mais recentes para as mais antigas."""
+    async with reader.connect() as conn:
+        if not (await conn.execute(PROFILE_SQL, {"i": profile_id})).first():
+            raise HTTPException(404, "Perfil não encontrado")
+        rows = (await conn.execute(ALERTS_SQL, {"p": profile_id, "after_id": after_id, "limit": limit})).mappings().all()
+    if len(rows) == limit:
+        response.headers["X-Next-After-Id"] = str(rows[-1]["alert_id"])
+    return [{k: ("" if v is None else v) for k, v in r.items()} for r in rows]
@@ -0,0 +1,134 @@
+"""
+Teste de carga da API: N leitores concorrentes em /jobs enquanto um "ETL" grava no mesmo banco.
+Uso: python -m src.bench.api_concurrency [--jobs 20000] [--concurrency 32] [--duration 10] [--out res.json]
+Sem --url, cria um banco sintético (src/bench/corpus.py) em diretório temporário e sobe o uvicorn apontando para ele
+(JOBS_DB); com --url, mede uma API já rodando (ex.: outro commit, para comparar).
+Saída: JSON com req/s, latências p50/p95/p99, erros e transações de escrita concluídas.
+"""
+from __future__ import annotations
+import argparse, asyncio, json, os, pathlib, random, socket, subprocess, sys, tempfile, threading, time
+import httpx
+import numpy as np
+from sqlalchemy import create_engine
+from src.bench.corpus import normalized_jobs
+
+BASE_DIR = pathlib.Path(__file__).resolve().parents[2]
+
+def build_db(path: pathlib.Path, n: int) -> None:
+    from src.etl.load import init_schema, upsert_jobs
+    engine = create_engine(f"sqlite:///{path}", future=True)
+    with engine.begin() as conn:
+        init_schema(conn)
+        upsert_jobs(conn, normalized_jobs(n))
+    engine.dispose()
+
+def etl_writer(path: pathlib.Path, n: int, stop: threading.Event, stats: dict, batch: int = 500) -> None:
+    """Simula o load.py: transações de upsert com vagas alteradas até o fim do teste."""
+    from src.etl.load import upsert_jobs
+    engine = create_engine(f"sqlite:///{path}", future=True, connect_args={"timeout": 30})
+    rev = 0
+    while not stop.is_set():
+        rev += 1
+        start = (rev * batch) % max(n - batch, 1)
+        with engine.begin() as conn:
+            upsert_jobs(conn, normalized_jobs(batch, revision=rev, start=start))
+        stats["writes"] += 1
+    engine.dispose()
+
+def _requests(n: int) -> list[dict]:
+    return [
+        {"limit": 50},
+        {"limit": 50, "order": "recent", "after_id": n // 2},
+        {"q": "python", "limit": 20},
+        {"skills": "python,sql", "min_salary": 100000, "limit": 20},
+        {"company": "Company 42", "fields": "title,company,url"},
+    ]
+
+async def _reader(client: httpx.AsyncClient, params: list[dict], deadline: float, lat: list, errors: list):
+    while time.perf_counter() < deadline:
+        p = random.choice(params)
+        t = time.perf_counter()
+        try:
+            r = await client.get("/jobs", params=p)
+            if r.status_code != 200:
+                errors.append(r.status_code)
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+        lat.append(time.perf_counter() - t)
+
+async def load_test(url: str, n: int, concurrency: int, duration: float) -> dict:
+    lat, errors = [], []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        await client.get("/jobs", params={"limit": 1})  # aquecimento
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*[_reader(client, _requests(n), deadline, lat, errors) for _ in range(concurrency)])
+        elapsed = time.perf_counter() - start
+    ms = np.array(lat) * 1000
+    return {
+        "requests": len(lat), "rps": round(len(lat) / elapsed, 1), "errors": len(errors),
+        "p50_ms": round(float(np.percentile(ms, 50)), 2), "p95_ms": round(float(np.percentile(ms, 95)), 2),
+        "p99_ms": round(float(np.percentile(ms, 99)), 2),
+    }
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def _serve(db: pathlib.Path) -> tuple[subprocess.Popen, str]:
+    port = _free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.api.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BASE_DIR, env={**os.environ, "JOBS_DB": str(db)},
+    )
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            httpx.get(url + "/", timeout=1)
+            return proc, url
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("API não subiu")
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--jobs", type=int, default=20000)
+    ap.add_argument("--concurrency", type=int, default=32)
+    ap.add_argument("--duration", type=float, default=10)
+    ap.add_argument("--url", help="API já rodando (o banco dela deve ter sido criado com --db)")
+    ap.add_argument("--db", type=pathlib.Path, help="banco a usar/criar (padrão: temporário)")
+    ap.add_argument("--no-writer", action="store_true", help="sem escrita concorrente")
+    ap.add_argument("--out", type=pathlib.Path)
+    args = ap.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    db = args.db or pathlib.Path(tmp.name) / "jobs.db"
+    if not db.exists():
+        build_db(db, args.jobs)
+    proc, url = (None, args.url) if args.url else _serve(db)
+    stop, stats = threading.Event(), {"writes": 0}
+    writer = None
+    if not args.no_writer:
+        writer = threading.Thread(target=etl_writer, args=(db, args.jobs, stop, stats), daemon=True)
+        writer.start()
+    try:
+        result = asyncio.run(load_test(url, args.jobs, args.concurrency, args.duration))
+    finally:
+        stop.set()
+        if writer:
+            writer.join()
+        if proc:
+            proc.terminate()
+            proc.wait()
+    result.update(jobs=args.jobs, concurrency=args.concurrency, duration=args.duration, etl_writes=stats["writes"])
+    print(json.dumps(result, indent=2))
+    if args.out:
+        args.out.write_text(json.dumps(result, indent=2))
+    print(f"[ok] {result['rps']} req/s com {args.concurrency} leitores e {stats['writes']} transações de escrita")
+    tmp.cleanup()
+
+if __name__ == "__main__":
+    sys.exit(main())
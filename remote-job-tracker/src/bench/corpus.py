@@ -0,0 +1,93 @@
+"""
+Gerador de corpus sintético no formato da API da RemoteOK (para benchmarks e testes de carga).
+Uso: python -m src.bench.corpus N [saida.jsonl] [--seed 0] [--dup-rate 0.05]
+Determinístico por seed: a linha i é sempre a mesma para (seed, i), então dá para gerar só um
+trecho (start) ou uma nova revisão das mesmas vagas (revision, muda a descrição).
+Inclui uma fração de republicações (mesma vaga, outra URL) para exercitar a deduplicação.
+"""
+from __future__ import annotations
+import argparse, datetime as dt, itertools, pathlib, random, sys
+from typing import Iterator
+import numpy as np
+import pandas as pd
+from src.etl.jsonstream import write_ndjson
+from src.etl.normalize import COLUMNS, remoteok_record
+
+SKILLS = [
+    "python", "javascript", "typescript", "react", "node", "go", "java", "kotlin", "rust", "ruby",
+    "rails", "php", "laravel", "django", "fastapi", "flask", "vue", "angular", "svelte", "css",
+    "sql", "postgres", "mysql", "mongodb", "redis", "kafka", "spark", "airflow", "dbt", "snowflake",
+    "aws", "gcp", "azure", "docker", "k8s", "terraform", "ansible", "linux", "graphql", "grpc",
+    "swift", "ios", "android", "flutter", "c++", "c#", "dotnet", "scala", "elixir", "haskell",
+    "pytorch", "tensorflow", "ml", "nlp", "llm", "pandas", "numpy", "excel", "tableau", "security",
+]
+ROLES = ["Software Engineer", "Backend Developer", "Frontend Developer", "Full Stack Engineer", "Data Engineer",
+         "Data Scientist", "DevOps Engineer", "Site Reliability Engineer", "Mobile Developer", "ML Engineer"]
+LEVELS = ["", "", "Senior ", "Junior ", "Lead ", "Staff ", "Mid-level "]
+LOCATIONS = ["Worldwide", "Europe", "Americas", "USA", "LATAM", "Asia", "UK", "Brazil"]
+# vocabulário de "enchimento" para as descrições terem tamanho e diversidade de termos realistas
+FILLER = [f"{a}{b}" for a in ("pro", "data", "team", "cloud", "user", "scale", "product", "code", "test", "ship")
+          for b in ("", "s", "ing", "ed", "er", "ment", "ful", "ive", "ity", "ize", "ops", "flow", "base",
+                    "line", "work", "hub", "set", "kit", "lab", "way")]
+EPOCH0 = 1735689600  # 2025-01-01
+
+# Zipf: poucas skills muito comuns
+_CUM_WEIGHTS = list(itertools.accumulate(1 / np.arange(1, len(SKILLS) + 1) ** 0.9))
+
+DUP_SALT = 0x5DEECE66D  # sorteio de republicação num stream separado do conteúdo da vaga
+
+def _rng(seed: int, i: int) -> random.Random:
+    return random.Random(seed * 1_000_003 + i)  # random.Random semeia bem mais rápido que o NumPy
+
+def _original(i: int, seed: int, dup_rate: float) -> int:
+    # republicação aponta para uma vaga anterior (que pode ser ela mesma uma republicação)
+    while i > 10:
+        dup = _rng(seed ^ DUP_SALT, i)
+        if dup.random() >= dup_rate:
+            break
+        i = dup.randrange(i)
+    return i
+
+def remoteok_row(i: int, seed: int = 0, revision: int = 0, dup_rate: float = 0.05) -> dict:
+    # conteúdo sorteado a partir da vaga original: a republicação só muda id, URL e data
+    rng = _rng(seed, _original(i, seed, dup_rate))
+    tags = list(dict.fromkeys(rng.choices(SKILLS, cum_weights=_CUM_WEIGHTS, k=rng.randint(2, 6))))
+    title = f"{rng.choice(LEVELS)}{rng.choice(ROLES)}"
+    filler = " ".join(rng.choices(FILLER, k=rng.randint(30, 120)))
+    lo = rng.randrange(30, 180) * 1000
+    has_salary = rng.random() < 0.6
+    company = f"Company {rng.randrange(5000)}"
+    return {
+        "id": str(i), "slug": f"job-{i}", "epoch": EPOCH0 + i * 60,
+        "date": dt.datetime.fromtimestamp(EPOCH0 + i * 60, dt.timezone.utc).isoformat(),
+        "company": company, "position": title, "tags": tags,
+        "description": f"{title} at {company}. We use {', '.join(tags)}. {filler}" + (f" (rev {revision})" if revision else ""),
+        "location": rng.choice(LOCATIONS),
+        "salary_min": lo if has_salary else 0, "salary_max": lo + rng.randrange(10, 60) * 1000 if has_salary else 0,
+        "url": f"https://remoteok.com/remote-jobs/{i}",
+    }
+
+def iter_remoteok(n: int, seed: int = 0, start: int = 0, revision: int = 0, dup_rate: float = 0.05) -> Iterator[dict]:
+    for i in range(start, start + n):
+        yield remoteok_row(i, seed, revision, dup_rate)
+
+def normalized_jobs(n: int, seed: int = 0, start: int = 0, revision: int = 0) -> pd.DataFrame:
+    """Mesmas vagas já no schema do normalize.py (para alimentar o load direto)."""
+    return pd.DataFrame([remoteok_record(r) for r in iter_remoteok(n, seed, start, revision)], columns=COLUMNS)
+
+def write_feed(path: pathlib.Path, n: int, seed: int = 0, dup_rate: float = 0.05) -> int:
+    """NDJSON no formato de data/raw_remoteok.jsonl, gerado em streaming."""
+    return write_ndjson(iter_remoteok(n, seed, dup_rate=dup_rate), path)
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("n", type=int)
+    ap.add_argument("out", type=pathlib.Path, nargs="?", default=pathlib.Path("data/raw_remoteok.jsonl"))
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--dup-rate", type=float, default=0.05)
+    args = ap.parse_args()
+    n = write_feed(args.out, args.n, args.seed, args.dup_rate)
+    print(f"[ok] {n} vagas sintéticas em {args.out}")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""
+Benchmark do pipeline: normalize -> load -> índices (FTS5 e TF-IDF) -> compute_match -> API /jobs.
+Uso: python -m src.bench.pipeline [--sizes 1000,10000,100000] [--out bench.json] [--compare base.json]
+Para cada tamanho gera um feed sintético no formato da RemoteOK (src/bench/corpus.py) num
+diretório temporário e mede cada etapa com as funções reais do ETL. O resultado (JSON) traz
+o commit e a máquina; --compare aponta regressões contra um resultado anterior (saída 1 se houver).
+"""
+from __future__ import annotations
+import argparse, asyncio, json, os, pathlib, platform, subprocess, sys, tempfile, time
+import numpy as np
+from sqlalchemy import create_engine, text
+from src.bench.api_concurrency import _serve, load_test
+from src.bench.corpus import write_feed
+from src.etl.jsonstream import iter_ndjson
+from src.etl.load import CHUNK_SIZE, init_schema, read_jobs_text, upsert_jobs
+from src.etl.normalize import iter_normalized, remoteok_record
+from src.etl.staging import iter_partition, write_partition
+from src.match.index import TfidfIndex
+from src.match.rank import compute_match
+
+BASE_DIR = pathlib.Path(__file__).resolve().parents[2]
+DAY = "2025-01-01"
+QUERIES = [
+    "python, fastapi, sql", "react typescript css", "aws terraform k8s docker", "spark airflow dbt snowflake",
+    "go grpc kafka", "ios swift", "pytorch nlp llm", "java kotlin android", "rails ruby postgres", "rust c++",
+]
+# métricas em que menor é melhor; as demais (vazão) maior é melhor
+LOWER_IS_BETTER = ("seconds", "p50_ms", "p95_ms", "p99_ms")
+
+def _timed(fn, *args, **kw):
+    t = time.perf_counter()
+    out = fn(*args, **kw)
+    return out, time.perf_counter() - t
+
+def _stage(rows: int, seconds: float) -> dict:
+    return {"rows": rows, "seconds": round(seconds, 4), "rows_per_s": round(rows / seconds, 1) if seconds else None}
+
+def _load(engine, staging: pathlib.Path) -> dict:
+    stats = {"inserted": 0, "updated": 0, "unchanged": 0}
+    with engine.begin() as conn:
+        init_schema(conn)
+        for chunk in iter_partition(DAY, base=staging, batch_rows=CHUNK_SIZE):
+            for k, v in upsert_jobs(conn, chunk).items():
+                stats[k] += v
+    return stats
+
+def _rebuild_fts(engine) -> None:
+    with engine.begin() as conn:
+        conn.execute(text("insert into jobs_fts(jobs_fts) values ('rebuild')"))
+
+def _build_tfidf(engine, path: pathlib.Path):
+    jobs = read_jobs_text(engine)
+    index = TfidfIndex()
+    index.update(jobs)
+    index.save(path)
+    return jobs
+
+def _match_latency(jobs, index: TfidfIndex, repeat: int) -> dict:
+    lat = []
+    for q in QUERIES * repeat:
+        _, s = _timed(compute_match, jobs, q, top_k=50, index=index)
+        lat.append(s * 1000)
+    ms = np.array(lat)
+    return {"queries": len(lat), **{f"p{p}_ms": round(float(np.percentile(ms, p)), 3) for p in (50, 95, 99)}}
+
+def run_size(n: int, work: pathlib.Path, repeat: int = 5, api_duration: float = 5, concurrency: int = 16) -> dict:
+    feed, staging, db = work / "raw_remoteok.jsonl", work / "staging", work / "jobs.db"
+    _, gen_s = _timed(write_feed, feed, n)
+    res = {"generate": _stage(n, gen_s)}
+
+    rows, s = _timed(write_partition, iter_normalized(iter_ndjson(feed), remoteok_record), DAY, base=staging)
+    res["normalize"] = _stage(rows, s)
+
+    engine = create_engine(f"sqlite:///{db}", future=True)
+    stats, s = _timed(_load, engine, staging)
+    res["load"] = _stage(stats["inserted"], s)
+    _, s = _timed(_rebuild_fts, engine)
+    res["fts_build"] = _stage(rows, s)
+    jobs, s = _timed(_build_tfidf, engine, work / "index")
+    res["tfidf_build"] = _stage(len(jobs), s)
+    engine.dispose()
+
+    res["compute_match"] = _match_latency(jobs, TfidfIndex.load(work / "index"), repeat)
+    if api_duration > 0:
+        proc, url = _serve(db)
+        try:
+            api = asyncio.run(load_test(url, rows, concurrency, api_duration))
+        finally:
+            proc.terminate()
+            proc.wait()
+        res["api_jobs"] = {k: api[k] for k in ("rps", "p50_ms", "p95_ms", "p99_ms", "errors")}
+    return res
+
+def _meta() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = ""
+    return {"commit": commit, "date": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+            "platform": platform.platform(), "cpus": os.cpu_count()}
+
+def compare(base: dict, new: dict, tolerance: float) -> list[str]:
+    """Métricas que pioraram mais que `tolerance` (fração) entre dois resultados."""
+    worse = []
+    for size, stages in new["results"].items():
+        for stage, metrics in stages.items():
+            old = base.get("results", {}).get(size, {}).get(stage, {})
+            for k, v in metrics.items():
+                b = old.get(k)
+                if k in ("rows", "queries", "errors") or not isinstance(v, (int, float)) or not b:
+                    continue
+                change = (v - b) / b if k in LOWER_IS_BETTER else (b - v) / b
+                if change > tolerance:
+                    worse.append(f"{size} {stage}.{k}: {b} -> {v} ({change:+.0%} pior)")
+    return worse
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--sizes", default="1000,10000", help="tamanhos do corpus (ex.: 1000,100000,1000000)")
+    ap.add_argument("--repeat", type=int, default=5, help="repetições das consultas do compute_match")
+    ap.add_argument("--api-duration", type=float, default=5, help="segundos de carga em /jobs (0 = pula)")
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--out", type=pathlib.Path)
+    ap.add_argument("--compare", type=pathlib.Path, help="resultado anterior para comparar")
+    ap.add_argument("--tolerance", type=float, default=0.2, help="piora tolerada (fração) no --compare")
+    args = ap.parse_args()
+
+    result = {"meta": _meta(), "results": {}}
+    for n in (int(s) for s in args.sizes.split(",")):
+        with tempfile.TemporaryDirectory() as tmp:
+            result["results"][str(n)] = run_size(n, pathlib.Path(tmp), args.repeat, args.api_duration, args.concurrency)
+        print(f"[ok] {n} vagas: {json.dumps(result['results'][str(n)])}")
+    if args.out:
+        args.out.write_text(json.dumps(result, indent=2))
+        print(f"[ok] resultados em {args.out}")
+    if args.compare:
+        worse = compare(json.loads(args.compare.read_text()), result, args.tolerance)
+        for line in worse:
+            print(f"[regressão] {line}")
+        if worse:
+            return 1
+        print(f"[ok] sem regressões acima de {args.tolerance:.0%} em relação a {args.compare}")
+
+if __name__ == "__main__":
+    sys.exit(main())
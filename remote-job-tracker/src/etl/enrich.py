@@ -0,0 +1,110 @@
+"""
+Extração de campos estruturados das vagas: skills (dicionário normalizado), senioridade e salário.
+Usado pelo normalize.py (colunas stack, seniority, salary_min, salary_max, salary_currency) e
+pelo load.py, que grava as skills na tabela job_skills para filtros por índice na API.
+"""
+from __future__ import annotations
+import re
+from typing import Iterable
+
+# apelido -> nome canônico (o que não estiver aqui vira a própria tag em minúsculas)
+SKILL_ALIASES = {
+    "golang": "go", "js": "javascript", "node": "nodejs", "node.js": "nodejs", "nodejs": "nodejs",
+    "ts": "typescript", "reactjs": "react", "react.js": "react", "vuejs": "vue", "vue.js": "vue",
+    "postgres": "postgresql", "psql": "postgresql", "k8s": "kubernetes", "amazon web services": "aws",
+    "gcp": "google cloud", "py": "python", "python3": "python", "c sharp": "c#", "csharp": "c#",
+    "dotnet": ".net", "ml": "machine learning", "sysadmin": "devops", "front end": "frontend",
+    "front-end": "frontend", "back end": "backend", "back-end": "backend", "full stack": "fullstack",
+    "full-stack": "fullstack", "rails": "ruby on rails", "ror": "ruby on rails",
+}
+
+# tags que indicam senioridade/tipo de contrato e não são skills
+NON_SKILLS = {
+    "senior", "sr", "junior", "jr", "mid", "mid-level", "lead", "principal", "staff", "intern",
+    "internship", "trainee", "entry level", "exec", "executive", "remote", "full time", "part time",
+    "contract", "contractor", "freelance", "digital nomad", "non tech", "dev", "engineer", "developer",
+}
+
+SENIORITY_LEVELS = ["intern", "junior", "mid", "senior", "lead"]
+_SENIORITY_PATTERNS = [  # ordem importa: o primeiro que casar vence
+    ("lead", r"\b(lead|principal|staff|head of|director|vp|architect|manager)\b"),
+    ("senior", r"\b(senior|sr\.?|s[eê]nior|expert)\b"),
+    ("intern", r"\b(intern|internship|trainee|est[aá]gi\w*)\b"),
+    ("junior", r"\b(junior|jr\.?|j[uú]nior|entry[ -]level|graduate)\b"),
+    ("mid", r"\b(mid|mid-level|intermediate|pleno)\b"),
+]
+
+CURRENCY_SYMBOLS = {"R$": "BRL", "US$": "USD", "C$": "CAD", "A$": "AUD", "$": "USD", "€": "EUR", "£": "GBP"}
+CURRENCY_CODES = {"USD", "EUR", "GBP", "BRL", "CAD", "AUD", "CHF", "INR"}
+_PERIODS = [  # multiplicador para valor anual
+    (r"/\s*h(ou)?r|per hour|hourly|por hora", 2080),
+    (r"/\s*(mo(nth)?|m[eê]s)|per month|monthly|por m[eê]s|mensal", 12),
+]
+_AMOUNT = re.compile(r"(\d+(?:[.,]\d{3})*(?:[.,]\d+)?)\s*([kK])?")
+
+def canonical_skill(tag: str) -> str:
+    t = re.sub(r"\s+", " ", tag.strip().lower())
+    return SKILL_ALIASES.get(t, t)
+
+def parse_skills(tags: Iterable[str] | str | None) -> list[str]:
+    """Lista (ou string separada por vírgulas) de tags -> skills canônicas, sem repetição e em ordem."""
+    if isinstance(tags, str):
+        tags = tags.split(",")
+    out: list[str] = []
+    for tag in tags or []:
+        s = canonical_skill(str(tag))
+        if s and s not in NON_SKILLS and s not in out:
+            out.append(s)
+    return out
+
+def infer_seniority(title: str, tags: Iterable[str] | None = None) -> str:
+    """Nível a partir do título (e, se o título não disser nada, das tags); "" se não houver pista."""
+    for text in (title or "", " ".join(tags or [])):
+        low = text.lower()
+        for level, pattern in _SENIORITY_PATTERNS:
+            if re.search(pattern, low):
+                return level
+    return ""
+
+def _number(raw: str, k: str | None) -> float:
+    # "80,000" / "80.000" (milhar) vs "7.5" (decimal): separador seguido de 3 dígitos é milhar
+    if re.fullmatch(r"\d+([.,]\d{3})+", raw):
+        value = float(re.sub(r"[.,]", "", raw))
+    else:
+        value = float(raw.replace(",", "."))
+    return value * 1000 if k else value
+
+def parse_salary(text: str | None) -> tuple[int | None, int | None, str]:
+    """Texto livre -> (mínimo anual, máximo anual, moeda). Ex.: "$80k - $110k" -> (80000, 110000, "USD")."""
+    if not text:
+        return None, None, ""
+    s = str(text).strip()
+    currency = ""
+    for code in re.findall(r"\b[A-Z]{3}\b", s.upper()):
+        if code in CURRENCY_CODES:
+            currency = code
+            break
+    if not currency:
+        for sym, code in CURRENCY_SYMBOLS.items():  # símbolos compostos (R$, US$) vêm antes de "$"
+            if sym in s:
+                currency = code
+                break
+    values = [_number(raw, k) for raw, k in _AMOUNT.findall(s)]
+    values = [v for v in values if v > 0]
+    if not values:
+        return None, None, currency
+    factor = next((f for pattern, f in _PERIODS if re.search(pattern, s.lower())), 1)
+    lo, hi = min(values[:2]) * factor, max(values[:2]) * factor
+    return int(round(lo)), int(round(hi)), currency
+
+def salary_range(lo, hi, currency: str = "USD") -> tuple[int | None, int | None, str]:
+    """Faixa já numérica (ex.: salary_min/salary_max da RemoteOK, 0 = não informado)."""
+    vals = [int(v) for v in (lo, hi) if isinstance(v, (int, float)) and v > 0]
+    if not vals:
+        return None, None, ""
+    return min(vals), max(vals), currency
+
+def format_salary(lo: int | None, hi: int | None, currency: str) -> str:
+    if lo is None:
+        return ""
+    return f"{currency} {lo:,}" if lo == hi else f"{currency} {lo:,} - {hi:,}"
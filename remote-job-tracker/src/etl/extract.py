@@ -0,0 +1,146 @@
+"""
+Extrator concorrente de várias fontes (src/etl/sources.py).
+Saída: data/raw_<fonte>.jsonl (uma vaga JSON por linha, por fonte)
+- asyncio: todas as fontes em paralelo, com limite de concorrência e intervalo mínimo por host
+- retry com backoff exponencial + jitter para erros de rede, 429 e 5xx (respeitando Retry-After)
+- requisições condicionais (ETag / If-Modified-Since): 304 mantém o arquivo bruto anterior
+Uso: python -m src.etl.extract [fonte ...]
+"""
+from __future__ import annotations
+import asyncio, json, os, pathlib, random, sys, time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+import requests
+from src.etl.jsonstream import write_ndjson
+from src.etl.sources import SOURCES, Source
+
+BASE_DIR = pathlib.Path(__file__).resolve().parents[2]
+DATA_DIR = BASE_DIR / "data"
+CACHE_PATH = DATA_DIR / "http_cache.json"
+
+USER_AGENT = os.getenv("USER_AGENT", "RemoteJobTracker/1.0 (+https://github.com/SEUUSUARIO)")
+RETRY_STATUS = {429, 500, 502, 503, 504}
+MAX_RETRY_AFTER = float(os.getenv("MAX_RETRY_AFTER", "60"))  # teto para o Retry-After do servidor (s)
+
+class RetryableError(Exception):
+    def __init__(self, msg: str, retry_after: float | None = None):
+        super().__init__(msg)
+        self.retry_after = retry_after
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Retry-After em segundos ou como data HTTP; None se ausente/inválido."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+@dataclass
+class HostLimiter:
+    """Limita requisições simultâneas e o intervalo mínimo entre requisições a um mesmo host."""
+    concurrency: int = 2
+    min_interval: float = 1.0
+    _sems: dict = field(default_factory=dict)
+    _locks: dict = field(default_factory=dict)
+    _last: dict = field(default_factory=dict)
+
+    async def __call__(self, host: str):
+        sem = self._sems.setdefault(host, asyncio.Semaphore(self.concurrency))
+        await sem.acquire()
+        async with self._locks.setdefault(host, asyncio.Lock()):
+            wait = self._last.get(host, 0.0) + self.min_interval - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._last[host] = time.monotonic()
+        return sem
+
+def raw_path(name: str, out_dir: pathlib.Path = DATA_DIR) -> pathlib.Path:
+    return out_dir / f"raw_{name}.jsonl"
+
+def _download(url: str, headers: dict, dest: pathlib.Path, timeout: float) -> tuple[int, dict]:
+    with requests.get(url, headers=headers, timeout=timeout, stream=True) as resp:
+        if resp.status_code == 304:
+            return 304, resp.headers
+        if resp.status_code in RETRY_STATUS:
+            raise RetryableError(f"HTTP {resp.status_code}", parse_retry_after(resp.headers.get("Retry-After")))
+        resp.raise_for_status()
+        with open(dest, "wb") as f:
+            for block in resp.iter_content(1 << 16):
+                f.write(block)
+        return resp.status_code, resp.headers
+
+def _store(source: Source, body: pathlib.Path, out: pathlib.Path) -> int:
+    with open(body, "r", encoding="utf-8") as f:
+        return write_ndjson(source.parse(f), out)
+
+async def fetch_source(source: Source, limiter: HostLimiter, cache: dict, out_dir: pathlib.Path = DATA_DIR,
+                       retries: int = 3, backoff: float = 1.0, timeout: float = 15) -> dict:
+    out = raw_path(source.name, out_dir)
+    headers = {"User-Agent": USER_AGENT}
+    meta = cache.get(source.url, {})
+    if out.exists():  # sem arquivo anterior não adianta receber 304
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+    body = out_dir / f".{source.name}.body"
+    host = urlparse(source.url).netloc
+    for attempt in range(retries + 1):
+        sem = await limiter(host)
+        error, retryable = None, False
+        try:
+            status, resp_headers = await asyncio.to_thread(_download, source.url, headers, body, timeout)
+        except (RetryableError, requests.ConnectionError, requests.Timeout) as e:
+            error, retryable = e, True
+        except requests.RequestException as e:
+            error = e
+        finally:
+            sem.release()
+        if error is None:
+            break
+        if not retryable or attempt == retries:
+            return {"source": source.name, "status": "error", "error": str(error)}
+        delay = random.uniform(0, backoff * 2 ** attempt)  # full jitter
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:  # o servidor disse quando voltar (429/503)
+            delay = max(delay, min(retry_after, MAX_RETRY_AFTER))
+        await asyncio.sleep(delay)
+    if status == 304:
+        return {"source": source.name, "status": "not_modified"}
+    try:
+        rows = await asyncio.to_thread(_store, source, body, out)
+    except ValueError as e:  # resposta não é o JSON esperado; mantém o arquivo bruto anterior
+        return {"source": source.name, "status": "error", "error": str(e)}
+    finally:
+        body.unlink(missing_ok=True)
+    cache[source.url] = {"etag": resp_headers.get("ETag"), "last_modified": resp_headers.get("Last-Modified")}
+    return {"source": source.name, "status": "ok", "rows": rows}
+
+async def run(sources: list[Source], out_dir: pathlib.Path = DATA_DIR, cache_path: pathlib.Path = CACHE_PATH,
+              limiter: HostLimiter | None = None, **kw) -> list[dict]:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    cache = json.loads(cache_path.read_text()) if cache_path.exists() else {}
+    limiter = limiter or HostLimiter()
+    results = await asyncio.gather(*(fetch_source(s, limiter, cache, out_dir, **kw) for s in sources))
+    cache_path.write_text(json.dumps(cache, indent=2))
+    return results
+
+def main():
+    names = sys.argv[1:] or list(SOURCES)
+    unknown = [n for n in names if n not in SOURCES]
+    if unknown:
+        print(f"[erro] fontes desconhecidas: {', '.join(unknown)} (disponíveis: {', '.join(SOURCES)})")
+        return 1
+    results = asyncio.run(run([SOURCES[n] for n in names]))
+    for r in results:
+        print(f"[{r['status']}] {r['source']}: " + (f"{r['rows']} vagas em {raw_path(r['source'])}" if "rows" in r else r.get("error", "sem mudanças")))
+    return 1 if any(r["status"] == "error" for r in results) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
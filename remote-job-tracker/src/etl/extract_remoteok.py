@@ -1,34 +1,35 @@
-
----
-
-## 🧱 `src/etl/extract_remoteok.py`
-```python
 """
 Extrator de vagas remotas a partir da API pública do RemoteOK.
-Saída: data/raw_remoteok.json (lista JSON de vagas)
+Saída: data/raw_remoteok.jsonl (uma vaga JSON por linha)
+A resposta é lida em streaming e gravada direto no disco, sem carregar o array inteiro em memória.
 """
 from __future__ import annotations
-import os, time, json, pathlib, sys
+import os, time, io, pathlib, sys
+from typing import Iterator
 import requests
+from src.etl.jsonstream import iter_json_array, write_ndjson
 
 BASE_DIR = pathlib.Path(__file__).resolve().parents[2]
 DATA_DIR = BASE_DIR / "data"
-RAW_PATH = DATA_DIR / "raw_remoteok.json"
+RAW_PATH = DATA_DIR / "raw_remoteok.jsonl"
 
 REMOTEOK_API = os.getenv("REMOTEOK_API", "https://remoteok.com/api")
 USER_AGENT = os.getenv("USER_AGENT", "RemoteJobTracker/1.0 (+https://github.com/SEUUSUARIO)")
 
+def iter_remoteok() -> Iterator[dict]:
+    with requests.get(REMOTEOK_API, headers={"User-Agent": USER_AGENT}, timeout=15, stream=True) as resp:
+        resp.raise_for_status()
+        resp.raw.decode_content = True
+        for item in iter_json_array(io.TextIOWrapper(resp.raw, encoding="utf-8")):
+            # a API retorna o primeiro item como metadados; removemos
+            if isinstance(item, dict) and "legal" not in item:
+                yield item
+
 def fetch_remoteok() -> list[dict]:
     # backoff simples
     for attempt in range(3):
         try:
-            resp = requests.get(REMOTEOK_API, headers={"User-Agent": USER_AGENT}, timeout=15)
-            resp.raise_for_status()
-            data = resp.json()
-            # a API retorna o primeiro item como metadados; removemos
-            if isinstance(data, list) and data and isinstance(data[0], dict) and "legal" in data[0]:
-                data = data[1:]
-            return data if isinstance(data, list) else []
+            return list(iter_remoteok())
         except Exception as e:
             if attempt == 2:
                 raise
@@ -37,10 +38,16 @@ def fetch_remoteok() -> list[dict]:
 
 def main():
     DATA_DIR.mkdir(parents=True, exist_ok=True)
-    jobs = fetch_remoteok()
-    with open(RAW_PATH, "w", encoding="utf-8") as f:
-        json.dump(jobs, f, ensure_ascii=False, indent=2)
-    print(f"[ok] {len(jobs)} vagas salvas em {RAW_PATH}")
+    # backoff simples; write_ndjson só publica o arquivo se o download terminar
+    for attempt in range(3):
+        try:
+            n = write_ndjson(iter_remoteok(), RAW_PATH)
+            break
+        except Exception as e:
+            if attempt == 2:
+                raise
+            time.sleep(2 * (attempt + 1))
+    print(f"[ok] {n} vagas salvas em {RAW_PATH}")
 
 if __name__ == "__main__":
     sys.exit(main())
@@ -0,0 +1,205 @@
+"""
+Histórico das vagas (append-only): cada versão de uma vaga é uma linha em job_versions com
+valid_from/valid_to (valid_to nulo = versão aberta, vaga ainda publicada).
+- O conteúdo de cada versão fica uma vez só em job_contents (chave content_hash): vaga que
+  some e volta igual reaproveita o conteúdo.
+- Cada execução do load.py é um etl_runs; versões guardam a run que abriu (run_id) e a que
+  fechou (closed_run). Vagas ausentes do snapshot de uma fonte presente na run são fechadas.
+- "Abertas na data X" usa o R*Tree job_versions_span (intervalo em minutos Unix, arredondado
+  para fora, mantido por triggers): busca por ponto no índice, sem varrer o histórico, e só os
+  candidatos passam pela comparação exata de valid_from/valid_to.
+"""
+from __future__ import annotations
+import datetime as dt, json
+from sqlalchemy import text
+
+OPEN_END = 2147483647  # t_to das versões abertas no R*Tree (rtree_i32: inteiros de 32 bits)
+
+DDL = f"""
+create table if not exists etl_runs (
+  id integer primary key autoincrement,
+  observed_at text not null,
+  partition text,
+  started_at text default (datetime('now')),
+  finished_at text,
+  inserted integer,
+  updated integer,
+  unchanged integer,
+  closed integer
+);
+
+create table if not exists job_contents (
+  content_hash text primary key,
+  fields text not null
+) without rowid;
+
+create table if not exists job_versions (
+  id integer primary key autoincrement,
+  job_id integer not null references jobs(id) on delete cascade,
+  content_hash text not null references job_contents(content_hash),
+  valid_from text not null,
+  valid_to text,
+  run_id integer references etl_runs(id),
+  closed_run integer references etl_runs(id)
+);
+
+create virtual table if not exists job_versions_span using rtree_i32(id, t_from, t_to);
+
+create trigger if not exists job_versions_span_ai after insert on job_versions begin
+  insert into job_versions_span(id, t_from, t_to) values (
+    new.id, cast(strftime('%s', new.valid_from) as integer) / 60,
+    coalesce((cast(strftime('%s', new.valid_to) as integer) + 59) / 60, {OPEN_END}));
+end;
+
+create trigger if not exists job_versions_span_au after update of valid_to on job_versions begin
+  update job_versions_span set t_to = coalesce((cast(strftime('%s', new.valid_to) as integer) + 59) / 60, {OPEN_END})
+  where id = new.id;
+end;
+
+create trigger if not exists job_versions_span_ad after delete on job_versions begin
+  delete from job_versions_span where id = old.id;
+end
+"""
+
+INDEXES = """
+create unique index if not exists idx_job_versions_open on job_versions(job_id) where valid_to is null;
+create index if not exists idx_job_versions_job on job_versions(job_id, valid_from);
+create index if not exists idx_job_versions_run on job_versions(run_id);
+create index if not exists idx_job_versions_closed on job_versions(closed_run)
+"""
+
+CONTENT_SQL = text("insert or ignore into job_contents(content_hash, fields) values (:content_hash, :fields)")
+CLOSE_SQL = text("""
+    update job_versions set valid_to = :t, closed_run = :run
+    where valid_to is null and job_id = (select id from jobs where url = :url)
+""")
+OPEN_SQL = text("""
+    insert into job_versions(job_id, content_hash, valid_from, run_id)
+    select j.id, j.content_hash, :t, :run from jobs j
+    where j.url = :url and not exists (select 1 from job_versions v where v.job_id = j.id and v.valid_to is null)
+""")
+SEEN_SQL = text("insert or ignore into temp.run_seen(url, source) values (:url, :source)")
+CLOSE_MISSING_SQL = text("""
+    update job_versions set valid_to = :t, closed_run = :run
+    where valid_to is null and job_id in (
+      select j.id from jobs j
+      where j.source in (select distinct source from temp.run_seen)
+        and not exists (select 1 from temp.run_seen s where s.url = j.url)
+    )
+""")
+
+def now() -> str:
+    return dt.datetime.now(dt.timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+def as_instant(value: str) -> str:
+    """'AAAA-MM-DD' (fim do dia) ou 'AAAA-MM-DD HH:MM:SS' -> formato gravado em valid_from/valid_to."""
+    if len(value) == 10:
+        return f"{dt.date.fromisoformat(value)} 23:59:59"
+    return dt.datetime.fromisoformat(value.replace("T", " ")).strftime("%Y-%m-%d %H:%M:%S")
+
+def start_run(conn, observed_at: str | None = None, partition: str | None = None) -> dict:
+    """Abre uma execução do ETL; observed_at é o instante do snapshot (padrão: agora)."""
+    t = observed_at or now()
+    run_id = conn.execute(text("insert into etl_runs(observed_at, partition) values (:t, :p)"),
+                          {"t": t, "p": partition}).lastrowid
+    conn.execute(text("create temp table if not exists run_seen(url text primary key, source text)"))
+    conn.execute(text("delete from temp.run_seen"))
+    return {"id": run_id, "t": t}
+
+def record_versions(conn, run: dict, recs: list[dict], changed: list[dict], known: set[str]) -> None:
+    """Chamado pelo upsert a cada lote: conteúdo novo, fecha versões alteradas e abre as que faltam.
+    recs = todas as vagas do lote; changed = inseridas/alteradas; known = urls que já existiam."""
+    p = {"t": run["t"], "run": run["id"]}
+    if changed:
+        conn.execute(CONTENT_SQL, [
+            {"content_hash": r["content_hash"], "fields": json.dumps({k: v for k, v in r.items() if k != "content_hash"},
+                                                                     ensure_ascii=False, default=str)}
+            for r in changed
+        ])
+        updated = [{**p, "url": r["url"]} for r in changed if r["url"] in known]
+        if updated:
+            conn.execute(CLOSE_SQL, updated)
+    # inclui vagas sem mudança que tinham sumido (versão fechada) e voltaram
+    conn.execute(OPEN_SQL, [{**p, "url": r["url"]} for r in recs])
+    conn.execute(SEEN_SQL, [{"url": r["url"], "source": r["source"]} for r in recs])
+
+def finish_run(conn, run: dict, stats: dict) -> int:
+    """Fecha as vagas que sumiram do snapshot (só das fontes presentes na run) e grava as contagens."""
+    closed = conn.execute(CLOSE_MISSING_SQL, {"t": run["t"], "run": run["id"]}).rowcount
+    conn.execute(text("""
+        update etl_runs set finished_at = datetime('now'), inserted = :inserted, updated = :updated,
+          unchanged = :unchanged, closed = :closed where id = :id
+    """), {**stats, "closed": closed, "id": run["id"]})
+    return closed
+
+def backfill_versions(conn) -> None:
+    """Banco anterior ao histórico: uma versão aberta por vaga, a partir do created_at."""
+    rows = conn.execute(text(
+        "select id, source, title, company, location, remote, seniority, stack, salary, salary_min, salary_max,"
+        " salary_currency, url, description, published_at, content_hash, created_at from jobs"
+    )).mappings().all()
+    if not rows:
+        return
+    conn.execute(CONTENT_SQL, [
+        {"content_hash": r["content_hash"] or f"legacy-{r['id']}",
+         "fields": json.dumps({k: v for k, v in r.items() if k not in ("id", "content_hash", "created_at")},
+                              ensure_ascii=False, default=str)}
+        for r in rows
+    ])
+    conn.execute(text("""
+        insert into job_versions(job_id, content_hash, valid_from)
+        values (:id, :h, coalesce(:t, datetime('now')))
+    """), [{"id": r["id"], "h": r["content_hash"] or f"legacy-{r['id']}", "t": r["created_at"]} for r in rows])
+
+# ---------- consultas ----------
+VERSION_COLUMNS = "v.id as version_id, v.job_id, v.valid_from, v.valid_to, v.run_id, v.closed_run, c.fields"
+
+def _rows(result) -> list[dict]:
+    out = []
+    for r in result.mappings():
+        d = dict(r)
+        d.update(json.loads(d.pop("fields")))
+        out.append(d)
+    return out
+
+def open_on(conn, when: str, limit: int = 100, after_version: int | None = None) -> list[dict]:
+    """Versões de vagas publicadas no instante `when` (uma por vaga), via R*Tree."""
+    ts = as_instant(when)
+    t = int(dt.datetime.strptime(ts, "%Y-%m-%d %H:%M:%S").replace(tzinfo=dt.timezone.utc).timestamp()) // 60
+    return _rows(conn.execute(text(f"""
+        select {VERSION_COLUMNS}
+        from job_versions_span s
+        join job_versions v on v.id = s.id
+        join job_contents c on c.content_hash = v.content_hash
+        where s.t_from <= :t and s.t_to >= :t and (:after is null or s.id < :after)
+          and v.valid_from <= :ts and (v.valid_to is null or v.valid_to > :ts)
+        order by s.id desc limit :limit
+    """), {"t": t, "ts": ts, "after": after_version, "limit": limit}))
+
+def latest_run(conn) -> int | None:
+    return conn.execute(text("select max(id) from etl_runs where finished_at is not null")).scalar()
+
+def new_in_run(conn, run_id: int, limit: int = 100) -> list[dict]:
+    """Vagas vistas pela primeira vez na run (primeira versão aberta por ela)."""
+    return _rows(conn.execute(text(f"""
+        select {VERSION_COLUMNS}
+        from job_versions v join job_contents c on c.content_hash = v.content_hash
+        where v.run_id = :run
+          and not exists (select 1 from job_versions p where p.job_id = v.job_id and p.id < v.id)
+        order by v.id limit :limit
+    """), {"run": run_id, "limit": limit}))
+
+def closed_in_run(conn, run_id: int, limit: int = 100) -> list[dict]:
+    """Versões encerradas na run (vaga alterada ou removida)."""
+    return _rows(conn.execute(text(f"""
+        select {VERSION_COLUMNS}
+        from job_versions v join job_contents c on c.content_hash = v.content_hash
+        where v.closed_run = :run order by v.id limit :limit
+    """), {"run": run_id, "limit": limit}))
+
+def job_history(conn, job_id: int) -> list[dict]:
+    return _rows(conn.execute(text(f"""
+        select {VERSION_COLUMNS}
+        from job_versions v join job_contents c on c.content_hash = v.content_hash
+        where v.job_id = :j order by v.valid_from, v.id
+    """), {"j": job_id}))
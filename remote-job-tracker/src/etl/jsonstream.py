@@ -0,0 +1,105 @@
+"""
+Leitura/escrita de JSON em streaming para o ETL.
+- iter_json_array: itera os elementos de um array JSON lendo em blocos (memória ~ maior elemento),
+  inclusive de um array dentro de um objeto (key="jobs")
+- iter_ndjson / write_ndjson: um objeto JSON por linha
+"""
+from __future__ import annotations
+import json, os, pathlib
+from typing import IO, Iterable, Iterator
+
+CHUNK_CHARS = 1 << 16
+
+class _Reader:
+    """Buffer sobre fp lido em blocos; decodifica um valor JSON completo por vez."""
+
+    def __init__(self, fp: IO[str], chunk_size: int):
+        self.fp, self.chunk_size = fp, chunk_size
+        self.buf, self.eof = "", False
+        self.dec = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.fp.read(self.chunk_size)
+        self.eof = not chunk
+        self.buf += chunk
+        return not self.eof
+
+    def peek(self) -> str:
+        # próximo caractere não-branco ("" no fim do arquivo)
+        while True:
+            self.buf = self.buf.lstrip()
+            if self.buf or not self._fill():
+                return self.buf[:1]
+
+    def skip(self, ch: str, what: str):
+        if self.peek() != ch:
+            raise ValueError(f"esperado {what}")
+        self.buf = self.buf[1:]
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                obj, end = self.dec.raw_decode(self.buf)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            else:
+                # um número no fim do buffer pode estar truncado: só aceita se houver algo depois
+                if end < len(self.buf) or self.eof:
+                    self.buf = self.buf[end:]
+                    return obj
+            self._fill()
+
+def iter_json_array(fp: IO[str], chunk_size: int = CHUNK_CHARS, key: str | None = None) -> Iterator:
+    """Com key, o array é o campo `key` de um objeto no topo (ex.: {"jobs": [...]}); sem o campo, nada."""
+    r = _Reader(fp, chunk_size)
+    if not r.peek():
+        return
+    if key is not None:
+        r.skip("{", "um objeto JSON")
+        while True:
+            ch = r.peek()
+            if ch == "}":
+                return
+            if ch == ",":
+                r.buf = r.buf[1:]
+                continue
+            if not ch:
+                raise ValueError("objeto JSON incompleto")
+            k = r.value()
+            r.skip(":", "':' após a chave")
+            if k == key:
+                break
+            r.value()  # demais campos (metadados) são pequenos
+    r.skip("[", "um array JSON")
+    while True:
+        ch = r.peek()
+        if ch == "]":
+            return
+        if ch == ",":
+            r.buf = r.buf[1:]
+            continue
+        if not ch:
+            raise ValueError("array JSON incompleto")
+        yield r.value()
+
+def iter_ndjson(path: pathlib.Path) -> Iterator[dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def write_ndjson(rows: Iterable[dict], path: pathlib.Path) -> int:
+    """Grava em arquivo temporário e troca atomicamente; retorna o nº de linhas."""
+    tmp = path.with_name(path.name + ".tmp")
+    n = 0
+    with open(tmp, "w", encoding="utf-8") as f:
+        for r in rows:
+            f.write(json.dumps(r, ensure_ascii=False))
+            f.write("\n")
+            n += 1
+    os.replace(tmp, path)
+    return n
@@ -1,16 +1,41 @@
 """
-Carrega data/normalized_jobs.csv para SQLite.
-Cria tabelas: jobs, saved_jobs.
+Carrega a partição de staging (data/staging/dt=<data>/jobs.parquet) para SQLite.
+Uso: python -m src.etl.load [AAAA-MM-DD]   (padrão: partição mais recente)
+Cria tabelas: jobs, saved_jobs, job_skills (skill -> vaga, para filtros por índice)
+e o índice FTS5 jobs_fts (mantido por triggers).
+As vagas entram por upsert idempotente (chave url): só linhas novas ou com content_hash
+diferente são gravadas, em lotes executemany dentro de uma única transação.
+Cada execução vira um etl_runs e alimenta o histórico append-only (src/etl/history.py):
+versões com valid_from/valid_to; vagas que somem do snapshot têm a versão fechada.
+O Parquet é lido por row groups já tipados (memória limitada ao tamanho do bloco).
+Em seguida atualiza o índice TF-IDF persistente (jobs_index/) só com as vagas novas/alteradas
+e reconstrói o índice semântico (jobs_index/semantic/) sobre ele.
+Depois marca vagas quase duplicadas (dup_cluster, via MinHash/LSH em src/match/dedup.py)
+e gera alertas só para as vagas inseridas nesta carga (perfis em profiles, ver src/match/alerts.py).
 """
 from __future__ import annotations
-import pathlib, sys
+import hashlib, pathlib, sys
 import pandas as pd
-from sqlalchemy import create_engine, text
+from sqlalchemy import bindparam, create_engine, text
+from src.etl import history
+from src.etl.enrich import SENIORITY_LEVELS, infer_seniority, parse_salary, parse_skills
+from src.etl.staging import iter_partition, partitions
+from src.match.index import TfidfIndex, INDEX_DIR, publish
+from src.match.semantic import SemanticIndex, SEMANTIC_DIR
+from src.match.dedup import find_duplicates
+from src.match.alerts import match_new_jobs
 
 BASE_DIR = pathlib.Path(__file__).resolve().parents[2]
 DATA_DIR = BASE_DIR / "data"
-CSV_PATH = DATA_DIR / "normalized_jobs.csv"
+CSV_PATH = DATA_DIR / "normalized_jobs.csv"  # staging antigo (antes do Parquet)
 DB_PATH = BASE_DIR / "jobs.db"
+CHUNK_SIZE = 1000
+
+JOB_FIELDS = [
+    "source","title","company","location","remote","seniority",
+    "stack","salary","salary_min","salary_max","salary_currency","url","description","published_at"
+]
+NUMERIC_FIELDS = ("salary_min", "salary_max")
 
 DDL = """
 create table if not exists jobs (
@@ -23,9 +48,14 @@ create table if not exists jobs (
   seniority text,
   stack text,
   salary text,
+  salary_min integer,
+  salary_max integer,
+  salary_currency text,
   url text unique,
   description text,
   published_at text,
+  content_hash text,
+  dup_cluster integer,
   created_at text default (datetime('now'))
 );
 
@@ -35,19 +65,256 @@ create table if not exists saved_jobs (
   note text,
   created_at text default (datetime('now'))
 );
+
+create table if not exists profiles (
+  id integer primary key autoincrement,
+  name text not null,
+  skills text not null,
+  min_match real not null default 30,
+  created_at text default (datetime('now'))
+);
+
+create table if not exists alerts (
+  id integer primary key autoincrement,
+  profile_id integer not null references profiles(id) on delete cascade,
+  job_id integer not null references jobs(id) on delete cascade,
+  match real not null,
+  created_at text default (datetime('now')),
+  unique (profile_id, job_id)
+);
+
+create table if not exists job_skills (
+  job_id integer not null references jobs(id) on delete cascade,
+  skill text not null,
+  primary key (skill, job_id)
+) without rowid;
+
+create trigger if not exists jobs_skills_ad after delete on jobs begin
+  delete from job_skills where job_id = old.id;
+end;
+
+create virtual table if not exists jobs_fts using fts5(
+  title, description, content='jobs', content_rowid='id', tokenize="unicode61 tokenchars '+#'"
+);
+
+create trigger if not exists jobs_fts_ai after insert on jobs begin
+  insert into jobs_fts(rowid, title, description) values (new.id, new.title, new.description);
+end;
+
+create trigger if not exists jobs_fts_ad after delete on jobs begin
+  insert into jobs_fts(jobs_fts, rowid, title, description) values ('delete', old.id, old.title, old.description);
+end;
+
+create trigger if not exists jobs_fts_au after update of title, description on jobs begin
+  insert into jobs_fts(jobs_fts, rowid, title, description) values ('delete', old.id, old.title, old.description);
+  insert into jobs_fts(rowid, title, description) values (new.id, new.title, new.description);
+end;
+"""
+
+# colunas criadas depois da primeira versão do schema (migradas com alter table)
+ADDED_COLUMNS = {
+    "content_hash": "text", "dup_cluster": "integer",
+    "salary_min": "integer", "salary_max": "integer", "salary_currency": "text",
+}
+
+INDEXES = """
+create index if not exists idx_jobs_dup_cluster on jobs(dup_cluster);
+create index if not exists idx_jobs_salary_max on jobs(salary_max);
+create index if not exists idx_jobs_seniority on jobs(seniority);
+create index if not exists idx_job_skills_job on job_skills(job_id);
+create index if not exists idx_alerts_profile on alerts(profile_id, id)
 """
 
+def init_schema(conn) -> None:
+    # WAL: a API continua lendo enquanto a carga grava (fora de transação: vem antes de qualquer DML)
+    conn.execute(text("pragma journal_mode = wal"))
+    fts_sql = conn.execute(text("select sql from sqlite_master where name = 'jobs_fts'")).scalar()
+    had_fts = fts_sql is not None and "tokenchars" in fts_sql
+    if fts_sql is not None and not had_fts:
+        # índice antigo quebrava "c++"/"c#" em "c": recria com o tokenizador novo
+        conn.execute(text("drop table jobs_fts"))
+    had_skills = conn.execute(text("select 1 from sqlite_master where name = 'job_skills'")).first()
+    had_history = conn.execute(text("select 1 from sqlite_master where name = 'job_versions'")).first()
+    for stmt in (DDL + ";\n\n" + history.DDL).strip().split(";\n\n"):
+        if stmt.strip():
+            conn.execute(text(stmt))
+    cols = {r[1] for r in conn.execute(text("pragma table_info(jobs)"))}
+    for col, typ in ADDED_COLUMNS.items():
+        if col not in cols:
+            conn.execute(text(f"alter table jobs add column {col} {typ}"))
+    for stmt in (INDEXES.strip() + ";\n" + history.INDEXES.strip()).split(";\n"):
+        conn.execute(text(stmt))
+    if not had_fts:
+        # banco anterior ao FTS (ou ao tokenizador atual): indexa as vagas que já existem
+        conn.execute(text("insert into jobs_fts(jobs_fts) values ('rebuild')"))
+    if not had_skills:
+        backfill_structured(conn)
+    if not had_history:
+        history.backfill_versions(conn)
+
+UPSERT_SQL = text(f"""
+insert into jobs ({", ".join(JOB_FIELDS)}, content_hash)
+values ({", ".join(":" + c for c in JOB_FIELDS)}, :content_hash)
+on conflict(url) do update set
+  {", ".join(f"{c} = excluded.{c}" for c in JOB_FIELDS if c != "url")},
+  content_hash = excluded.content_hash
+where jobs.content_hash is not excluded.content_hash
+""")
+
+EXISTING_SQL = text("select url, content_hash from jobs where url in :urls").bindparams(bindparam("urls", expanding=True))
+
+DELETE_SKILLS_SQL = text(
+    "delete from job_skills where job_id in (select id from jobs where url in :urls)"
+).bindparams(bindparam("urls", expanding=True))
+INSERT_SKILLS_SQL = text("insert or ignore into job_skills(job_id, skill) select id, :skill from jobs where url = :url")
+
+def content_hash(rec: dict) -> str:
+    return hashlib.sha1("\x1f".join(str(rec[c]) for c in JOB_FIELDS).encode("utf-8")).hexdigest()
+
+def _flag(v) -> int:
+    return 0 if str(v).strip().lower() in ("0", "false", "no") else 1
+
+def _int(v) -> int | None:
+    try:
+        return int(float(v)) if v not in (None, "") else None
+    except ValueError:
+        return None
+
+def structure(r: dict) -> dict:
+    """Garante skills canônicas, senioridade e salário numérico (staging antigo só tem o texto)."""
+    r["stack"] = ", ".join(parse_skills(r["stack"]))
+    if r["seniority"] not in SENIORITY_LEVELS:
+        r["seniority"] = infer_seniority(r["title"], str(r["seniority"]).split(","))
+    for c in NUMERIC_FIELDS:
+        r[c] = _int(r[c])
+    if r["salary_min"] is None and r["salary_max"] is None:
+        r["salary_min"], r["salary_max"], r["salary_currency"] = parse_salary(r["salary"])
+    return r
+
+def _records(df: pd.DataFrame) -> list[dict]:
+    df = df.reindex(columns=JOB_FIELDS)
+    df = df.astype(object).where(df.notna(), "")
+    df["remote"] = df["remote"].map(_flag)
+    recs = df.to_dict(orient="records")
+    for r in recs:
+        structure(r)
+        r["content_hash"] = content_hash(r)
+    return recs
+
+def _skill_rows(recs: list[dict]) -> list[dict]:
+    return [{"url": r["url"], "skill": s} for r in recs for s in parse_skills(r["stack"])]
+
+def backfill_structured(conn) -> None:
+    """Banco anterior ao job_skills: extrai skills/senioridade/salário das vagas já gravadas."""
+    rows = conn.execute(text(f"select {', '.join(JOB_FIELDS)} from jobs")).mappings().all()
+    recs = [structure({k: ("" if v is None else v) for k, v in r.items()}) for r in rows]
+    if recs:
+        conn.execute(text("""
+            update jobs set stack = :stack, seniority = :seniority, salary_min = :salary_min,
+              salary_max = :salary_max, salary_currency = :salary_currency
+            where url = :url
+        """), recs)
+        skills = _skill_rows(recs)
+        if skills:
+            conn.execute(INSERT_SKILLS_SQL, skills)
+
+def upsert_jobs(conn, df: pd.DataFrame, chunk_size: int = CHUNK_SIZE, run: dict | None = None) -> dict:
+    """Upsert por url. Vagas sem mudança (mesmo content_hash) não são reescritas.
+    Com `run` (history.start_run), também registra as versões no histórico."""
+    stats = {"inserted": 0, "updated": 0, "unchanged": 0}
+    recs = [r for r in _records(df) if r["url"]]
+    for i in range(0, len(recs), chunk_size):
+        chunk = {r["url"]: r for r in recs[i:i + chunk_size]}  # url repetida no lote: vale a última
+        known = dict(conn.execute(EXISTING_SQL, {"urls": list(chunk)}).all())
+        todo = []
+        for url, r in chunk.items():
+            if url not in known:
+                stats["inserted"] += 1
+            elif known[url] != r["content_hash"]:
+                stats["updated"] += 1
+            else:
+                stats["unchanged"] += 1
+                continue
+            todo.append(r)
+        if todo:
+            conn.execute(UPSERT_SQL, todo)  # executemany
+            conn.execute(DELETE_SKILLS_SQL, {"urls": [r["url"] for r in todo]})
+            skills = _skill_rows(todo)
+            if skills:
+                conn.execute(INSERT_SKILLS_SQL, skills)
+        if run is not None:
+            history.record_versions(conn, run, list(chunk.values()), todo, set(known))
+    return stats
+
+def read_jobs_text(engine) -> pd.DataFrame:
+    with engine.connect() as conn:
+        return pd.read_sql("select id, title, company, description, dup_cluster from jobs", conn)
+
+def refresh_index(df: pd.DataFrame) -> dict:
+    index = TfidfIndex.load(INDEX_DIR) or TfidfIndex()
+    stats = index.update(df)
+    previous = SemanticIndex.load(index, SEMANTIC_DIR)  # versão anterior (reuso de embeddings)
+    # o semântico (amarrado à versão nova do TF-IDF) é publicado antes: quem vê o CURRENT novo
+    # do TF-IDF já encontra o semântico correspondente, em vez de guardar semantic=None
+    index.stage(INDEX_DIR)
+    SemanticIndex(index).build(df, previous).save(SEMANTIC_DIR)
+    publish(INDEX_DIR, index.version)
+    return stats
+
+def refresh_duplicates(engine, df: pd.DataFrame) -> int:
+    """Recalcula os grupos de quase duplicadas e grava só os dup_cluster que mudaram."""
+    if df.empty:
+        return 0
+    dup = find_duplicates(df)
+    changed = df["dup_cluster"].to_numpy(dtype=float) != dup.to_numpy(dtype=float)
+    params = [{"i": int(i), "c": int(c)} for i, c in dup[changed].items()]
+    if params:
+        with engine.begin() as conn:
+            conn.execute(text("update jobs set dup_cluster = :c where id = :i"), params)
+    return len(params)
+
+def refresh_alerts(engine, since_id: int) -> int:
+    """Casa os perfis só com as vagas de id > since_id (inseridas nesta carga)."""
+    index = TfidfIndex.load(INDEX_DIR)
+    if index is None:
+        return 0
+    with engine.begin() as conn:
+        new_ids = [r[0] for r in conn.execute(text("select id from jobs where id > :i"), {"i": since_id})]
+        return match_new_jobs(conn, index, new_ids)
+
+def iter_staged(day: str | None = None):
+    """Blocos (DataFrames) da partição `day` ou da mais recente; cai no CSV antigo se não houver staging."""
+    days = partitions()
+    if day or days:
+        yield from iter_partition(day or days[-1], batch_rows=CHUNK_SIZE)
+    elif CSV_PATH.exists():
+        # dtype=str: o hash não depende da inferência de tipos de cada bloco
+        yield from pd.read_csv(CSV_PATH, chunksize=CHUNK_SIZE, dtype=str, keep_default_na=False)
+
 def main():
+    day = sys.argv[1] if len(sys.argv) > 1 else None
+    if day and day not in partitions():
+        print(f"[erro] sem staging para {day} (disponíveis: {', '.join(partitions()) or 'nenhuma'})")
+        return 1
     engine = create_engine(f"sqlite:///{DB_PATH}", future=True)
+    stats = {"inserted": 0, "updated": 0, "unchanged": 0}
     with engine.begin() as conn:
-        for stmt in DDL.strip().split(";\n\n"):
-            if stmt.strip():
-                conn.execute(text(stmt))
-        if CSV_PATH.exists():
-            df = pd.read_csv(CSV_PATH)
-            df["remote"] = df["remote"].astype(int)
-            df.to_sql("jobs", conn, if_exists="append", index=False, method="multi")
-    print(f"[ok] DB atualizado em {DB_PATH}")
+        init_schema(conn)
+        last_id = conn.execute(text("select coalesce(max(id), 0) from jobs")).scalar_one()
+        # com data explícita (reprocessar snapshots antigos, em ordem), o histórico usa a data da partição
+        run = history.start_run(conn, f"{day} 00:00:00" if day else None, day or (partitions() or [None])[-1])
+        for chunk in iter_staged(day):
+            for k, v in upsert_jobs(conn, chunk, run=run).items():
+                stats[k] += v
+        closed = history.finish_run(conn, run, stats)
+    print(f"[ok] DB atualizado em {DB_PATH} (run {run['id']}): {stats}, {closed} vagas encerradas")
+    jobs = read_jobs_text(engine)
+    stats = refresh_index(jobs)
+    print(f"[ok] Índice TF-IDF atualizado em {INDEX_DIR}: {stats}")
+    n = refresh_duplicates(engine, jobs)
+    print(f"[ok] {n} vagas com grupo de duplicadas atualizado")
+    n = refresh_alerts(engine, last_id)
+    print(f"[ok] {n} alertas novos para os perfis salvos")
 
 if __name__ == "__main__":
     sys.exit(main())
@@ -1,51 +1,118 @@
 """
-Normaliza raw_remoteok.json para um CSV tabular com colunas fixas.
-Saída: data/normalized_jobs.csv
+Normaliza os arquivos data/raw_<fonte>.jsonl para uma tabela com colunas fixas.
+Saída: data/staging/dt=<data da extração>/jobs.parquet (ver src/etl/staging.py)
+Uso: python -m src.etl.normalize [AAAA-MM-DD]   (padrão: hoje)
+Cada fonte (src/etl/sources.py) converte seu formato bruto com um *_record deste módulo.
+Processa em streaming: gerador de registros normalizados -> Parquet gravado em blocos.
+Skills, senioridade e faixa salarial numérica são extraídas por src/etl/enrich.py.
 """
 from __future__ import annotations
-import json, pathlib, sys
+import datetime as dt, pathlib, sys
+from typing import Callable, Iterable, Iterator
 import pandas as pd
+from src.etl.enrich import format_salary, infer_seniority, parse_salary, parse_skills, salary_range
+from src.etl.jsonstream import iter_json_array, iter_ndjson
+from src.etl.staging import write_partition, partition_path
 
 BASE_DIR = pathlib.Path(__file__).resolve().parents[2]
 DATA_DIR = BASE_DIR / "data"
-RAW_PATH = DATA_DIR / "raw_remoteok.json"
-CSV_PATH = DATA_DIR / "normalized_jobs.csv"
+RAW_PATH = DATA_DIR / "raw_remoteok.jsonl"
+LEGACY_RAW_PATH = DATA_DIR / "raw_remoteok.json"  # formato antigo (array JSON)
 
 COLUMNS = [
     "source","title","company","location","remote","seniority",
-    "stack","salary","url","description","published_at"
+    "stack","salary","salary_min","salary_max","salary_currency","url","description","published_at"
 ]
 
-def normalize_remoteok(rows: list[dict]) -> pd.DataFrame:
-    norm = []
+def _text(v) -> str:
+    return "" if v is None else str(v)
+
+def _flat(v) -> str:
+    return _text(v).replace("\r", " ").replace("\n", " ").strip()
+
+def _tags(r: dict) -> list[str]:
+    return [str(t) for t in r["tags"]] if isinstance(r.get("tags"), list) else []
+
+def remoteok_record(r: dict) -> dict:
+    tags, title = _tags(r), _text(r.get("position") or r.get("title")).strip()
+    lo, hi, currency = salary_range(r.get("salary_min"), r.get("salary_max"))
+    if lo is None:
+        lo, hi, currency = parse_salary(r.get("salary"))
+    return {
+        "source": "remoteok",
+        "title": title,
+        "company": _text(r.get("company")).strip(),
+        "location": r.get("location") or (", ".join(r.get("location_tag", [])) if isinstance(r.get("location_tag"), list) else ""),
+        "remote": True,
+        "seniority": infer_seniority(title, tags),
+        "stack": ", ".join(parse_skills(tags)),
+        "salary": r.get("salary") or format_salary(lo, hi, currency),
+        "salary_min": lo,
+        "salary_max": hi,
+        "salary_currency": currency,
+        "url": _text(r.get("url") or r.get("apply_url") or r.get("slug")).strip(),
+        "description": _flat(r.get("description")),
+        "published_at": r.get("date") or r.get("epoch") or "",
+    }
+
+def remotive_record(r: dict) -> dict:
+    tags, title = _tags(r), _text(r.get("title")).strip()
+    lo, hi, currency = parse_salary(r.get("salary"))
+    return {
+        "source": "remotive",
+        "title": title,
+        "company": _text(r.get("company_name")).strip(),
+        "location": r.get("candidate_required_location") or "",
+        "remote": True,
+        "seniority": infer_seniority(title, tags),
+        "stack": ", ".join(parse_skills(tags)),
+        "salary": r.get("salary") or "",
+        "salary_min": lo,
+        "salary_max": hi,
+        "salary_currency": currency,
+        "url": _text(r.get("url")).strip(),
+        "description": _flat(r.get("description")),
+        "published_at": r.get("publication_date") or "",
+    }
+
+def iter_normalized(rows: Iterable[dict], to_record: Callable[[dict], dict] = remoteok_record) -> Iterator[dict]:
+    # dedup por (source, url) mantendo só hashes dos vistos, não os registros
+    seen: set[int] = set()
     for r in rows:
-        norm.append({
-            "source": "remoteok",
-            "title": r.get("position") or r.get("title") or "",
-            "company": r.get("company") or "",
-            "location": r.get("location") or (", ".join(r.get("location_tag", [])) if isinstance(r.get("location_tag"), list) else ""),
-            "remote": True,
-            "seniority": ", ".join(r.get("tags", [])) if isinstance(r.get("tags"), list) else "",
-            "stack": ", ".join(r.get("tags", [])) if isinstance(r.get("tags"), list) else "",
-            "salary": r.get("salary") or "",
-            "url": r.get("url") or r.get("apply_url") or r.get("slug") or "",
-            "description": r.get("description") or "",
-            "published_at": r.get("date") or r.get("epoch") or "",
-        })
-    df = pd.DataFrame(norm, columns=COLUMNS)
-    # limpeza básica
-    df["title"] = df["title"].fillna("").str.strip()
-    df["company"] = df["company"].fillna("").str.strip()
-    df["url"] = df["url"].fillna("").str.strip()
-    df["description"] = df["description"].fillna("").str.replace("\r", " ").str.replace("\n", " ").str.strip()
-    return df.drop_duplicates(subset=["source","url"]).reset_index(drop=True)
+        rec = to_record(r)
+        key = hash((rec["source"], rec["url"]))
+        if key in seen:
+            continue
+        seen.add(key)
+        yield rec
+
+def normalize_remoteok(rows: list[dict]) -> pd.DataFrame:
+    return pd.DataFrame(list(iter_normalized(rows)), columns=COLUMNS)
+
+def _iter_legacy() -> Iterator[dict]:
+    with open(LEGACY_RAW_PATH, "r", encoding="utf-8") as f:
+        yield from iter_json_array(f)
+
+def iter_raw() -> Iterator[tuple[str, Iterable[dict]]]:
+    """(nome da fonte, linhas brutas) para cada data/raw_<fonte>.jsonl."""
+    for path in sorted(DATA_DIR.glob("raw_*.jsonl")):
+        yield path.stem[len("raw_"):], iter_ndjson(path)
+    if not RAW_PATH.exists() and LEGACY_RAW_PATH.exists():
+        yield "remoteok", _iter_legacy()
+
+def iter_all_normalized() -> Iterator[dict]:
+    from src.etl.sources import SOURCES  # import tardio: sources.py importa este módulo
+    for name, rows in iter_raw():
+        source = SOURCES.get(name)
+        if source is None:
+            print(f"[warn] fonte desconhecida ignorada: {name}")
+            continue
+        yield from iter_normalized(rows, source.normalize)
 
 def main():
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
-    rows = json.load(open(RAW_PATH, "r", encoding="utf-8")) if RAW_PATH.exists() else []
-    df = normalize_remoteok(rows)
-    df.to_csv(CSV_PATH, index=False)
-    print(f"[ok] {len(df)} vagas normalizadas em {CSV_PATH}")
+    day = sys.argv[1] if len(sys.argv) > 1 else dt.date.today().isoformat()
+    n = write_partition(iter_all_normalized(), day)
+    print(f"[ok] {n} vagas normalizadas em {partition_path(day)}")
 
 if __name__ == "__main__":
     sys.exit(main())
@@ -0,0 +1,63 @@
+"""
+Fontes de vagas (plugins) usadas pelo extrator concorrente (src/etl/extract.py).
+Cada fonte define de onde buscar (url), como ler a resposta bruta (parse) e como
+converter uma linha para o schema comum do normalize.py (normalize).
+Para adicionar uma fonte: subclasse de Source decorada com @register.
+"""
+from __future__ import annotations
+import os
+from abc import ABC, abstractmethod
+from typing import IO, Iterator
+from src.etl.jsonstream import iter_json_array
+from src.etl.normalize import remoteok_record, remotive_record
+
+class Source(ABC):
+    name: str = ""
+    url: str = ""
+
+    def __init__(self, url: str | None = None):
+        if url:
+            self.url = url
+
+    def parse(self, fp: IO[str]) -> Iterator[dict]:
+        # padrão: array JSON lido em streaming
+        for item in iter_json_array(fp):
+            if isinstance(item, dict):
+                yield item
+
+    @abstractmethod
+    def normalize(self, row: dict) -> dict:
+        ...
+
+SOURCES: dict[str, Source] = {}
+
+def register(cls: type[Source]) -> type[Source]:
+    SOURCES[cls.name] = cls()
+    return cls
+
+@register
+class RemoteOK(Source):
+    name = "remoteok"
+    url = os.getenv("REMOTEOK_API", "https://remoteok.com/api")
+
+    def parse(self, fp: IO[str]) -> Iterator[dict]:
+        for item in super().parse(fp):
+            if "legal" not in item:  # a API retorna o primeiro item como metadados
+                yield item
+
+    def normalize(self, row: dict) -> dict:
+        return remoteok_record(row)
+
+@register
+class Remotive(Source):
+    name = "remotive"
+    url = os.getenv("REMOTIVE_API", "https://remotive.com/api/remote-jobs")
+
+    def parse(self, fp: IO[str]) -> Iterator[dict]:
+        # resposta é um objeto {"jobs": [...]}: lê só o array, também em streaming
+        for item in iter_json_array(fp, key="jobs"):
+            if isinstance(item, dict):
+                yield item
+
+    def normalize(self, row: dict) -> dict:
+        return remotive_record(row)
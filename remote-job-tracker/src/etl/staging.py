@@ -0,0 +1,82 @@
+"""
+Staging colunar (Parquet) entre normalize.py e load.py.
+Layout: data/staging/dt=AAAA-MM-DD/jobs.parquet (uma partição por data de extração, schema tipado).
+O load lê os row groups já tipados (sem parse de CSV) e snapshots antigos podem ser
+consultados direto, sem rodar o extrator de novo.
+"""
+from __future__ import annotations
+import datetime as dt, itertools, os, pathlib
+from typing import Iterable, Iterator
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+BASE_DIR = pathlib.Path(__file__).resolve().parents[2]
+STAGING_DIR = BASE_DIR / "data" / "staging"
+CHUNK_ROWS = 5000
+
+SCHEMA = pa.schema([
+    ("source", pa.string()),
+    ("title", pa.string()),
+    ("company", pa.string()),
+    ("location", pa.string()),
+    ("remote", pa.bool_()),
+    ("seniority", pa.string()),
+    ("stack", pa.string()),
+    ("salary", pa.string()),
+    ("salary_min", pa.int64()),
+    ("salary_max", pa.int64()),
+    ("salary_currency", pa.string()),
+    ("url", pa.string()),
+    ("description", pa.string()),
+    ("published_at", pa.string()),
+])
+
+def partition_path(day: dt.date | str, base: pathlib.Path = STAGING_DIR) -> pathlib.Path:
+    return base / f"dt={day}" / "jobs.parquet"
+
+def partitions(base: pathlib.Path = STAGING_DIR) -> list[str]:
+    """Datas com snapshot disponível, da mais antiga para a mais recente."""
+    return sorted(p.parent.name[len("dt="):] for p in base.glob("dt=*/jobs.parquet"))
+
+def _table(chunk: list[dict]) -> pa.Table:
+    cols = {}
+    for f in SCHEMA:
+        vals = [r.get(f.name) for r in chunk]
+        if f.type == pa.bool_():
+            cols[f.name] = [bool(v) for v in vals]
+        elif f.type == pa.int64():
+            cols[f.name] = [None if v in (None, "") else int(v) for v in vals]
+        else:
+            cols[f.name] = ["" if v is None else str(v) for v in vals]
+    return pa.Table.from_pydict(cols, schema=SCHEMA)
+
+def write_partition(records: Iterable[dict], day: dt.date | str, base: pathlib.Path = STAGING_DIR,
+                    chunk_rows: int = CHUNK_ROWS) -> int:
+    """Grava os registros em blocos (um row group por bloco) e publica a partição atomicamente."""
+    path = partition_path(day, base)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")  # prefixo "." fica fora do dataset
+    n, it = 0, iter(records)
+    with pq.ParquetWriter(tmp, SCHEMA, compression="zstd") as writer:
+        while chunk := list(itertools.islice(it, chunk_rows)):
+            writer.write_table(_table(chunk))
+            n += len(chunk)
+    os.replace(tmp, path)
+    return n
+
+def iter_partition(day: str, base: pathlib.Path = STAGING_DIR, batch_rows: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    pf = pq.ParquetFile(partition_path(day, base))
+    for batch in pf.iter_batches(batch_size=batch_rows):
+        yield batch.to_pandas()
+
+def read_snapshot(day: str | None = None, columns: list[str] | None = None, filter=None,
+                  base: pathlib.Path = STAGING_DIR) -> pd.DataFrame:
+    """Vagas de um snapshot (ou de todos, com a coluna dt, se day=None).
+    Ex.: read_snapshot("2025-08-01", ["title", "company"], ds.field("company") == "Acme")"""
+    dataset = ds.dataset(base, format="parquet", partitioning="hive", exclude_invalid_files=True)
+    cond = ds.field("dt") == day if day else None
+    if filter is not None:
+        cond = filter if cond is None else cond & filter
+    return dataset.to_table(columns=columns, filter=cond).to_pandas()
@@ -0,0 +1,40 @@
+"""
+Alertas de vagas: perfis de skills salvos (tabela profiles) casados com as vagas novas de cada carga.
+O load.py chama match_new_jobs só com as vagas inseridas naquela execução: um único produto
+esparso (perfis x termos) @ (termos x vagas novas) contra o índice TF-IDF já atualizado,
+então o custo cresce com as vagas novas e não com perfis x todas as vagas.
+Matches com match (0..100) >= min_match do perfil vão para a tabela alerts.
+"""
+from __future__ import annotations
+import numpy as np
+from sqlalchemy import text
+from src.match.index import TfidfIndex
+
+PROFILES_SQL = text("select id, skills, min_match from profiles")
+INSERT_ALERT_SQL = text("insert or ignore into alerts(profile_id, job_id, match) values (:p, :j, :m)")
+
+def score_profiles(index: TfidfIndex, skills: list[str], job_ids):
+    """Matriz esparsa (perfis x vagas) de match 0..100 e os ids das vagas (só as que estão no índice)."""
+    job_ids = np.asarray(job_ids, dtype=np.int64)
+    job_ids = job_ids[np.isin(job_ids, index.ids)]
+    Q = index.transform(skills)
+    X = index.matrix[index.positions(job_ids)]
+    S = (Q @ X.T).tocoo()  # esparso x esparso: só pares com termos em comum aparecem
+    S.data = S.data * 100
+    return S, job_ids
+
+def match_new_jobs(conn, index: TfidfIndex, job_ids) -> int:
+    """Grava alertas (perfil, vaga nova) acima do min_match de cada perfil; retorna quantos."""
+    profiles = conn.execute(PROFILES_SQL).all()
+    if not profiles or not len(job_ids):
+        return 0
+    S, ids = score_profiles(index, [p.skills for p in profiles], job_ids)
+    floors = np.array([p.min_match for p in profiles], dtype=np.float32)
+    hit = (S.data > 0) & (S.data >= floors[S.row])
+    rows = [
+        {"p": profiles[p].id, "j": int(ids[j]), "m": round(float(m), 2)}
+        for p, j, m in zip(S.row[hit], S.col[hit], S.data[hit])
+    ]
+    if rows:
+        conn.execute(INSERT_ALERT_SQL, rows)
+    return len(rows)
@@ -0,0 +1,85 @@
+"""
+Detecção de vagas quase duplicadas (mesma vaga republicada com outra URL ou vinda de outra fonte).
+MinHash sobre shingles de 3 palavras de título+empresa+descrição e LSH por bandas: só vagas
+que colidem em alguma banda são comparadas (com a representante do balde), sem pares O(n²).
+Resultado: dup_cluster = menor id do grupo (a vaga mais antiga é a canônica).
+"""
+from __future__ import annotations
+import re, zlib
+from typing import Iterable
+import numpy as np
+import pandas as pd
+
+NUM_PERM = 128
+BANDS = 16          # 16 bandas x 8 linhas: colisão provável a partir de ~0.7 de similaridade
+THRESHOLD = 0.8     # Jaccard estimado mínimo para considerar duplicada
+SHINGLE = 3
+# hashing multiply-shift: h(x) = ((a*x + b) mod 2^64) >> 32, com a ímpar (o uint64 já faz o mod)
+_rng = np.random.default_rng(42)
+_A = _rng.integers(0, 1 << 63, NUM_PERM, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+_B = _rng.integers(0, 1 << 63, NUM_PERM, dtype=np.uint64)
+_BATCH = 1 << 15   # shingles por lote (memória ~ NUM_PERM x _BATCH x 8 bytes)
+
+def dedup_text(df: pd.DataFrame) -> pd.Series:
+    return df["title"].fillna("") + " " + df["company"].fillna("") + " " + df["description"].fillna("")
+
+def shingles(text: str, k: int = SHINGLE) -> np.ndarray:
+    words = re.findall(r"\w+", text.lower())
+    if len(words) < k:
+        words = words + [""] * (k - len(words))
+    grams = {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+    return np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+
+def minhash(texts: Iterable[str]) -> np.ndarray:
+    """Assinaturas (n, NUM_PERM) uint32, processando os shingles em lotes vetorizados."""
+    sigs, batch, lens = [], [], []
+    def flush():
+        x = np.concatenate(batch)
+        h = (_A[:, None] * x[None, :] + _B[:, None]) >> np.uint64(32)
+        starts = np.concatenate([[0], np.cumsum(lens)[:-1]])
+        sigs.append(np.minimum.reduceat(h, starts, axis=1).T.astype(np.uint32))
+        batch.clear(); lens.clear()
+    size = 0
+    for t in texts:
+        s = shingles(t)
+        batch.append(s); lens.append(len(s)); size += len(s)
+        if size >= _BATCH:
+            flush(); size = 0
+    if batch:
+        flush()
+    return np.vstack(sigs) if sigs else np.zeros((0, NUM_PERM), dtype=np.uint32)
+
+def clusters(ids: np.ndarray, sigs: np.ndarray, bands: int = BANDS, threshold: float = THRESHOLD) -> np.ndarray:
+    """dup_cluster de cada vaga (menor id entre as quase duplicadas), via LSH + union-find."""
+    n = len(ids)
+    parent = np.arange(n)
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+    rows = sigs.shape[1] // bands
+    for b in range(bands):
+        band = np.ascontiguousarray(sigs[:, b * rows:(b + 1) * rows]).view(np.dtype((np.void, rows * 4))).ravel()
+        _, bucket = np.unique(band, return_inverse=True)
+        order = np.argsort(bucket, kind="stable")
+        splits = np.flatnonzero(np.diff(bucket[order])) + 1
+        for group in np.split(order, splits):
+            if len(group) < 2:
+                continue
+            head = group[0]
+            # compara cada membro só com o primeiro do balde (linear no tamanho do balde)
+            sim = (sigs[group[1:]] == sigs[head]).mean(axis=1)
+            for j in group[1:][sim >= threshold]:
+                ri, rj = find(head), find(j)
+                if ri != rj:
+                    parent[max(ri, rj)] = min(ri, rj)
+    roots = np.array([find(i) for i in range(n)], dtype=np.int64)
+    # rótulo = menor id do grupo
+    canon = pd.Series(ids).groupby(roots).transform("min").to_numpy()
+    return canon.astype(np.int64)
+
+def find_duplicates(df: pd.DataFrame) -> pd.Series:
+    """df com id, title, company, description -> Series dup_cluster indexada por id."""
+    ids = df["id"].to_numpy(dtype=np.int64)
+    return pd.Series(clusters(ids, minhash(dedup_text(df))), index=ids, name="dup_cluster")
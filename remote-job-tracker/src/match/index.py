@@ -0,0 +1,227 @@
+"""
+Índice TF-IDF persistente e incremental para o ranking de vagas.
+Fica em jobs_index/ (ao lado do jobs.db): vocabulário, frequência de documentos (IDF),
+contagens brutas e a matriz TF-IDF normalizada (CSR), lida via memory-map.
+O load.py atualiza apenas as vagas novas/alteradas; ranquear vira um produto matriz-vetor.
+"""
+from __future__ import annotations
+import hashlib, json, os, pathlib, shutil
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+BASE_DIR = pathlib.Path(__file__).resolve().parents[2]
+INDEX_DIR = BASE_DIR / "jobs_index"
+KEEP_VERSIONS = 2  # versões antigas mantidas para leitores que ainda as usam
+
+# configuração única do TF-IDF: o índice persistido e o fit ad-hoc do rank.py (sem índice)
+# precisam do mesmo vocabulário para darem os mesmos scores
+TFIDF_PARAMS = {"stop_words": "english"}
+
+def make_vectorizer() -> TfidfVectorizer:
+    return TfidfVectorizer(**TFIDF_PARAMS)
+
+_analyzer = make_vectorizer().build_analyzer()
+
+def job_text(df: pd.DataFrame) -> pd.Series:
+    return df["title"].fillna("") + " " + df["description"].fillna("")
+
+def text_hash(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+
+def current_version(path: pathlib.Path = INDEX_DIR) -> int:
+    try:
+        return int((path / "CURRENT").read_text().strip())
+    except (FileNotFoundError, ValueError):
+        return 0
+
+def version_dir(path: pathlib.Path, version: int) -> pathlib.Path:
+    return path / f"v{version:06d}"
+
+def new_version_dir(path: pathlib.Path, version: int) -> pathlib.Path:
+    out = version_dir(path, version)
+    if out.exists():
+        shutil.rmtree(out)
+    out.mkdir(parents=True)
+    return out
+
+def publish(path: pathlib.Path, version: int) -> None:
+    """Troca o ponteiro CURRENT atomicamente e remove versões antigas."""
+    tmp = path / "CURRENT.tmp"
+    tmp.write_text(str(version))
+    os.replace(tmp, path / "CURRENT")
+    for old in sorted(path.glob("v*"))[:-KEEP_VERSIONS]:
+        shutil.rmtree(old, ignore_errors=True)
+
+class TfidfIndex:
+    def __init__(self):
+        self.version = 0
+        self.vocabulary: dict[str, int] = {}
+        self.doc_freq = np.zeros(0, dtype=np.int64)
+        self.ids = np.zeros(0, dtype=np.int64)          # ordenados (asc), alinhados às linhas
+        self.hashes = np.zeros(0, dtype=np.uint64)      # hash de título+descrição por linha
+        self.counts = sparse.csr_matrix((0, 0), dtype=np.int32)
+        self.matrix = sparse.csr_matrix((0, 0), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def idf(self) -> np.ndarray:
+        # idf suavizado, igual ao default do sklearn
+        n = len(self.ids)
+        return (np.log((1 + n) / (1 + self.doc_freq)) + 1).astype(np.float32)
+
+    # ---------- construção ----------
+    def _count(self, texts: list[str]) -> sparse.csr_matrix:
+        indptr, indices, data = [0], [], []
+        for t in texts:
+            row: dict[int, int] = {}
+            for tok in _analyzer(t):
+                j = self.vocabulary.setdefault(tok, len(self.vocabulary))
+                row[j] = row.get(j, 0) + 1
+            indices.extend(row.keys()); data.extend(row.values())
+            indptr.append(len(indices))
+        if len(self.doc_freq) < len(self.vocabulary):
+            self.doc_freq = np.concatenate([self.doc_freq, np.zeros(len(self.vocabulary) - len(self.doc_freq), dtype=np.int64)])
+        m = sparse.csr_matrix(
+            (np.asarray(data, dtype=np.int32), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int32)),
+            shape=(len(texts), len(self.vocabulary)),
+        )
+        m.sort_indices()
+        return m
+
+    def _weight(self, counts: sparse.csr_matrix) -> sparse.csr_matrix:
+        X = counts.astype(np.float32)
+        X.data *= self.idf[X.indices]
+        return normalize(X, norm="l2", copy=False).tocsr()
+
+    def update(self, df: pd.DataFrame) -> dict:
+        """Sincroniza o índice com `df` (id, title, description), que representa todas as vagas atuais.
+        Só as linhas novas ou com hash diferente são tokenizadas; as removidas saem do índice."""
+        df = df.sort_values("id")
+        ids = df["id"].to_numpy(dtype=np.int64)
+        texts = job_text(df).tolist()
+        hashes = np.array([text_hash(t) for t in texts], dtype=np.uint64)
+
+        pos = np.searchsorted(self.ids, ids)
+        pos_ok = np.minimum(pos, max(len(self.ids) - 1, 0))
+        found = (pos < len(self.ids)) & (self.ids[pos_ok] == ids) if len(self.ids) else np.zeros(len(ids), dtype=bool)
+        same = found & (self.hashes[pos_ok] == hashes) if len(self.ids) else found
+        keep_rows = pos[same]
+
+        dropped = np.setdiff1d(np.arange(len(self.ids)), keep_rows)
+        if len(dropped):
+            gone = self.counts[dropped]
+            self.doc_freq -= np.bincount(gone.indices, minlength=len(self.doc_freq))
+
+        fresh = ~same
+        new_counts = self._count([t for t, f in zip(texts, fresh) if f])
+        self.doc_freq += np.bincount(new_counts.indices, minlength=len(self.doc_freq))
+
+        n_terms = len(self.vocabulary)
+        old = self.counts[keep_rows]
+        old = sparse.csr_matrix((old.data, old.indices, old.indptr), shape=(old.shape[0], n_terms))
+        counts = sparse.vstack([old, new_counts], format="csr", dtype=np.int32)
+        all_ids = np.concatenate([self.ids[keep_rows], ids[fresh]])
+        all_hashes = np.concatenate([self.hashes[keep_rows], hashes[fresh]])
+        order = np.argsort(all_ids, kind="stable")
+
+        self.ids, self.hashes = all_ids[order], all_hashes[order]
+        self.counts = counts[order]
+        self.matrix = self._weight(self.counts)
+        return {
+            "added": int((~found).sum()),
+            "updated": int((found & ~same).sum()),
+            "removed": int(len(dropped) - (found & ~same).sum()),
+            "unchanged": int(same.sum()),
+        }
+
+    # ---------- consulta ----------
+    def transform(self, queries: list[str]) -> sparse.csr_matrix:
+        indptr, indices, data = [0], [], []
+        for q in queries:
+            row: dict[int, int] = {}
+            for tok in _analyzer(q):
+                j = self.vocabulary.get(tok)
+                if j is not None and j < self.matrix.shape[1]:
+                    row[j] = row.get(j, 0) + 1
+            indices.extend(row.keys()); data.extend(row.values())
+            indptr.append(len(indices))
+        Q = sparse.csr_matrix((data, indices, indptr), shape=(len(queries), self.matrix.shape[1]), dtype=np.int32)
+        return self._weight(Q)
+
+    def score(self, skills: str, rows: np.ndarray | None = None) -> np.ndarray:
+        """Similaridade de cosseno (0..1) da consulta contra todas as vagas (ordem de `ids`) ou só `rows`."""
+        q = self.transform([skills]).toarray().ravel()
+        sims = self.matrix @ q
+        return sims if rows is None else sims[rows]
+
+    def bm25(self, query: str, k1: float = 1.2, b: float = 0.75) -> np.ndarray:
+        """Score BM25 da consulta para todas as vagas, calculado das contagens brutas persistidas."""
+        terms = sorted({j for tok in _analyzer(query) if (j := self.vocabulary.get(tok)) is not None and j < self.counts.shape[1]})
+        n = len(self.ids)
+        if not terms or not n:
+            return np.zeros(n, dtype=np.float32)
+        tf = self.counts[:, terms].toarray().astype(np.float32)
+        dl = np.asarray(self.counts.sum(axis=1), dtype=np.float32).ravel()
+        df = self.doc_freq[terms]
+        idf = np.log(1 + (n - df + 0.5) / (df + 0.5)).astype(np.float32)
+        norm = k1 * (1 - b + b * dl / max(dl.mean(), 1e-9))
+        return (tf * (k1 + 1) / (tf + norm[:, None])) @ idf
+
+    def positions(self, ids) -> np.ndarray | None:
+        """Linhas do índice para os ids informados, ou None se algum id não estiver indexado."""
+        ids = np.asarray(ids, dtype=np.int64)
+        if not len(self.ids):
+            return None if len(ids) else ids
+        pos = np.searchsorted(self.ids, ids)
+        pos_ok = np.minimum(pos, len(self.ids) - 1)
+        if not np.all(self.ids[pos_ok] == ids):
+            return None
+        return pos_ok
+
+    # ---------- persistência ----------
+    def save(self, path: pathlib.Path = INDEX_DIR) -> pathlib.Path:
+        """Grava uma nova versão em path/vNNNNNN e publica atomicamente via o arquivo CURRENT."""
+        out = self.stage(path)
+        publish(path, self.version)
+        return out
+
+    def stage(self, path: pathlib.Path = INDEX_DIR) -> pathlib.Path:
+        """Grava uma nova versão sem publicá-la (quem lê o CURRENT continua na anterior)."""
+        self.version = max(self.version, current_version(path)) + 1
+        out = new_version_dir(path, self.version)
+        terms = sorted(self.vocabulary, key=self.vocabulary.get)
+        (out / "vocab.json").write_text(json.dumps(terms, ensure_ascii=False), encoding="utf-8")
+        np.save(out / "doc_freq.npy", self.doc_freq)
+        np.save(out / "ids.npy", self.ids)
+        np.save(out / "hashes.npy", self.hashes)
+        for name, m in (("counts", self.counts), ("matrix", self.matrix)):
+            np.save(out / f"{name}_data.npy", m.data)
+            np.save(out / f"{name}_indices.npy", m.indices.astype(np.int32))
+            np.save(out / f"{name}_indptr.npy", m.indptr.astype(np.int64))
+        (out / "meta.json").write_text(json.dumps({"version": self.version, "shape": list(self.matrix.shape)}))
+        return out
+
+    @classmethod
+    def load(cls, path: pathlib.Path = INDEX_DIR) -> TfidfIndex | None:
+        version = current_version(path)
+        src = version_dir(path, version)
+        if not version or not src.exists():
+            return None
+        idx = cls()
+        idx.version = version
+        meta = json.loads((src / "meta.json").read_text())
+        terms = json.loads((src / "vocab.json").read_text(encoding="utf-8"))
+        idx.vocabulary = {t: i for i, t in enumerate(terms)}
+        idx.doc_freq = np.load(src / "doc_freq.npy")
+        idx.ids = np.load(src / "ids.npy")
+        idx.hashes = np.load(src / "hashes.npy")
+        shape = tuple(meta["shape"])
+        for name in ("counts", "matrix"):
+            arrays = [np.load(src / f"{name}_{part}.npy", mmap_mode="r") for part in ("data", "indices", "indptr")]
+            setattr(idx, name, sparse.csr_matrix(tuple(arrays), shape=shape, copy=False))
+        return idx
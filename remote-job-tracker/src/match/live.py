@@ -0,0 +1,58 @@
+"""
+Índices de ranking mantidos em memória por um processo de longa duração (API).
+Carrega o TF-IDF (e o semântico, se existir) uma vez e troca os dois de uma vez só quando o
+load.py publica uma nova versão (arquivo CURRENT em jobs_index/). Quem está no meio de uma
+consulta continua com o snapshot antigo; as consultas seguintes já pegam o novo.
+"""
+from __future__ import annotations
+import copy, pathlib, threading, time
+from dataclasses import dataclass
+from src.match.index import INDEX_DIR, TfidfIndex, current_version
+from src.match.semantic import SEMANTIC_DIR, SemanticIndex
+
+CHECK_INTERVAL = 1.0  # segundos entre leituras do CURRENT
+
+@dataclass(frozen=True)
+class Snapshot:
+    version: int
+    tfidf: TfidfIndex | None
+    semantic: SemanticIndex | None
+
+    def index(self, mode: str = "tfidf") -> TfidfIndex | SemanticIndex | None:
+        """"tfidf", "vector" ou "hybrid" (os dois últimos caem no TF-IDF sem índice semântico)."""
+        if mode == "tfidf" or self.semantic is None:
+            return self.tfidf
+        view = copy.copy(self.semantic)  # cópia rasa: compartilha as matrizes, só muda o modo
+        view.mode = mode
+        return view
+
+class LiveIndex:
+    def __init__(self, path: pathlib.Path = INDEX_DIR, semantic_path: pathlib.Path = SEMANTIC_DIR,
+                 check_interval: float = CHECK_INTERVAL):
+        self.path, self.semantic_path = path, semantic_path
+        self.check_interval = check_interval
+        self.snapshot = Snapshot(0, None, None)
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def _load(self, version: int) -> Snapshot:
+        tfidf = TfidfIndex.load(self.path)
+        if tfidf is None:
+            return Snapshot(version, None, None)
+        return Snapshot(tfidf.version, tfidf, SemanticIndex.load(tfidf, self.semantic_path))
+
+    def stale(self) -> bool:
+        """Se já passou o intervalo, confere se o ETL publicou outra versão."""
+        now = time.monotonic()
+        if now - self._checked < self.check_interval:
+            return False
+        self._checked = now
+        return current_version(self.path) != self.snapshot.version
+
+    def refresh(self) -> Snapshot:
+        """Recarrega se houver versão nova (bloqueante: na API, rodar em thread)."""
+        with self._lock:
+            version = current_version(self.path)
+            if version != self.snapshot.version or self.snapshot.tfidf is None:
+                self.snapshot = self._load(version)  # troca atômica: uma atribuição
+            return self.snapshot
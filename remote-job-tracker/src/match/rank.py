@@ -1,20 +1,90 @@
 """
 Funções de ranking por similaridade TF-IDF entre skills do usuário e a descrição/título da vaga.
+Com um TfidfIndex (src/match/index.py) o ranking reaproveita a matriz persistida em vez de refazer o fit.
+Com um SemanticIndex (src/match/semantic.py) o ranking usa embeddings densos (ou híbrido BM25 + vetor).
+Os scores ficam em arrays NumPy; só as top-k linhas do DataFrame são materializadas.
 """
 from __future__ import annotations
+from typing import Iterator, Mapping
+import numpy as np
 import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
+from src.match.index import TfidfIndex, make_vectorizer
+from src.match.semantic import SemanticIndex
 
-def compute_match(df: pd.DataFrame, skills: str, top_k: int = 50) -> pd.DataFrame:
-    if df.empty:
-        return df
+RankIndex = TfidfIndex | SemanticIndex
+
+def _fit_scores(df: pd.DataFrame, queries: list[str]) -> np.ndarray:
     corpus = (df["title"].fillna("") + " " + df["description"].fillna("")).tolist()
-    vec = TfidfVectorizer(stop_words="english", max_features=10000)
+    vec = make_vectorizer()
     X = vec.fit_transform(corpus)
-    q = vec.transform([skills])
-    sims = cosine_similarity(q, X).flatten()
-    out = df.copy()
-    out["match"] = (sims * 100).round(2)  # 0..100
-    out = out.sort_values("match", ascending=False)
-    return out.head(top_k).reset_index(drop=True)
+    Q = vec.transform(queries)
+    return cosine_similarity(Q, X)
+
+def score_matrix(df: pd.DataFrame, queries: list[str], index: RankIndex | None = None) -> np.ndarray:
+    """Scores de cosseno (0..1) com shape (len(queries), len(df)), num único produto esparso."""
+    pos = index.positions(df["id"]) if index is not None and "id" in df.columns else None
+    if pos is None:
+        # sem índice (ou índice desatualizado para estas vagas): fit ad-hoc
+        return _fit_scores(df, queries)
+    if isinstance(index, SemanticIndex):
+        return np.vstack([index.score(q, pos) for q in queries])
+    Q = index.transform(queries)
+    return np.asarray((Q @ index.matrix[pos].T).todense())
+
+def top_k_positions(scores: np.ndarray, k: int) -> np.ndarray:
+    """Posições dos k maiores scores em ordem decrescente: seleção parcial O(n) + sort só dos k."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    part = np.argpartition(-scores, k - 1)[:k]
+    return part[np.argsort(-scores[part], kind="stable")]
+
+def widening_top_k(scores: np.ndarray, k: int) -> Iterator[np.ndarray]:
+    """Seleções parciais cada vez maiores (k, 2k, 4k, ...) até cobrir todos os scores; para quem
+    descarta candidatas depois (duplicadas, vagas fora do banco) e precisa completar k."""
+    while True:
+        yield top_k_positions(scores, k)
+        if k >= len(scores):
+            return
+        k *= 2
+
+def _collapsed_top(df: pd.DataFrame, scores: np.ndarray, top_k: int) -> np.ndarray:
+    # melhor vaga de cada grupo de duplicadas; amplia a seleção parcial até achar k grupos
+    groups = df["dup_cluster"].fillna(df["id"]).to_numpy()
+    keep = np.zeros(0, dtype=np.int64)
+    for top in widening_top_k(scores, top_k):
+        _, first = np.unique(groups[top], return_index=True)
+        keep = top[np.sort(first)]
+        if len(keep) >= top_k:
+            break
+    return keep[:top_k]
+
+def _take(df: pd.DataFrame, scores: np.ndarray, top_k: int, collapse: bool = False) -> pd.DataFrame:
+    if collapse and "dup_cluster" in df.columns:
+        top = _collapsed_top(df, scores, top_k)
+    else:
+        top = top_k_positions(scores, top_k)
+    out = df.iloc[top].copy()
+    out["match"] = (scores[top].astype(np.float64) * 100).round(2)  # 0..100
+    return out.reset_index(drop=True)
+
+def compute_match(df: pd.DataFrame, skills: str, top_k: int = 50, index: RankIndex | None = None,
+                  collapse: bool = False) -> pd.DataFrame:
+    if df.empty:
+        return df
+    pos = index.positions(df["id"]) if index is not None and "id" in df.columns else None
+    if pos is not None:
+        sims = index.score(skills, pos)  # um produto matriz-vetor contra a matriz persistida
+    else:
+        sims = _fit_scores(df, [skills])[0]
+    return _take(df, sims, top_k, collapse)
+
+def compute_match_many(df: pd.DataFrame, queries: Mapping[str, str], top_k: int = 50,
+                       index: RankIndex | None = None, collapse: bool = False) -> dict[str, pd.DataFrame]:
+    """Ranqueia várias consultas (ex.: um perfil de skills por usuário) de uma vez."""
+    keys = list(queries)
+    if df.empty or not keys:
+        return {k: df for k in keys}
+    S = score_matrix(df, [queries[k] for k in keys], index)
+    return {k: _take(df, S[i], top_k, collapse) for i, k in enumerate(keys)}
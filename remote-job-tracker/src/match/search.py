@@ -0,0 +1,31 @@
+"""
+Busca textual em título/descrição via índice FTS5 (tabela jobs_fts, mantida por triggers no load.py).
+Resultados ordenados por BM25, com trecho destacado (snippet).
+"""
+from __future__ import annotations
+import re
+from sqlalchemy import text
+
+def fts_query(q: str) -> str | None:
+    """Converte texto livre numa expressão MATCH segura: cada termo vira prefixo entre aspas (AND implícito).
+    "+" e "#" fazem parte do termo (c++, c#), como no tokenizador do jobs_fts."""
+    terms = re.findall(r"\w[\w+#]*", q or "")
+    return " ".join(f'"{t}"*' for t in terms) or None
+
+def snippet_sql(mark: tuple[str, str] = ("<b>", "</b>"), tokens: int = 12) -> str:
+    # -1: o FTS5 escolhe a coluna (título ou descrição) com o melhor trecho
+    return f"snippet(jobs_fts, -1, '{mark[0]}', '{mark[1]}', '…', {int(tokens)})"
+
+def search_jobs(conn, q: str, limit: int = 200, mark: tuple[str, str] = ("<b>", "</b>"),
+                offset: int = 0) -> list[dict]:
+    """Ids das vagas que casam com `q`, do mais ao menos relevante, com score BM25 e snippet.
+    Empates desfeitos pelo id, para paginar com offset sem repetir nem pular vagas."""
+    expr = fts_query(q)
+    if not expr:
+        return []
+    rows = conn.execute(text(f"""
+        select rowid as id, bm25(jobs_fts) as bm25, {snippet_sql(mark)} as snippet
+        from jobs_fts where jobs_fts match :q
+        order by bm25(jobs_fts), rowid limit :limit offset :offset
+    """), {"q": expr, "limit": limit, "offset": offset}).mappings().all()
+    return [dict(r) for r in rows]
@@ -0,0 +1,183 @@
+"""
+Ranking semântico (embeddings densos) com índice aproximado (ANN) e modo híbrido BM25 + vetor.
+Fica em jobs_index/semantic/ e é reconstruído pelo load.py junto com o índice TF-IDF.
+- Embeddings: LSA (TruncatedSVD sobre a matriz TF-IDF, só CPU e sem dependências novas) ou,
+  se EMBEDDING_MODEL apontar um modelo do sentence-transformers instalado, esse modelo.
+- Matriz de embeddings em float16; ANN do tipo IVF (k-means + busca só nas listas mais próximas).
+- Mesmo contrato do TfidfIndex no compute_match: positions(ids) e score(skills, rows).
+"""
+from __future__ import annotations
+import json, os, pathlib
+import numpy as np
+import pandas as pd
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.decomposition import TruncatedSVD
+from src.match.index import (INDEX_DIR, TfidfIndex, current_version, job_text, new_version_dir,
+                             publish, version_dir)
+
+SEMANTIC_DIR = INDEX_DIR / "semantic"
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "lsa")  # "lsa" ou nome de modelo sentence-transformers
+LSA_DIM = 128
+EXACT_LIMIT = 2000   # até este nº de vagas, busca exata (sem IVF)
+NPROBE = 8
+HYBRID_CANDIDATES = 500
+
+def _unit(m: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(m, axis=-1, keepdims=True)
+    return m / np.where(norms == 0, 1, norms)
+
+class SemanticIndex:
+    def __init__(self, tfidf: TfidfIndex, mode: str = "vector", alpha: float = 0.5, nprobe: int = NPROBE):
+        self.tfidf = tfidf          # vocabulário/BM25 (e projeção LSA das consultas)
+        self.mode = mode            # "vector" | "hybrid"
+        self.alpha = alpha          # peso do BM25 no modo híbrido
+        self.nprobe = nprobe
+        self.version = 0
+        self.model = EMBEDDING_MODEL
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.hashes = np.zeros(0, dtype=np.uint64)
+        self.embeddings = np.zeros((0, 0), dtype=np.float16)
+        self.components: np.ndarray | None = None   # LSA: (dim, n_termos)
+        self.centroids: np.ndarray | None = None    # IVF: (n_listas, dim)
+        self.list_rows = np.zeros(0, dtype=np.int64)  # linhas agrupadas por lista
+        self.list_offsets = np.zeros(1, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # ---------- embeddings ----------
+    def _encoder(self):
+        from sentence_transformers import SentenceTransformer  # opcional
+        return SentenceTransformer(self.model, device="cpu")
+
+    def embed_queries(self, queries: list[str]) -> np.ndarray:
+        if self.model == "lsa":
+            q = self.tfidf.transform(queries)
+            emb = np.asarray(q @ self.components.T)
+        else:
+            emb = self._encoder().encode(queries, convert_to_numpy=True)
+        return _unit(emb.astype(np.float32))
+
+    def build(self, df: pd.DataFrame, previous: SemanticIndex | None = None) -> SemanticIndex:
+        """(Re)constrói a partir do TF-IDF já atualizado; df (id, title, description) só é usado
+        pelo sentence-transformers, que reaproveita os embeddings das vagas sem mudança."""
+        self.ids, self.hashes = self.tfidf.ids.copy(), self.tfidf.hashes.copy()
+        n, n_terms = self.tfidf.matrix.shape
+        if self.model == "lsa":
+            dim = min(LSA_DIM, n_terms - 1, n - 1)
+            if dim < 1:
+                self.components = np.zeros((1, n_terms), dtype=np.float32)
+                emb = np.zeros((n, 1), dtype=np.float32)
+            else:
+                svd = TruncatedSVD(n_components=dim, random_state=0).fit(self.tfidf.matrix)
+                self.components = svd.components_.astype(np.float32)
+                emb = np.asarray(self.tfidf.matrix @ self.components.T)
+        else:
+            emb = self._embed_jobs(df, previous)
+        self.embeddings = _unit(emb.astype(np.float32)).astype(np.float16)
+        self._build_ivf()
+        return self
+
+    def _embed_jobs(self, df: pd.DataFrame, previous: SemanticIndex | None) -> np.ndarray:
+        texts = dict(zip(df["id"].to_numpy(dtype=np.int64), job_text(df)))
+        reuse = {}
+        if previous is not None and previous.model == self.model:
+            reuse = {(i, h): r for r, (i, h) in enumerate(zip(previous.ids, previous.hashes))}
+        rows = [reuse.get((i, h)) for i, h in zip(self.ids, self.hashes)]
+        todo = [k for k, r in enumerate(rows) if r is None]
+        fresh = self._encoder().encode([texts[self.ids[k]] for k in todo], convert_to_numpy=True) if todo else None
+        dim = fresh.shape[1] if fresh is not None else previous.embeddings.shape[1]
+        emb = np.zeros((len(self.ids), dim), dtype=np.float32)
+        for k, r in enumerate(rows):
+            if r is not None:
+                emb[k] = previous.embeddings[r]
+        if todo:
+            emb[todo] = fresh
+        return emb
+
+    def _build_ivf(self) -> None:
+        n = len(self.ids)
+        if n <= EXACT_LIMIT:
+            self.centroids = None
+            return
+        n_lists = int(min(1024, max(8, np.sqrt(n))))
+        km = MiniBatchKMeans(n_clusters=n_lists, random_state=0, n_init=3, batch_size=4096)
+        labels = km.fit_predict(self.embeddings.astype(np.float32))
+        self.centroids = _unit(km.cluster_centers_.astype(np.float32))
+        self.list_rows = np.argsort(labels, kind="stable")
+        self.list_offsets = np.searchsorted(labels[self.list_rows], np.arange(n_lists + 1))
+
+    # ---------- consulta ----------
+    def positions(self, ids) -> np.ndarray | None:
+        return self.tfidf.positions(ids)
+
+    def _probe(self, q: np.ndarray) -> np.ndarray:
+        lists = np.argsort(-(self.centroids @ q))[: self.nprobe]
+        return np.concatenate([self.list_rows[self.list_offsets[c]:self.list_offsets[c + 1]] for c in lists])
+
+    def score(self, skills: str, rows: np.ndarray | None = None) -> np.ndarray:
+        """Scores 0..1 para todas as vagas (ou só `rows`). Pelo IVF, vagas fora das listas
+        sondadas (e, no híbrido, fora do top BM25) ficam com 0."""
+        n = len(self.ids)
+        q = self.embed_queries([skills])[0]
+        if self.centroids is None or (rows is not None and len(rows) <= EXACT_LIMIT):
+            cand = np.arange(n) if rows is None else np.unique(rows)
+        else:
+            cand = self._probe(q)
+        bm = None
+        if self.mode == "hybrid":
+            bm = self.tfidf.bm25(skills)
+            top_bm = np.argpartition(-bm, min(HYBRID_CANDIDATES, n) - 1)[:HYBRID_CANDIDATES] if n else bm
+            top_bm = top_bm[bm[top_bm] > 0]
+            if rows is not None:
+                top_bm = np.intersect1d(top_bm, rows)
+            cand = np.union1d(cand, top_bm)
+        sims = np.clip(self.embeddings[cand].astype(np.float32) @ q, 0, 1)
+        if bm is not None:
+            b = bm[cand]
+            b = b / b.max() if len(b) and b.max() > 0 else b
+            sims = self.alpha * b + (1 - self.alpha) * sims
+        out = np.zeros(n, dtype=np.float32)
+        out[cand] = sims
+        return out if rows is None else out[rows]
+
+    # ---------- persistência ----------
+    def save(self, path: pathlib.Path = SEMANTIC_DIR) -> pathlib.Path:
+        self.version = max(self.version, current_version(path)) + 1
+        out = new_version_dir(path, self.version)
+        np.save(out / "ids.npy", self.ids)
+        np.save(out / "hashes.npy", self.hashes)
+        np.save(out / "embeddings.npy", self.embeddings)
+        if self.components is not None:
+            np.save(out / "components.npy", self.components)
+        if self.centroids is not None:
+            np.save(out / "centroids.npy", self.centroids)
+            np.save(out / "list_rows.npy", self.list_rows)
+            np.save(out / "list_offsets.npy", self.list_offsets)
+        (out / "meta.json").write_text(json.dumps({
+            "version": self.version, "model": self.model, "tfidf_version": self.tfidf.version,
+        }))
+        publish(path, self.version)
+        return out
+
+    @classmethod
+    def load(cls, tfidf: TfidfIndex, path: pathlib.Path = SEMANTIC_DIR, **kw) -> SemanticIndex | None:
+        version = current_version(path)
+        src = version_dir(path, version)
+        if not version or not src.exists():
+            return None
+        meta = json.loads((src / "meta.json").read_text())
+        if meta["tfidf_version"] != tfidf.version:
+            return None  # construído sobre outra versão do TF-IDF: ids/vocabulário podem divergir
+        idx = cls(tfidf, **kw)
+        idx.version, idx.model = version, meta["model"]
+        idx.ids = np.load(src / "ids.npy")
+        idx.hashes = np.load(src / "hashes.npy")
+        idx.embeddings = np.load(src / "embeddings.npy", mmap_mode="r")
+        if (src / "components.npy").exists():
+            idx.components = np.load(src / "components.npy")
+        if (src / "centroids.npy").exists():
+            idx.centroids = np.load(src / "centroids.npy")
+            idx.list_rows = np.load(src / "list_rows.npy")
+            idx.list_offsets = np.load(src / "list_offsets.npy")
+        return idx
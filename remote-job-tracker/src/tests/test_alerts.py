@@ -0,0 +1,35 @@
+import pandas as pd
+from sqlalchemy import create_engine, text
+from src.etl.load import init_schema, read_jobs_text, upsert_jobs
+from src.match.alerts import match_new_jobs
+from src.match.index import TfidfIndex
+
+def _jobs(rows):
+    return pd.DataFrame([
+        {"source": "remoteok", "title": t, "company": "Acme", "location": "", "remote": True, "seniority": "",
+         "stack": "", "salary": "", "url": f"u-{t}", "description": d, "published_at": ""}
+        for t, d in rows
+    ])
+
+def test_only_new_jobs_above_threshold_become_alerts(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}", future=True)
+    index = TfidfIndex()
+    with engine.begin() as conn:
+        init_schema(conn)
+        conn.execute(text("insert into profiles(name, skills, min_match) values (:n, :s, :m)"), [
+            {"n": "py", "s": "python fastapi", "m": 20},
+            {"n": "front", "s": "react typescript", "m": 20},
+            {"n": "strict", "s": "python", "m": 99},
+        ])
+        upsert_jobs(conn, _jobs([("Python Dev", "FastAPI services"), ("React Dev", "TypeScript UI")]))
+    index.update(read_jobs_text(engine))
+
+    with engine.begin() as conn:
+        last_id = conn.execute(text("select max(id) from jobs")).scalar_one()
+        upsert_jobs(conn, _jobs([("Backend Python", "Python and FastAPI"), ("Go Dev", "gRPC")]))
+    index.update(read_jobs_text(engine))
+    with engine.begin() as conn:
+        new = [r[0] for r in conn.execute(text("select id from jobs where id > :i"), {"i": last_id})]
+        assert match_new_jobs(conn, index, new) == 1
+        alerts = conn.execute(text("select profile_id, job_id, match from alerts")).all()
+    assert [(p, j) for p, j, _ in alerts] == [(1, 3)] and 20 <= alerts[0][2] <= 100
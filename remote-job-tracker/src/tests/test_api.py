@@ -0,0 +1,122 @@
+import asyncio
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from src.api import main as api
+from src.etl import history
+from src.etl.load import init_schema, read_jobs_text, upsert_jobs
+from src.match.index import TfidfIndex
+from src.match.live import LiveIndex
+
+def _job(i, stack, salary):
+    return {"source": "remotive", "title": f"Dev {i}", "company": "Acme", "location": "", "remote": True,
+            "seniority": "", "stack": stack, "salary": salary, "url": f"u{i}",
+            "description": f"Work with {stack}", "published_at": ""}
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}", future=True)
+    with engine.begin() as conn:
+        init_schema(conn)
+        upsert_jobs(conn, pd.DataFrame([
+            _job(1, "python, FastAPI", "$80k - $110k"),
+            _job(2, "python, django", "$120k - $150k"),
+            _job(3, "Python, fastapi, sql", "$50k - $70k"),
+        ]))
+    return engine
+
+@pytest.fixture
+def client(db, tmp_path, monkeypatch):
+    reader, writer = api.make_engines(tmp_path / "jobs.db")
+    monkeypatch.setattr(api, "reader", reader)
+    monkeypatch.setattr(api, "writer", writer)
+    monkeypatch.setattr(api, "live", LiveIndex(tmp_path / "index", tmp_path / "index" / "semantic", check_interval=0))
+    with TestClient(api.app) as c:
+        yield c
+
+def test_filters_by_all_skills_and_salary(db, client):
+    with db.connect() as conn:
+        assert conn.execute(text("select count(*) from job_skills")).scalar_one() == 7
+    res = client.get("/jobs", params={"skills": "python,fastapi", "min_salary": 100000, "fields": "salary_max"})
+    assert [r["id"] for r in res.json()] == [1] and res.json()[0]["salary_max"] == 110000
+    res = client.get("/jobs", params={"skills": "python,fastapi"})
+    assert [r["id"] for r in res.json()] == [3, 1]
+    assert client.get("/skills").json()[0] == {"skill": "python", "jobs": 3}
+
+def test_reads_see_writes_and_reader_pool_is_read_only(db, client):
+    assert client.post("/save", json={"job_id": 2, "note": "ok"}).json() == {"ok": True}
+    assert client.post("/save", json={"job_id": 99}).status_code == 404
+    assert [r["id"] for r in client.get("/saved").json()] == [2]
+    with db.connect() as conn:
+        assert conn.execute(text("pragma journal_mode")).scalar_one() == "wal"
+
+def test_reader_rejects_writes(db, tmp_path):
+    async def write_through_reader():
+        reader, _ = api.make_engines(tmp_path / "jobs.db")
+        try:
+            async with reader.connect() as conn:
+                await conn.execute(text("delete from jobs"))
+        finally:
+            await reader.dispose()
+    with pytest.raises(Exception, match="readonly|read-only|query_only"):
+        asyncio.run(write_through_reader())
+
+def test_ranked_uses_in_memory_index_and_hot_swaps(db, client, tmp_path):
+    assert client.get("/jobs/ranked", params={"skills": "python"}).status_code == 503
+    index = TfidfIndex()
+    index.update(read_jobs_text(db))
+    index.save(tmp_path / "index")
+    res = client.get("/jobs/ranked", params={"skills": "django", "fields": "title"})
+    assert [r["id"] for r in res.json()] == [2] and res.json()[0]["match"] > 0
+    assert res.headers["X-Index-Version"] == "1"
+    res = client.get("/jobs/ranked", params={"skills": "fastapi sql", "min_match": 50})
+    assert [r["id"] for r in res.json()] == [3]
+
+    with db.begin() as conn:
+        conn.execute(text("update jobs set description = 'Work with django' where id = 1"))
+    index.update(read_jobs_text(db))
+    index.save(tmp_path / "index")  # publica v2: a API troca sem reiniciar
+    res = client.get("/jobs/ranked", params={"skills": "django"})
+    assert res.headers["X-Index-Version"] == "2" and sorted(r["id"] for r in res.json()) == [1, 2]
+
+def test_profiles_and_alerts(db, client):
+    res = client.post("/profiles", json={"name": "py", "skills": "python fastapi", "min_match": 25})
+    assert res.status_code == 201 and res.json()["id"] == 1
+    with db.begin() as conn:
+        conn.execute(text("insert into alerts(profile_id, job_id, match) values (1, 1, 80), (1, 3, 60)"))
+    res = client.get("/profiles/1/alerts", params={"limit": 1})
+    assert [r["id"] for r in res.json()] == [3] and res.headers["X-Next-After-Id"] == "2"
+    res = client.get("/profiles/1/alerts", params={"after_id": 2})
+    assert [(r["id"], r["match"]) for r in res.json()] == [(1, 80.0)]
+    assert client.delete("/profiles/1").json() == {"ok": True}
+    assert client.get("/profiles/1/alerts").status_code == 404
+    assert client.get("/profiles").json() == []
+
+def test_history_endpoints(db, client):
+    # o fixture carrega sem run: init_schema não cria versões para um banco vazio
+    assert client.get("/jobs/new").json() == []
+    with db.begin() as conn:
+        run = history.start_run(conn, "2025-08-01 00:00:00")
+        upsert_jobs(conn, pd.DataFrame([_job(4, "go", "")]), run=run)
+        history.finish_run(conn, run, {"inserted": 1, "updated": 0, "unchanged": 0})
+    assert [j["url"] for j in client.get("/jobs/new").json()] == ["u4"]
+    assert [j["url"] for j in client.get("/jobs/open", params={"on": "2025-08-01"}).json()] == ["u4"]
+    assert client.get("/jobs/open", params={"on": "ontem"}).status_code == 400
+    assert client.get("/jobs/4/history").json()[0]["valid_to"] is None
+    assert client.get("/runs").json()[0]["inserted"] == 1
+
+def test_ranked_collapse_widens_past_duplicates(db, client, tmp_path):
+    # 12 cópias da mesma vaga ocupam o topo; as outras duas só aparecem ampliando a seleção
+    with db.begin() as conn:
+        upsert_jobs(conn, pd.DataFrame([_job(i, "kotlin", "") for i in range(10, 22)]))
+        conn.execute(text("update jobs set dup_cluster = (select min(id) from jobs where stack = 'kotlin') "
+                          "where stack = 'kotlin'"))
+        conn.execute(text("update jobs set description = 'Work with kotlin, python, sql, docker, aws and gcp' where id in (1, 2)"))
+    index = TfidfIndex()
+    index.update(read_jobs_text(db))
+    index.save(tmp_path / "index")
+    res = client.get("/jobs/ranked", params={"skills": "kotlin", "top_k": 3, "collapse": True}).json()
+    assert len(res) == 3 and res[0]["id"] not in (1, 2) and sorted(r["id"] for r in res[1:]) == [1, 2]
+    res = client.get("/jobs/ranked", params={"skills": "kotlin", "top_k": 3}).json()
+    assert len(res) == 3 and not {r["id"] for r in res} & {1, 2}
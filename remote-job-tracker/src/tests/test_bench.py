@@ -0,0 +1,28 @@
+from src.bench.corpus import _original, iter_remoteok, normalized_jobs
+from src.bench.pipeline import compare, run_size
+
+def test_corpus_is_deterministic_and_sliceable():
+    full = list(iter_remoteok(50, seed=7))
+    assert list(iter_remoteok(10, seed=7, start=40)) == full[40:]
+    assert full != list(iter_remoteok(50, seed=8))
+    df = normalized_jobs(20)
+    assert df["url"].is_unique and (df["stack"] != "").all()
+
+def test_corpus_republications_repeat_the_original_content():
+    rows = list(iter_remoteok(4000, seed=3, dup_rate=0.05))
+    content = [(r["company"], r["position"], r["description"], r["location"], r["salary_max"]) for r in rows]
+    dups = len(content) - len(set(content))
+    assert 0.04 * len(rows) < dups < 0.06 * len(rows)
+    assert len({r["url"] for r in rows}) == len(rows)
+    # toda republicação sorteada vira uma duplicata de conteúdo (e só elas)
+    assert dups == sum(_original(i, 3, 0.05) != i for i in range(len(rows)))
+
+def test_pipeline_benchmark_reports_every_stage(tmp_path):
+    res = run_size(300, tmp_path, repeat=1, api_duration=0)
+    assert set(res) == {"generate", "normalize", "load", "fts_build", "tfidf_build", "compute_match"}
+    assert res["load"]["rows"] == 300 and res["compute_match"]["queries"] > 0
+
+def test_compare_flags_only_regressions_beyond_tolerance():
+    base = {"results": {"1000": {"load": {"rows": 10, "seconds": 1.0, "rows_per_s": 100.0}}}}
+    new = {"results": {"1000": {"load": {"rows": 10, "seconds": 1.1, "rows_per_s": 50.0}}}}
+    assert compare(base, new, 0.2) == ["1000 load.rows_per_s: 100.0 -> 50.0 (+50% pior)"]
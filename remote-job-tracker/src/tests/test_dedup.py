@@ -0,0 +1,26 @@
+import pandas as pd
+from src.match.dedup import find_duplicates
+from src.match.rank import compute_match
+
+DESC = "We are hiring a senior python engineer to build data pipelines with airflow, spark and sql on aws for our analytics platform"
+
+def _jobs():
+    return pd.DataFrame([
+        {"id": 1, "title": "Senior Python Engineer", "company": "Acme", "description": DESC},
+        {"id": 2, "title": "Frontend Developer", "company": "Globex", "description": "React, TypeScript and CSS for our design system and web app"},
+        {"id": 3, "title": "Senior Python Engineer", "company": "Acme", "description": DESC + " remote"},
+        {"id": 4, "title": "Senior Python Engineer", "company": "Acme", "description": DESC.replace("airflow", "dagster")},
+    ])
+
+def test_near_duplicates_share_the_oldest_id():
+    dup = find_duplicates(_jobs())
+    assert dup[1] == dup[3] == 1
+    assert dup[2] == 2
+    assert dup[4] in (1, 4)  # uma palavra trocada: Jaccard perto do limiar
+
+def test_compute_match_collapses_duplicates():
+    df = _jobs()
+    df["dup_cluster"] = [1, 2, 1, 4]
+    out = compute_match(df, "python airflow", top_k=3, collapse=True)
+    assert out["dup_cluster"].is_unique
+    assert len(out) == 3
@@ -0,0 +1,17 @@
+from src.etl.enrich import infer_seniority, parse_salary, parse_skills
+
+def test_parse_skills_canonicalizes_and_drops_non_skills():
+    assert parse_skills(["Python", "FastAPI", "golang", "Senior", "k8s", "python"]) == ["python", "fastapi", "go", "kubernetes"]
+    assert parse_skills("react, ReactJS , ts") == ["react", "typescript"]
+
+def test_infer_seniority_prefers_title():
+    assert infer_seniority("Senior React Engineer", ["junior"]) == "senior"
+    assert infer_seniority("Backend Developer", ["jr"]) == "junior"
+    assert infer_seniority("Backend Developer") == ""
+
+def test_parse_salary_ranges_currencies_and_periods():
+    assert parse_salary("$80k - $110k") == (80000, 110000, "USD")
+    assert parse_salary("€50.000 – 60.000") == (50000, 60000, "EUR")
+    assert parse_salary("R$ 12.000/mês") == (144000, 144000, "BRL")
+    assert parse_salary("USD 45/hour") == (93600, 93600, "USD")
+    assert parse_salary("Competitive") == (None, None, "")
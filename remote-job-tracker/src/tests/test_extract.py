@@ -0,0 +1,106 @@
+import asyncio, io, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import pytest
+from src.etl.extract import HostLimiter, parse_retry_after, raw_path, run
+from src.etl.jsonstream import iter_json_array, iter_ndjson
+from src.etl.normalize import iter_normalized
+from src.etl.sources import RemoteOK, Remotive, Source
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    # servidor local que serve as respostas gravadas em fixtures/<nome>.json
+    failures: dict = {}
+    retry_after: str | None = None
+    hits: list = []
+
+    def do_GET(self):
+        name = self.path.strip("/")
+        self.hits.append((name, self.headers.get("If-None-Match")))
+        if self.failures.get(name, 0) > 0:
+            self.failures[name] -= 1
+            if self.retry_after is not None:
+                return self._reply(429, headers={"Retry-After": self.retry_after})
+            return self._reply(503)
+        path = FIXTURES / f"{name}.json"
+        if not path.exists():
+            return self._reply(404)
+        etag = f'"{name}-v1"'
+        if self.headers.get("If-None-Match") == etag:
+            return self._reply(304)
+        self._reply(200, path.read_bytes(), {"ETag": etag, "Content-Type": "application/json"})
+
+    def _reply(self, status, body=b"", headers=None):
+        self.send_response(status)
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server():
+    FixtureHandler.failures, FixtureHandler.retry_after, FixtureHandler.hits = {}, None, []
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_port}"
+    srv.shutdown()
+
+def _run(sources, tmp_path, **kw):
+    return asyncio.run(run(sources, out_dir=tmp_path, cache_path=tmp_path / "cache.json",
+                           limiter=HostLimiter(min_interval=0), backoff=0.01, **kw))
+
+def test_fetches_all_sources_and_revalidates_with_etag(server, tmp_path):
+    sources = [RemoteOK(f"{server}/remoteok"), Remotive(f"{server}/remotive")]
+    results = _run(sources, tmp_path)
+    assert [(r["source"], r["status"], r["rows"]) for r in results] == [("remoteok", "ok", 2), ("remotive", "ok", 2)]
+
+    recs = list(iter_normalized(iter_ndjson(raw_path("remotive", tmp_path)), sources[1].normalize))
+    assert recs[0]["company"] == "Initech" and recs[0]["source"] == "remotive"
+
+    results = _run(sources, tmp_path)
+    assert [r["status"] for r in results] == ["not_modified", "not_modified"]
+    assert ("remoteok", '"remoteok-v1"') in FixtureHandler.hits
+    assert len(list(iter_ndjson(raw_path("remoteok", tmp_path)))) == 2
+
+def test_retries_transient_errors_but_not_client_errors(server, tmp_path):
+    FixtureHandler.failures = {"remoteok": 2}
+    results = _run([RemoteOK(f"{server}/remoteok"), Remotive(f"{server}/missing")], tmp_path, retries=3)
+    assert results[0]["status"] == "ok"
+    assert results[1]["status"] == "error"
+    assert [h[0] for h in FixtureHandler.hits].count("remoteok") == 3
+    assert [h[0] for h in FixtureHandler.hits].count("missing") == 1
+
+def test_waits_for_retry_after_on_429(server, tmp_path):
+    FixtureHandler.failures, FixtureHandler.retry_after = {"remoteok": 1}, "1"
+    t0 = time.monotonic()
+    results = _run([RemoteOK(f"{server}/remoteok")], tmp_path, retries=2)
+    assert results[0]["status"] == "ok"
+    assert time.monotonic() - t0 >= 1  # backoff de 0.01s sozinho não esperaria isso
+    assert [h[0] for h in FixtureHandler.hits].count("remoteok") == 2
+
+def test_parse_retry_after():
+    assert parse_retry_after("5") == 5
+    assert parse_retry_after(None) is None and parse_retry_after("logo") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0  # data no passado
+
+def test_remotive_streams_jobs_array():
+    body = (FIXTURES / "remotive.json").read_text()
+    rows = list(iter_json_array(io.StringIO(body), chunk_size=7, key="jobs"))
+    assert [r["id"] for r in rows] == [r["id"] for r in Remotive().parse(io.StringIO(body))]
+    assert len(rows) == 2
+    # o que vem depois do array não é lido nem validado
+    assert list(iter_json_array(io.StringIO('{"n": 1.5, "jobs": [1, 2] lixo'), chunk_size=3, key="jobs")) == [1, 2]
+    assert list(iter_json_array(io.StringIO('{"outros": []}'), key="jobs")) == []
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO('[1]'), key="jobs"))
+
+def test_source_requires_normalize():
+    class Incompleta(Source):
+        name = "incompleta"
+    with pytest.raises(TypeError):
+        Incompleta()
@@ -0,0 +1,46 @@
+import pandas as pd
+from sqlalchemy import create_engine, text
+from src.etl import history
+from src.etl.load import init_schema, upsert_jobs
+
+def _feed(*jobs, source="remoteok"):
+    return pd.DataFrame([
+        {"source": source, "title": t, "company": "Acme", "location": "", "remote": True, "seniority": "",
+         "stack": "", "salary": "", "url": f"u-{u}", "description": d, "published_at": ""}
+        for u, t, d in jobs
+    ])
+
+def _run(engine, when, *feeds):
+    with engine.begin() as conn:
+        run = history.start_run(conn, when)
+        stats = {"inserted": 0, "updated": 0, "unchanged": 0}
+        for feed in feeds:
+            for k, v in upsert_jobs(conn, feed, run=run).items():
+                stats[k] += v
+        history.finish_run(conn, run, stats)
+    return run["id"]
+
+def test_versions_track_appear_change_disappear_and_return(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}", future=True)
+    with engine.begin() as conn:
+        init_schema(conn)
+    a, b, c = ("a", "Python Dev", "v1"), ("b", "Go Dev", "v1"), ("c", "Rust Dev", "v1")
+    other = _feed(("x", "Remotive job", "v1"), source="remotive")
+    r1 = _run(engine, "2025-08-01 00:00:00", _feed(a, b), other)
+    r2 = _run(engine, "2025-08-02 00:00:00", _feed(("a", "Python Dev", "v2"), c))  # b some, a muda, c nova
+    r3 = _run(engine, "2025-08-03 00:00:00", _feed(("a", "Python Dev", "v2"), b, c))  # b volta igual
+
+    with engine.connect() as conn:
+        assert sorted(j["url"] for j in history.open_on(conn, "2025-08-01")) == ["u-a", "u-b", "u-x"]
+        day2 = {j["url"]: j["description"] for j in history.open_on(conn, "2025-08-02 12:00:00")}
+        assert day2 == {"u-a": "v2", "u-c": "v1", "u-x": "v1"}  # remotive não estava na run: continua aberta
+        assert [j["url"] for j in history.new_in_run(conn, r2)] == ["u-c"]
+        assert history.new_in_run(conn, r3) == []
+        assert sorted(j["url"] for j in history.closed_in_run(conn, r2)) == ["u-a", "u-b"]
+        b_id = conn.execute(text("select id from jobs where url = 'u-b'")).scalar_one()
+        spans = [(v["valid_from"][:10], (v["valid_to"] or "")[:10]) for v in history.job_history(conn, b_id)]
+        assert spans == [("2025-08-01", "2025-08-02"), ("2025-08-03", "")]
+        # conteúdo deduplicado: b v1 gravado uma vez só para as duas versões
+        assert conn.execute(text("select count(*) from job_contents")).scalar_one() == 5
+        assert history.latest_run(conn) == r3
+        assert conn.execute(text("select closed from etl_runs where id = :r"), {"r": r2}).scalar_one() == 1
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+from sklearn.metrics.pairwise import cosine_similarity
+from src.match.index import TfidfIndex, make_vectorizer
+from src.match.rank import compute_match, score_matrix
+
+def _jobs():
+    return pd.DataFrame([
+        {"id": 1, "title": "Python Dev", "description": "Build APIs with FastAPI"},
+        {"id": 2, "title": "Front-end React", "description": "React, UI/UX"},
+        {"id": 3, "title": "Data Engineer", "description": "Python, SQL and Airflow pipelines"},
+    ])
+
+def _reference(df, skills):
+    vec = make_vectorizer()
+    X = vec.fit_transform((df["title"] + " " + df["description"]).tolist())
+    return cosine_similarity(vec.transform([skills]), X).ravel()
+
+def test_index_matches_full_fit_after_incremental_update(tmp_path):
+    idx = TfidfIndex()
+    assert idx.update(_jobs())["added"] == 3
+    idx.save(tmp_path)
+
+    df = _jobs()
+    df.loc[df["id"] == 2, "description"] = "Vue and TypeScript"
+    df = pd.concat([df[df["id"] != 3], pd.DataFrame([{"id": 4, "title": "Backend", "description": "Go and gRPC"}])])
+    idx = TfidfIndex.load(tmp_path)
+    stats = idx.update(df)
+    assert stats == {"added": 1, "updated": 1, "removed": 1, "unchanged": 1}
+    idx.save(tmp_path)
+
+    idx = TfidfIndex.load(tmp_path)
+    assert idx.version == 2
+    assert list(idx.ids) == [1, 2, 4]
+    expected = _reference(df.sort_values("id"), "python typescript")
+    assert np.allclose(idx.score("python typescript"), expected, atol=1e-5)
+
+def test_compute_match_uses_index():
+    idx = TfidfIndex()
+    idx.update(_jobs())
+    out = compute_match(_jobs(), "python, fastapi", top_k=2, index=idx)
+    assert list(out["id"]) == [1, 3]
+
+def test_fallback_fit_scores_like_the_index():
+    # vagas fora do índice caem no fit ad-hoc: mesma configuração, mesmos scores
+    df = _jobs()
+    idx = TfidfIndex()
+    idx.update(df)
+    queries = ["python sql", "react"]
+    fallback = score_matrix(df.assign(id=df["id"] + 100), queries, idx)
+    assert np.allclose(fallback, score_matrix(df, queries, idx), atol=1e-5)
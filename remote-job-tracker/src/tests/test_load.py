@@ -0,0 +1,50 @@
+import pandas as pd
+from sqlalchemy import create_engine, text
+from src.etl import load
+from src.etl.load import init_schema, upsert_jobs
+from src.match.live import LiveIndex
+from src.match.semantic import SemanticIndex
+
+def _feed():
+    return pd.DataFrame([
+        {"source": "remoteok", "title": "Python Dev", "company": "Acme", "location": "Remote", "remote": True,
+         "seniority": "", "stack": "python", "salary": "", "url": f"https://remoteok.com/{i}",
+         "description": f"Job {i}", "published_at": "2025-08-01"}
+        for i in range(5)
+    ])
+
+def test_upsert_is_idempotent_and_detects_changes(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}", future=True)
+    with engine.begin() as conn:
+        init_schema(conn)
+        assert upsert_jobs(conn, _feed(), chunk_size=2) == {"inserted": 5, "updated": 0, "unchanged": 0}
+    feed = _feed()
+    feed.loc[0, "description"] = "Job 0 (editada)"
+    feed = pd.concat([feed, feed.iloc[[1]].assign(url="https://remoteok.com/new")])
+    with engine.begin() as conn:
+        assert upsert_jobs(conn, feed, chunk_size=2) == {"inserted": 1, "updated": 1, "unchanged": 4}
+        assert conn.execute(text("select count(*) from jobs")).scalar_one() == 6
+        desc = conn.execute(text("select description from jobs where url = 'https://remoteok.com/0'")).scalar_one()
+        assert desc == "Job 0 (editada)"
+
+def test_index_refresh_between_publishes_keeps_semantic(tmp_path, monkeypatch):
+    monkeypatch.setattr(load, "INDEX_DIR", tmp_path / "index")
+    monkeypatch.setattr(load, "SEMANTIC_DIR", tmp_path / "semantic")
+    live = LiveIndex(tmp_path / "index", tmp_path / "semantic", check_interval=0)
+    snapshot = lambda: live.refresh() if live.stale() else live.snapshot  # como a API faz
+    df = pd.DataFrame({"id": range(1, 9), "title": ["Python Dev", "React Dev"] * 4,
+                       "description": [f"job {i} with python and sql" for i in range(8)]})
+    load.refresh_index(df)
+    assert snapshot().semantic is not None
+
+    # a API recarrega no meio da publicação: antes e depois de gravar o semântico
+    save = SemanticIndex.save
+    def save_with_refresh(self, path):
+        assert snapshot().semantic is not None
+        out = save(self, path)
+        assert snapshot().semantic is not None
+        return out
+    monkeypatch.setattr(SemanticIndex, "save", save_with_refresh)
+    load.refresh_index(df.assign(description=df["description"] + " and docker"))
+    snap = snapshot()
+    assert snap.version == 2 and snap.semantic is not None and snap.semantic.tfidf is snap.tfidf
@@ -1,6 +1,9 @@
-import json
+import io, json
 from pathlib import Path
-from src.etl.normalize import normalize_remoteok
+import pandas as pd
+from src.etl.jsonstream import iter_json_array
+from src.etl.normalize import normalize_remoteok, iter_normalized
+from src.etl.staging import write_partition, iter_partition, read_snapshot
 
 def test_normalize_remoteok_empty():
     df = normalize_remoteok([])
@@ -23,3 +26,20 @@ def test_normalize_remoteok_basic(tmp_path):
     assert row["title"] == "Python Developer"
     assert "python" in row["stack"]
     assert row["url"].startswith("http")
+
+def test_iter_json_array_small_chunks():
+    raw = '[ {"legal": "x"}, {"a": "[1, 2]", "b": {"c": 3}} ,12345, "fim"]'
+    assert list(iter_json_array(io.StringIO(raw), chunk_size=3)) == [{"legal": "x"}, {"a": "[1, 2]", "b": {"c": 3}}, 12345, "fim"]
+    assert list(iter_json_array(io.StringIO(""))) == []
+
+def test_normalize_stream_to_parquet_partitions(tmp_path):
+    rows = ({"position": f"Dev {i % 3}", "url": f"https://remoteok.com/{i % 3}", "epoch": 1754006400} for i in range(10))
+    assert write_partition(iter_normalized(rows), "2025-08-01", base=tmp_path, chunk_rows=2) == 3
+    write_partition(iter_normalized([{"position": "Dev 9", "url": "https://remoteok.com/9"}]), "2025-08-02", base=tmp_path)
+    chunks = list(iter_partition("2025-08-01", base=tmp_path, batch_rows=2))
+    assert [len(c) for c in chunks] == [2, 1]
+    df = pd.concat(chunks)
+    assert df["title"].tolist() == ["Dev 0", "Dev 1", "Dev 2"]
+    assert df["remote"].dtype == bool and df["published_at"].iloc[0] == "1754006400"
+    assert read_snapshot("2025-08-02", ["title"], base=tmp_path)["title"].tolist() == ["Dev 9"]
+    assert len(read_snapshot(base=tmp_path)) == 4
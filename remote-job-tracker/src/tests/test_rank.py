@@ -1,5 +1,5 @@
 import pandas as pd
-from src.match.rank import compute_match
+from src.match.rank import compute_match, compute_match_many
 
 def test_compute_match_scores():
     df = pd.DataFrame([
@@ -9,3 +9,15 @@ def test_compute_match_scores():
     out = compute_match(df, "python, fastapi", top_k=2)
     assert "match" in out.columns
     assert out.iloc[0]["id"] == 1  # deve ranquear Python/FastAPI acima
+
+def test_compute_match_many_ranks_each_query():
+    df = pd.DataFrame([
+        {"id":1, "title":"Python Dev", "description":"Build APIs with FastAPI"},
+        {"id":2, "title":"Front-end React", "description":"React, UI/UX"},
+        {"id":3, "title":"Data Engineer", "description":"Python, SQL"},
+    ])
+    out = compute_match_many(df, {"back": "python fastapi", "front": "react"}, top_k=1)
+    assert list(out) == ["back", "front"]
+    assert out["back"].iloc[0]["id"] == 1
+    assert out["front"].iloc[0]["id"] == 2
+    assert len(out["front"]) == 1
@@ -0,0 +1,52 @@
+from sqlalchemy import create_engine, text
+from src.etl.load import init_schema
+from src.match.search import fts_query, search_jobs
+
+def _engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}", future=True)
+    with engine.begin() as conn:
+        init_schema(conn)
+        conn.execute(text("insert into jobs(title, description, url) values (:t, :d, :u)"), [
+            {"t": "Python Developer", "d": "Build APIs with FastAPI", "u": "u1"},
+            {"t": "React Engineer", "d": "Frontend with React and some Python scripts", "u": "u2"},
+        ])
+    return engine
+
+def test_fts_query_quotes_terms():
+    assert fts_query('python "OR" c++, C#') == '"python"* "OR"* "c++"* "C#"*'
+    assert fts_query("  ") is None
+
+def test_search_ranks_by_bm25_and_follows_updates(tmp_path):
+    engine = _engine(tmp_path)
+    with engine.begin() as conn:
+        hits = search_jobs(conn, "python")
+        assert [h["id"] for h in hits] == [1, 2]
+        assert "<b>Python</b>" in hits[0]["snippet"]
+        conn.execute(text("update jobs set title = 'Go Developer', description = 'gRPC' where id = 1"))
+        assert [h["id"] for h in search_jobs(conn, "python")] == [2]
+
+def test_search_keeps_cpp_and_csharp_and_pages(tmp_path):
+    engine = _engine(tmp_path)
+    with engine.begin() as conn:
+        conn.execute(text("insert into jobs(title, description, url) values (:t, :d, :u)"), [
+            {"t": "C++ Engineer", "d": "Low latency C++", "u": "u3"},
+            {"t": "C# Developer", "d": ".NET and C#", "u": "u4"},
+            {"t": "C Programmer", "d": "Embedded C", "u": "u5"},
+        ])
+        assert [h["id"] for h in search_jobs(conn, "c++")] == [3]
+        assert [h["id"] for h in search_jobs(conn, "c#")] == [4]
+        everything = [h["id"] for h in search_jobs(conn, "with")]
+        pages = [h["id"] for off in (0, 1) for h in search_jobs(conn, "with", limit=1, offset=off)]
+        assert pages == everything and len(everything) == 2
+
+def test_old_fts_index_is_rebuilt_with_tokenchars(tmp_path):
+    engine = _engine(tmp_path)
+    with engine.begin() as conn:
+        conn.execute(text("drop table jobs_fts"))
+        conn.execute(text("create virtual table jobs_fts using fts5(title, description, content='jobs', content_rowid='id')"))
+        conn.execute(text("insert into jobs_fts(jobs_fts) values ('rebuild')"))
+        conn.execute(text("insert into jobs(title, description, url) values ('C++ Dev', 'c++', 'u3')"))
+    with engine.begin() as conn:
+        init_schema(conn)
+        assert [h["id"] for h in search_jobs(conn, "c++")] == [3]
+        assert [h["id"] for h in search_jobs(conn, "python")] == [1, 2]
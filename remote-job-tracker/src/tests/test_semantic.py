@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+from src.match.index import TfidfIndex
+from src.match.rank import compute_match
+from src.match import semantic
+from src.match.semantic import SemanticIndex
+
+TOPICS = [
+    "python backend api fastapi django server",
+    "react frontend typescript css ui design",
+    "kubernetes devops aws terraform infrastructure",
+    "data engineer spark airflow sql pipelines",
+]
+
+def _jobs(n):
+    rng = np.random.default_rng(0)
+    rows = []
+    for i in range(n):
+        words = TOPICS[i % len(TOPICS)].split()
+        rows.append({"id": i + 1, "title": words[0].title(), "description": " ".join(rng.choice(words, 6))})
+    return pd.DataFrame(rows)
+
+def _build(df, tmp_path, **kw):
+    tfidf = TfidfIndex()
+    tfidf.update(df)
+    tfidf.save(tmp_path / "tfidf")
+    SemanticIndex(tfidf).build(df).save(tmp_path / "semantic")
+    return tfidf, SemanticIndex.load(tfidf, tmp_path / "semantic", **kw)
+
+def test_vector_and_hybrid_modes_keep_compute_match_contract(tmp_path):
+    df = _jobs(40)
+    tfidf, sem = _build(df, tmp_path)
+    assert sem.embeddings.dtype == np.float16
+    out = compute_match(df, "fastapi backend", top_k=5, index=sem)
+    assert (out["id"] % 4 == 1).all()  # tópico python/backend
+    hybrid = SemanticIndex.load(tfidf, tmp_path / "semantic", mode="hybrid", alpha=0.7)
+    out = compute_match(df.iloc[::-1], "terraform", top_k=3, index=hybrid)
+    assert (out["id"] % 4 == 3).all() and out["match"].iloc[0] > 0
+
+def test_ivf_search_matches_exact_top_results(tmp_path, monkeypatch):
+    monkeypatch.setattr(semantic, "EXACT_LIMIT", 100)
+    df = _jobs(800)
+    tfidf, sem = _build(df, tmp_path)
+    assert sem.centroids is not None
+    approx = sem.score("spark airflow sql")
+    exact = np.clip(sem.embeddings.astype(np.float32) @ sem.embed_queries(["spark airflow sql"])[0], 0, 1)
+    top = np.argsort(-exact)[:10]
+    assert np.allclose(approx[top], exact[top], atol=1e-3)
+
+def test_load_rejects_index_built_on_other_tfidf_version(tmp_path):
+    df = _jobs(20)
+    tfidf, _ = _build(df, tmp_path)
+    tfidf.update(df.iloc[:10])
+    tfidf.save(tmp_path / "tfidf")
+    assert SemanticIndex.load(tfidf, tmp_path / "semantic") is None
@@ -4,11 +4,16 @@ import pandas as pd
 from sqlalchemy import create_engine, text
 from pathlib import Path
 from src.match.rank import compute_match
+from src.match.index import INDEX_DIR, TfidfIndex, current_version
+from src.match.semantic import SEMANTIC_DIR, SemanticIndex
+from src.match.search import search_jobs
 
 st.set_page_config(page_title="Remote Job Tracker", page_icon="🌍", layout="wide")
 
 DB_PATH = Path(__file__).resolve().parents[2] / "jobs.db"
 engine = create_engine(f"sqlite:///{DB_PATH}", future=True)
+RANK_CACHE_ENTRIES = 32  # rankings guardados (LRU); cada um tem só top_k linhas
+SEARCH_PAGE = 1000  # resultados da busca livre lidos por consulta
 
 st.title("🌍 Remote Job Tracker")
 st.caption("Filtre vagas remotas, ranqueie por match e salve favoritas.")
@@ -17,54 +22,136 @@ with st.sidebar:
     skills = st.text_area("Suas skills (separe por vírgulas)", "python, fastapi, streamlit, sql, pandas")
     company = st.text_input("Filtrar por empresa (opcional)")
     query = st.text_input("Busca livre (título/descrição)")
+    levels = st.multiselect("Senioridade", ["intern", "junior", "mid", "senior", "lead"])
+    min_salary = st.number_input("Salário anual mínimo (0 = qualquer)", min_value=0, value=0, step=10000)
     top_k = st.slider("Top K por match", 10, 200, 50, 10)
+    collapse = st.checkbox("Agrupar vagas duplicadas", value=True)
+    engine_mode = st.selectbox("Motor de ranking", ["TF-IDF", "Semântico", "Híbrido (BM25 + semântico)"])
     if st.button("Recarregar dados"):
         st.cache_data.clear()
+        st.cache_resource.clear()
 
-@st.cache_data(show_spinner=False)
-def load_jobs() -> pd.DataFrame:
+def data_version() -> int:
+    # o load.py publica uma nova versão do índice a cada carga: é a chave de todos os caches abaixo,
+    # então rodar o ETL invalida vagas, índices e rankings sem precisar de "Recarregar dados"
+    return current_version(INDEX_DIR)
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def load_jobs(version: int) -> pd.DataFrame:
     with engine.begin() as conn:
         df = pd.read_sql("select * from jobs order by id desc", conn)
     return df
 
-df = load_jobs()
-if query:
-    df = df[df["title"].str.contains(query, case=False, na=False) | df["description"].str.contains(query, case=False, na=False)]
-if company:
-    df = df[df["company"].str.contains(company, case=False, na=False)]
+@st.cache_resource(show_spinner=False, max_entries=1)
+def load_index(version: int) -> TfidfIndex | None:
+    # matriz persistida pelo ETL (memory-map); None se o load.py ainda não rodou
+    return TfidfIndex.load()
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def load_semantic(mode: str, version: int, semantic_version: int) -> SemanticIndex | None:
+    # chave inclui o CURRENT do semântico: um None (semântico ainda de outra versão do TF-IDF)
+    # não fica preso no cache depois que o ETL publica o semântico certo
+    tfidf = load_index(version)
+    return SemanticIndex.load(tfidf, mode=mode) if tfidf is not None else None
+
+def ranking_index(engine_mode: str, version: int, semantic_version: int):
+    if engine_mode == "TF-IDF":
+        return load_index(version)
+    mode = "hybrid" if engine_mode.startswith("Híbrido") else "vector"
+    return load_semantic(mode, version, semantic_version) or load_index(version)
+
+@st.cache_data(show_spinner=False, max_entries=RANK_CACHE_ENTRIES)
+def search(query: str, version: int) -> pd.DataFrame:
+    # FTS5: vagas que casam com a busca, por relevância BM25, com trecho destacado.
+    # Todas entram no ranking (é um filtro): lê em páginas até a última
+    hits, offset = [], 0
+    with engine.connect() as conn:
+        while True:
+            page = search_jobs(conn, query, limit=SEARCH_PAGE, offset=offset, mark=("«", "»"))
+            hits += page
+            if len(page) < SEARCH_PAGE:
+                break
+            offset += SEARCH_PAGE
+    return pd.DataFrame(hits, columns=["id", "bm25", "snippet"])
+
+def skills_key(skills: str) -> str:
+    # "Python,  FastAPI" e "python, fastapi" caem na mesma entrada do cache
+    return ", ".join(s.strip().lower() for s in skills.split(",") if s.strip())
+
+@st.cache_data(show_spinner="Ranqueando vagas...", max_entries=RANK_CACHE_ENTRIES)
+def ranked_jobs(version: int, skills: str, query: str, company: str, levels: tuple[str, ...],
+                min_salary: int, top_k: int, collapse: bool, engine_mode: str, semantic_version: int) -> pd.DataFrame:
+    """Ranking (top_k) para uma combinação de skills + filtros + versão dos dados.
+    Interações que não mudam nada disso (nota, seleção, favoritas) reaproveitam o resultado."""
+    df = load_jobs(version)
+    if query:
+        df = df.merge(search(query, version), on="id")
+    if company:
+        df = df[df["company"].str.contains(company, case=False, na=False)]
+    if levels:
+        df = df[df["seniority"].isin(levels)]
+    if min_salary:
+        df = df[df["salary_max"] >= min_salary]
+    if df.empty:
+        return df
+    return compute_match(df, skills, top_k=top_k, index=ranking_index(engine_mode, version, semantic_version),
+                         collapse=collapse)
+
+def saved_rev() -> int:
+    # favoritas só são inseridas: o maior id muda a cada save (de qualquer sessão ou da API)
+    with engine.connect() as conn:
+        return conn.execute(text("select coalesce(max(id), 0) from saved_jobs")).scalar_one()
 
-if df.empty:
+@st.cache_data(show_spinner=False, max_entries=4)
+def load_favorites(version: int, saved_rev: int) -> pd.DataFrame:
+    with engine.begin() as conn:
+        return pd.read_sql("""
+            select s.id as saved_id, j.*
+            from saved_jobs s join jobs j on j.id = s.job_id
+            order by s.id desc
+        """, conn)
+
+version = data_version()
+if load_jobs(version).empty:
     st.info("Sem vagas no banco. Rode o ETL primeiro.")
     st.stop()
 
-ranked = compute_match(df, skills, top_k=top_k)
-st.subheader("Resultados ranqueados")
-st.dataframe(ranked[["match","title","company","location","salary","url"]].style.format({"match":"{:.2f}"}), use_container_width=True, height=500)
+ranked = ranked_jobs(version, skills_key(skills), query.strip(), company.strip(), tuple(sorted(levels)),
+                     int(min_salary), top_k, collapse, engine_mode, current_version(SEMANTIC_DIR))
+if ranked.empty:
+    st.info("Nenhuma vaga com esses filtros.")
+    st.stop()
 
-sel = st.multiselect("Selecione IDs para salvar", ranked["id"].tolist())
-note = st.text_input("Nota (opcional) para salvar")
+st.subheader("Resultados ranqueados")
+cols = ["match","title","company","location","salary","url"] + (["snippet"] if "snippet" in ranked.columns else [])
+st.dataframe(ranked[cols].style.format({"match":"{:.2f}"}), use_container_width=True, height=500)
 
-col1, col2, col3 = st.columns(3)
+col1, col2 = st.columns([3, 1])
 with col1:
-    if st.button("Salvar selecionados"):
+    # formulário: escolher IDs e digitar a nota não dispara nova execução até o envio
+    with st.form("save_jobs", clear_on_submit=True):
+        sel = st.multiselect("Selecione IDs para salvar", ranked["id"].tolist())
+        note = st.text_input("Nota (opcional) para salvar")
+        submitted = st.form_submit_button("Salvar selecionados")
+    if submitted:
         if not sel:
             st.warning("Selecione pelo menos 1 vaga.")
         else:
             with engine.begin() as conn:
-                for jid in sel:
-                    conn.execute(text("insert into saved_jobs(job_id, note) values (:i, :n)"), {"i": int(jid), "n": note})
+                conn.execute(text("insert into saved_jobs(job_id, note) values (:i, :n)"),
+                             [{"i": int(jid), "n": note} for jid in sel])
             st.success(f"{len(sel)} vagas salvas.")
 with col2:
     csv = ranked.to_csv(index=False).encode("utf-8")
     st.download_button("Baixar CSV", data=csv, file_name="ranked_jobs.csv", mime="text/csv")
-with col3:
-    st.write("")
-
-st.subheader("Favoritas")
-with engine.begin() as conn:
-    fav = pd.read_sql("""
-        select s.id as saved_id, j.*
-        from saved_jobs s join jobs j on j.id = s.job_id
-        order by s.id desc
-    """, conn)
-st.dataframe(fav[["saved_id","title","company","location","url","salary"]], use_container_width=True, height=300)
+
+@st.fragment
+def favorites_panel():
+    # só consulta saved_jobs quando o painel é aberto; o toggle re-executa apenas este fragmento
+    st.subheader("Favoritas")
+    if not st.toggle("Mostrar favoritas"):
+        return
+    fav = load_favorites(version, saved_rev())
+    st.dataframe(fav[["saved_id","title","company","location","url","salary"]], use_container_width=True, height=300)
+
+favorites_panel()